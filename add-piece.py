@@ -9,11 +9,17 @@
   4. python3 build-registry.py                   ← يبني السجل الكامل
 
 لإضافة سريعة من السطر:
-  python3 add-piece.py quick <id> <display_name> <display_name_ar> <category> <auth_type>
+  python3 add-piece.py quick <id> <display_name> <display_name_ar> <category|auto> <auth_type>
+
+تصنيف (data/registry/category-rules.json):
+  python3 add-piece.py category notion google-sheets   ← الفئة + الثقة + القاعدة اللي طابقت
+  cat ids.txt | python3 add-piece.py category -        ← ID لكل سطر
 """
 
 import json, sys, os
 
+from siyadah.categories import classify, explain, load_classifier
+
 PIECES_DIR = "data/registry/pieces"
 TEMPLATE_DIR = "data/registry/_drafts"
 
@@ -36,6 +42,7 @@ VALID_CATEGORIES = {
 def cmd_template(piece_id):
     """ينشئ ملف قالب للتعبئة"""
     os.makedirs(TEMPLATE_DIR, exist_ok=True)
+    category, confidence = classify(load_classifier(), piece_id)
     
     template = {
         "_instructions": [
@@ -43,7 +50,8 @@ def cmd_template(piece_id):
             "2. انسخ كل action name بالحرف (مثل send_email مش sendEmail)",
             "3. انسخ كل trigger name بالحرف",
             "4. trigger type: instant (فوري/webhook) أو scheduled (جدولة/polling)",
-            "5. احذف هذا الحقل _instructions قبل الحفظ"
+            "5. احذف هذا الحقل _instructions قبل الحفظ",
+            f"6. الفئة مقترحة تلقائياً: {category} (ثقة {confidence}) — تأكد منها"
         ],
         "id": piece_id,
         "package": f"@activepieces/piece-{piece_id}",
@@ -51,7 +59,7 @@ def cmd_template(piece_id):
         "display_name_ar": "TODO",
         "description": "TODO — from official page",
         "logo_url": f"https://cdn.activepieces.com/pieces/{piece_id}.png",
-        "category": "G_productivity",
+        "category": category,
         "auth_type": "oauth2",
         "_source": f"https://www.activepieces.com/pieces/{piece_id}",
         "_verified": False,
@@ -146,6 +154,10 @@ def cmd_quick(piece_id, display_name, display_name_ar, category, auth_type):
         print(f"❌ أداة '{piece_id}' موجودة مسبقاً!")
         return False
     
+    if category == "auto":
+        category, confidence = classify(load_classifier(), piece_id)
+        print(f"🗂️  الفئة: {category} (ثقة {confidence})")
+    
     piece = {
         "id": piece_id,
         "package": f"@activepieces/piece-{piece_id}",
@@ -193,6 +205,20 @@ def cmd_list():
             for d in drafts:
                 print(f"  📝 {d}")
 
+def cmd_category(piece_ids):
+    """يعرض الفئة المقترحة + الثقة + القواعد اللي طابقت"""
+    if piece_ids == ["-"]:
+        piece_ids = [line.strip() for line in sys.stdin if line.strip()]
+    classifier = load_classifier()
+    for pid in piece_ids:
+        e = explain(classifier, pid)
+        flag = "⚠️ " if e["default"] else "✅"
+        print(f"  {flag} {pid:30s} {e['category']:15s} {e['confidence']:.2f}")
+        for m in e["matched"]:
+            print(f"       ↳ {m['rule']:22s} '{m['pattern']}' → {m['category']} ({m['confidence']:.2f})")
+        if e["default"]:
+            print(f"       ↳ ما طابق أي قاعدة — الافتراضي")
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         print(__doc__)
@@ -211,5 +237,7 @@ if __name__ == "__main__":
         cmd_quick(sys.argv[2], sys.argv[3], sys.argv[4], sys.argv[5], sys.argv[6])
     elif cmd == "list":
         cmd_list()
+    elif cmd == "category" and len(sys.argv) > 2:
+        cmd_category(sys.argv[2:])
     else:
         print(__doc__)
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+📏 bench-registry.py — قياس أداء أدوات السجل على 1k / 10k / 50k أداة
+
+الاستخدام:
+  python3 bench-registry.py                          # قياس + مقارنة مع الـ baseline
+  python3 bench-registry.py --sizes 1000,10000       # أحجام محددة
+  python3 bench-registry.py --threshold 0.5          # يفشل لو تراجع أكثر من 50%
+  python3 bench-registry.py --save-baseline          # حفظ النتائج كـ baseline جديد
+  python3 bench-registry.py --no-gate                # قياس بس (بدون baseline ما يفشل)
+  python3 bench-registry.py --baseline other.json --repeat 5
+
+المراحل: load_all_pieces, check_flow_compatibility, build_registry (build-registry.py)
+         cmd_list (add-piece.py)
+الـ baseline: benchmarks/registry-baseline.json — يختلف بين الأجهزة، احفظه على نفس جهاز الـ CI
+بدون baseline السكربت يفشل (exit 2) — الـ gate ما يعدّي بصمت؛ --save-baseline أو --no-gate صراحةً
+"""
+
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from siyadah.data import ROOT, load_json
+from siyadah.regbench import STAGES, change_label, compare, generate_tree, load_script, run_size
+
+DEFAULT_SIZES = "1000,10000,50000"
+DEFAULT_THRESHOLD = 0.25
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "registry-baseline.json")
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+def main():
+    sizes = [int(s) for s in option("--sizes", DEFAULT_SIZES).split(",")]
+    repeat = option("--repeat", 3, int)
+    threshold = option("--threshold", DEFAULT_THRESHOLD, float)
+    baseline_file = option("--baseline", BASELINE_FILE)
+    save = "--save-baseline" in sys.argv
+    gate = "--no-gate" not in sys.argv
+
+    print("=" * 60)
+    print("📏 قياس أداء أدوات السجل")
+    print("=" * 60)
+
+    build = load_script("build-registry.py")
+    add = load_script("add-piece.py")
+
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"registry-bench-{size}-") as root:
+            t0 = time.perf_counter()
+            n_flows = generate_tree(root, size)
+            print(f"\n📦 {size:,} أداة | 🔀 {n_flows:,} flow (توليد {time.perf_counter() - t0:.1f}s)")
+            results[str(size)] = run_size(root, build, add, repeat)
+        for stage in STAGES:
+            m = results[str(size)][stage]
+            print(f"   {stage:28s} {m['seconds'] * 1000:10.1f} ms {m['peak_kb'] / 1024:10.1f} MB")
+
+    if save:
+        os.makedirs(os.path.dirname(baseline_file), exist_ok=True)
+        with open(baseline_file, "w", encoding="utf-8") as f:
+            json.dump({
+                "_meta": {"saved_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                          "python": platform.python_version(), "machine": platform.machine(), "repeat": repeat},
+                "sizes": results,
+            }, f, ensure_ascii=False, indent=2)
+        print(f"\n📁 تم حفظ الـ baseline: {baseline_file}")
+        return
+
+    if not gate:
+        return
+    if not os.path.exists(baseline_file):
+        print(f"\n❌ ما فيه baseline ({baseline_file}) — شغّل --save-baseline أول مرة (أو --no-gate للقياس بس)")
+        sys.exit(2)
+
+    regressions = compare(results, load_json(baseline_file), threshold)
+    if regressions:
+        print(f"\n❌ تراجع في الأداء (> {threshold:.0%}) — {len(regressions)}:")
+        for size, stage, metric, old, new in regressions:
+            print(f"   ❌ [{int(size):,}] {stage} {metric}: {old:,} → {new:,} ({change_label(old, new)})")
+        sys.exit(1)
+
+    print(f"\n✅ بدون تراجع مقارنة بالـ baseline (الحد {threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
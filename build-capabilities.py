@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+🔁 build-capabilities.py — فهرس القدرات المشتركة (بدائل الأدوات)
+
+الاستخدام:
+  python3 build-capabilities.py                        # بناء + كتابة
+  python3 build-capabilities.py --stats                # إحصائيات فقط
+  python3 build-capabilities.py --query gmail.send_email   # البدائل لـ action/trigger
+
+الهيكل:
+  سجل الأدوات + data/tools → data/build/capabilities.json
+    capabilities: {"action/send:email": {kind, label, members: [[piece, name]]}}
+    by_member:    {"gmail.sendemail": "action/send:email"}   (الاسم بعد الطيّ)
+"""
+
+import os
+import sys
+
+from siyadah.data import BUILD_DIR, is_partial_registry, load_flows, load_registry, load_tool_details, write_json
+from siyadah.capabilities import alternatives, build_capability_index, shared_capabilities
+from siyadah.flowcheck import resolve, step_nodes
+
+OUTPUT_FILE = os.path.join(BUILD_DIR, "capabilities.json")
+
+
+def query(index, ref):
+    piece, _, name = ref.partition(".")
+    key = index["by_member"].get("{}.{}".format(*resolve(piece, name)))
+    alts = alternatives(index, piece, name)
+    print(f"\n🔎 {ref} → {key or 'غير مفهرس'}")
+    for p, n in alts:
+        print(f"   🔁 {p}.{n}")
+    if key and not alts:
+        print(f"   — ما فيه بديل من أداة ثانية")
+
+
+def flow_coverage(index):
+    """(لها بديل، الكل، [piece.name بدون بديل]) لخطوات data/flows — أسماء الـ templates تُحوّل بـ resolve"""
+    total = covered = 0
+    missing = []
+    for flow in load_flows().values():
+        for _, node, _ in step_nodes(flow):
+            if node.get("tool_id") and node.get("action"):
+                total += 1
+                if alternatives(index, node["tool_id"], node["action"]):
+                    covered += 1
+                else:
+                    missing.append(f"{node['tool_id']}.{node['action']}")
+    return covered, total, missing
+
+
+def main():
+    stats_only = "--stats" in sys.argv
+
+    print("=" * 60)
+    print("🔁 بناء فهرس القدرات")
+    print("=" * 60)
+
+    pieces, source = load_registry()
+    details = load_tool_details()
+    if is_partial_registry(source):
+        pieces = []     # نفس data/tools — التفاصيل تكفي
+    index = build_capability_index(list(pieces) + list(details.values()))
+
+    if "--query" in sys.argv:
+        query(index, sys.argv[sys.argv.index("--query") + 1])
+        return
+
+    shared = shared_capabilities(index)
+    actions = sum(1 for c in index["capabilities"].values() if c["kind"] == "action")
+    covered, total, missing = flow_coverage(index)
+    index["_metadata"] = {
+        "registry": source,
+        "total_pieces": len({p for p, _ in (m.split(".", 1) for m in index["by_member"])}),
+        "total_members": len(index["by_member"]),
+        "total_capabilities": len(index["capabilities"]),
+        "shared_capabilities": len(shared),
+    }
+
+    print(f"\n✅ اكتمل البناء")
+    print(f"   📦 السجل: {source or '— (data/tools فقط)'} | أدوات: {index['_metadata']['total_pieces']}")
+    print(f"   🧩 عناصر: {len(index['by_member'])} → قدرات: {len(index['capabilities'])} "
+          f"(⚡ {actions} action | 🔔 {len(index['capabilities']) - actions} trigger)")
+    print(f"   🔁 قدرات مشتركة بين أكثر من أداة: {len(shared)}")
+    print(f"   🔀 خطوات data/flows لها بديل: {covered}/{total}")
+    if missing:
+        print(f"      بدون بديل: {', '.join(sorted(set(missing)))}")
+
+    print(f"\n   📌 أكبر القدرات المشتركة:")
+    top = sorted(shared.items(), key=lambda kv: -len(kv[1]["members"]))[:10]
+    for key, cap in top:
+        members = ", ".join(f"{p}.{n}" for p, n in cap["members"][:5])
+        print(f"      {key:32s} {len(cap['members']):3d}  {members}")
+
+    if stats_only:
+        return
+
+    size = write_json(OUTPUT_FILE, index, compact=True)
+    print(f"\n📁 تم الكتابة: {OUTPUT_FILE} ({size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
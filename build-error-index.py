@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+🚨 build-error-index.py — بناء فهرس البحث لخريطة الأخطاء
+
+الاستخدام:
+  python3 build-error-index.py                          # بناء + تحقق + كتابة
+  python3 build-error-index.py --check-only             # تحقق بدون كتابة
+  python3 build-error-index.py --query 401 gmail        # بحث: حالة + أداة
+  python3 build-error-index.py --query 401 - oauth2     # بحث: حالة + نوع مصادقة
+
+الهيكل:
+  data/errors/error-map.json + سجل الأدوات → data/build/error-index.json
+"""
+
+import os
+import sys
+
+from siyadah.data import BUILD_DIR, ERROR_MAP, is_partial_registry, load_json, load_registry, write_json
+from siyadah.errors import build_error_index, lookup
+
+OUTPUT_FILE = os.path.join(BUILD_DIR, "error-index.json")
+
+
+def query(index, args):
+    status = None if args[0] in ("-", "none") else int(args[0])
+    piece = args[1] if len(args) > 1 and args[1] != "-" else None
+    auth = args[2] if len(args) > 2 else None
+    results = lookup(index, status, piece, auth)
+    print(f"\n🔎 {status} | {piece or '*'} | {auth or '*'} → {len(results)} نتيجة")
+    for c in results:
+        fix = c["auto_fix"] or "—"
+        print(f"   {c['code']:28s} auto_fix: {fix:22s} {c['user_message']}")
+
+
+def main():
+    check_only = "--check-only" in sys.argv
+
+    print("=" * 60)
+    print("🚨 بناء فهرس الأخطاء")
+    print("=" * 60)
+
+    pieces, source = load_registry()
+    if not pieces:
+        print("❌ ما فيه سجل أدوات (data/registry ولا data/tools) — affected_pieces و piece_auth يحتاجونه")
+        sys.exit(1)
+    index, errors, warnings = build_error_index(load_json(ERROR_MAP), pieces, is_partial_registry(source))
+
+    if "--query" in sys.argv:
+        query(index, sys.argv[sys.argv.index("--query") + 1:])
+        return
+
+    if warnings:
+        print(f"\n⚠️  تحذيرات ({len(warnings)}):")
+        for w in warnings:
+            print(f"   ⚠️  {w}")
+
+    if errors:
+        print(f"\n❌ أخطاء ({len(errors)}):")
+        for e in errors:
+            print(f"   ❌ {e}")
+        print(f"\n❌ البناء فشل — {len(errors)} خطأ!")
+        sys.exit(1)
+
+    meta = index["_metadata"]
+    print(f"\n✅ التحقق نجح!")
+    print(f"   🚨 أكواد: {meta['total_codes']}")
+    print(f"   🔑 (حالة, أداة): {meta['status_piece_keys']}")
+    print(f"   🔑 (حالة, مصادقة): {meta['status_auth_keys']}")
+    print(f"   🔑 wildcard: {meta['status_keys']}")
+    print(f"   📦 السجل: {source} ({len(pieces)} أداة{'، جزئي' if is_partial_registry(source) else ''})")
+
+    if check_only:
+        return
+
+    size = write_json(OUTPUT_FILE, index, compact=True)
+    print(f"\n📁 تم الكتابة: {OUTPUT_FILE} ({size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
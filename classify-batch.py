@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+🤖 classify-batch.py — تصنيف جماعي ببرومبتات data/prompts (N عنصر في طلب واحد)
+
+الاستخدام:
+  python3 classify-batch.py --bench                        # 2,000 عميل اصطناعي على الـ stub
+  python3 classify-batch.py --bench 10000 --batch 50 --concurrency 16 --compare
+  python3 classify-batch.py --leads leads.csv --industry clinic --out classified.jsonl
+  python3 classify-batch.py --prompt classify_complaint --leads complaints.jsonl
+  python3 classify-batch.py --leads leads.csv --backend openai --model gpt-4o-mini
+
+المدخلات: .csv (صفوف شيت → trigger.row.*) أو .jsonl (payload لكل سطر → trigger.body.*)
+          تُحل بمصادر data/variables (نفس resolve-variables.py)
+الـ backend: stub (افتراضي، حتمي) | openai (OPENAI_API_KEY، OPENAI_BASE_URL)
+--compare: يشغّل نفس العناصر بطلب لكل عنصر (stub) للمقارنة
+"""
+
+import asyncio
+import csv
+import json
+import os
+import random
+import sys
+
+from siyadah.batchai import (DEFAULT_BATCH, DEFAULT_CONCURRENCY, OpenAIBackend, StubBackend, build_plan, run,
+                             summarize)
+from siyadah.data import PROMPTS_FILE, load_json, load_variables
+from siyadah.variables import compile_source, compile_variables, resolve_batch, rows_from_columns
+
+BENCH_ITEMS = 2000
+SOURCE_ICONS = {"batch": "📦", "retry": "🔁", "fallback": "🛟"}
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+def read_payloads(path):
+    with open(path, encoding="utf-8-sig") as f:
+        if path.endswith(".csv"):
+            return [{"row": row} for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def resolve_items(plan, payloads):
+    """payloads → [{item_key: value}] — متغيرات الكتالوج بمصادرها، والباقي (trigger.*) من الـ payload مباشرة"""
+    catalog = load_variables()
+    keys = set(plan["item_keys"])
+    compiled = compile_variables(catalog, keys)
+    columns, _ = resolve_batch(compiled, payloads)
+    items = rows_from_columns(columns) if columns else [{} for _ in payloads]
+    direct = [(k, compile_source(k)[0][2]) for k in keys - set(columns) if compile_source(k)[0][0] == "row"]
+    for item, payload in zip(items, payloads):
+        for k, get in direct:
+            item[k] = get(payload)
+    return items
+
+
+def make_payloads(n, seed=3):
+    rnd = random.Random(seed)
+    messages = ["أبي أحجز موعد الحين", "كم أسعار الخدمات عندكم؟", "السلام عليكم", "حابب أشتري الباقة الكاملة",
+                "وش مواعيد الدوام؟", "شكراً", "عاجل أبغى عرض سعر", "متى تفتحون؟", "استفسار بسيط"]
+    return [{"body": {"name": f"عميل {i}", "message": rnd.choice(messages),
+                      "source": rnd.choice(["website", "whatsapp", "referral"])}} for i in range(n)]
+
+
+def make_backend(kind, plan, latency, model, concurrency):
+    if kind == "openai":
+        return OpenAIBackend(os.environ.get("OPENAI_BASE_URL", "https://api.openai.com"),
+                             os.environ.get("OPENAI_API_KEY"), model or plan["model"], concurrency)
+    return StubBackend(plan, latency=latency)
+
+
+async def execute(plan, items, backend, batch_size, concurrency):
+    try:
+        return await run(plan, items, backend, batch_size, concurrency)
+    finally:
+        if hasattr(backend, "close"):
+            await backend.close()
+
+
+def print_summary(title, s):
+    print(f"\n{title}")
+    print(f"   📄 عناصر: {s['items']:,} | 📨 طلبات: {s['calls']:,} (بدل {s['baseline_calls']:,}) — "
+          f"💾 وفّرنا {s['calls_saved']:,} طلب ({s['calls_saved_pct']}%)")
+    print(f"   ⚡ {s['items_per_second']:,.1f} عنصر/ثانية ({s['seconds']}s)")
+    print(f"   🧱 البادئة الثابتة: {s['prefix_chars']:,} حرف | حجم البرومبتات أقل بـ {s['prompt_chars_saved_pct']}%")
+    if s["retried"] or s["fallback"] or s["errors"]:
+        print(f"   🔁 إعادة: {s['retried']:,} | 🛟 fallback: {s['fallback']:,} | ❌ أخطاء: {s['errors']:,}")
+    if s["usage"].get("prompt_tokens"):
+        u = s["usage"]
+        print(f"   🔢 tokens: {u['prompt_tokens']:,} prompt ({u.get('cached_tokens', 0):,} من الكاش) + "
+              f"{u.get('completion_tokens', 0):,} completion")
+
+
+def main():
+    prompt_id = option("--prompt", "classify_lead")
+    leads_path = option("--leads")
+    industry = option("--industry", "general_services")
+    batch_size = option("--batch", DEFAULT_BATCH, int)
+    concurrency = option("--concurrency", DEFAULT_CONCURRENCY, int)
+    kind = option("--backend", "stub")
+    model = option("--model")
+    latency = option("--latency", 0.4, float)
+    out_path = option("--out")
+
+    prompts = load_json(PROMPTS_FILE).get("prompts", {})
+    if prompt_id not in prompts:
+        print(f"❌ برومبت غير موجود: {prompt_id} (المتاح: {', '.join(prompts)})")
+        sys.exit(1)
+    try:
+        plan = build_plan(prompts[prompt_id], {"company.industry": industry}, industry)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if "--bench" in sys.argv:
+        i = sys.argv.index("--bench")
+        n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else BENCH_ITEMS
+        payloads = make_payloads(n)
+    elif leads_path:
+        payloads = read_payloads(leads_path)
+    else:
+        print(__doc__)
+        sys.exit(1)
+
+    print("=" * 60)
+    print(f"🤖 تصنيف جماعي — {prompt_id} ({kind})")
+    print("=" * 60)
+    items = resolve_items(plan, payloads)
+    print(f"   📄 {len(items):,} عنصر | 📦 {batch_size} لكل طلب | ⚡ تزامن: {concurrency} | 🏷️ {industry}")
+
+    backend = make_backend(kind, plan, latency, model, concurrency)
+    results, stats = asyncio.run(execute(plan, items, backend, batch_size, concurrency))
+    summary = summarize(plan, stats)
+    print_summary(f"📦 دفعات ({batch_size} لكل طلب)", summary)
+
+    if "--compare" in sys.argv:
+        _, single = asyncio.run(execute(plan, items, StubBackend(plan, latency=latency), 1, concurrency))
+        base = summarize(plan, single)
+        print_summary("1️⃣  طلب لكل عنصر (stub)", base)
+        print(f"\n   🚀 أسرع بـ {summary['items_per_second'] / max(base['items_per_second'], 1e-9):.1f}x")
+
+    counts = {}
+    for r in results:
+        counts[r["_source"]] = counts.get(r["_source"], 0) + 1
+    field = plan["fields"][0] if plan["fields"] else None
+    if field:
+        dist = {}
+        for r in results:
+            dist[str(r.get(field))] = dist.get(str(r.get(field)), 0) + 1
+        print(f"\n   🏷️ {field}: " + " | ".join(f"{k}: {v:,}" for k, v in sorted(dist.items())))
+    print("   " + " | ".join(f"{SOURCE_ICONS[k]} {k}: {v:,}" for k, v in counts.items()))
+
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        print(f"\n📁 تم الكتابة: {out_path}")
+
+    if summary["errors"] and summary["fallback"] == summary["items"]:
+        print(f"\n❌ كل الطلبات فشلت: {stats.get('last_error')}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+🧩 compile-flows.py — تجميع قوالب الـ Flows لكل صناعة
+
+المبدأ: الدمج (قالب + صناعة + رسائل + متغيرات) يصير مرة وحدة وقت البناء،
+ووقت التشغيل الـ builder يعبّي الـ slots بس.
+
+الاستخدام:
+  python3 compile-flows.py              # تجميع + تحقق + كتابة
+  python3 compile-flows.py --check-only # تحقق بدون كتابة
+  python3 compile-flows.py --stats      # أحجام وأوقات التجميع فقط
+
+الهيكل:
+  data/flows/*.json + data/templates/messages/*.json + data/variables/*.json
+  → data/build/bundles/{flow_id}.{industry}.json
+  → data/build/bundles/index.json
+"""
+
+import json
+import os
+import sys
+import time
+
+from siyadah.data import BUILD_DIR, load_flows, load_messages, load_variables, write_json
+from siyadah.bundles import compile_bundle
+
+OUTPUT_DIR = os.path.join(BUILD_DIR, "bundles")
+
+
+def main():
+    check_only = "--check-only" in sys.argv
+    stats_only = "--stats" in sys.argv
+
+    print("=" * 60)
+    print("🧩 تجميع حزم الـ Flows")
+    print("=" * 60)
+
+    flows = load_flows()
+    messages = load_messages()
+    catalog = load_variables()
+    industries = sorted(messages)
+
+    errors = []
+    warnings = []
+    report = []
+    bundles = {}
+
+    for flow_id, flow in flows.items():
+        for industry in industries:
+            t0 = time.perf_counter()
+            bundle, errs, warns = compile_bundle(flow, industry, messages, catalog)
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+            errors.extend(errs)
+            warnings.extend(warns)
+            name = f"{flow_id}.{industry}"
+            bundles[name] = bundle
+            report.append([name, len(bundle["slots"]), len(bundle["holes"]), elapsed_ms])
+
+    # نفس التحذير يتكرر لكل صناعة — اعرضه مرة وحدة
+    warnings = list(dict.fromkeys(warnings))
+    errors = list(dict.fromkeys(errors))
+
+    if warnings:
+        print(f"\n⚠️  تحذيرات ({len(warnings)}):")
+        for w in warnings:
+            print(f"   ⚠️  {w}")
+
+    if errors:
+        print(f"\n❌ أخطاء ({len(errors)}):")
+        for e in errors:
+            print(f"   ❌ {e}")
+        print(f"\n❌ التجميع فشل — {len(errors)} خطأ!")
+        sys.exit(1)
+
+    print(f"\n✅ التحقق نجح!")
+    print(f"   🧩 قوالب: {len(flows)} × صناعات: {len(industries)} = {len(bundles)} حزمة")
+
+    if check_only:
+        return
+
+    total_bytes = 0
+    if stats_only:
+        # نفس حجم الملف المكتوب (compact) بدون كتابة
+        for row in report:
+            row.append(len(json.dumps(bundles[row[0]], ensure_ascii=False, separators=(",", ":")).encode("utf-8")))
+    else:
+        index = {}
+        for row in report:
+            size = write_json(os.path.join(OUTPUT_DIR, f"{row[0]}.json"), bundles[row[0]], compact=True)
+            row.append(size)
+            total_bytes += size
+            meta = bundles[row[0]]["_bundle"]
+            index[row[0]] = {"flow_id": meta["flow_id"], "industry": meta["industry"],
+                             "file": f"{row[0]}.json", "bytes": size}
+        write_json(os.path.join(OUTPUT_DIR, "index.json"), index)
+
+    print(f"\n   {'الحزمة':40s} {'slots':>6s} {'holes':>6s} {'ms':>8s} {'KB':>8s}")
+    for row in report:
+        print(f"   {row[0]:40s} {row[1]:6d} {row[2]:6d} {row[3]:8.2f} {row[4] / 1024:8.1f}")
+
+    total_ms = sum(r[3] for r in report)
+    print(f"\n   ⏱️  وقت التجميع: {total_ms:.1f}ms (متوسط {total_ms / max(len(report), 1):.2f}ms للحزمة)")
+    if total_bytes:
+        print(f"\n📁 تم الكتابة: {OUTPUT_DIR}/ ({len(report)} حزمة، {total_bytes / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+✉️ compile-messages.py — تجميع قوالب الرسائل + قياس الرندر الجماعي
+
+الاستخدام:
+  python3 compile-messages.py              # تجميع + تحقق variables_used + كتابة
+  python3 compile-messages.py --check-only # تحقق بدون كتابة
+  python3 compile-messages.py --bench      # قياس: شيت فواتير 50,000 صف
+  python3 compile-messages.py --bench 200000
+
+الهيكل:
+  data/templates/messages/*.json → data/build/messages.json
+"""
+
+import os
+import random
+import sys
+import time
+
+from siyadah.data import BUILD_DIR, load_messages, load_variables, write_json
+from siyadah.messages import compile_messages, render_batch, catalog_fallbacks
+
+OUTPUT_FILE = os.path.join(BUILD_DIR, "messages.json")
+BENCH_ROWS = 50000
+
+# متغيرات قوالب الفواتير → أعمدة شيت الفواتير (invoice-collection: variable_injection)
+INVOICE_COLUMNS = {
+    "customer.name": "الاسم",
+    "invoice.number": "رقم_الفاتورة",
+    "invoice.amount": "المبلغ",
+    "invoice.due_date": "تاريخ_الاستحقاق",
+    "invoice.days_overdue": "أيام_التأخير",
+}
+
+
+def make_invoice_rows(n, seed=42):
+    rnd = random.Random(seed)
+    names = ["محمد الأحمدي", "سارة العتيبي", "خالد القحطاني", "نورة الشهري", "عبدالله الدوسري"]
+    rows = []
+    for i in range(n):
+        days = rnd.randint(1, 30)
+        rows.append({
+            "رقم_الفاتورة": f"INV-2026-{i:06d}",
+            "الاسم": rnd.choice(names),
+            "الجوال": f"+9665{rnd.randint(0, 99999999):08d}",
+            "المبلغ": f"{rnd.randint(100, 50000):,}",
+            "تاريخ_الاستحقاق": f"2026-0{rnd.randint(1, 9)}-{rnd.randint(10, 28)}",
+            "أيام_التأخير": str(days),
+            "الحالة": "غير مدفوعة",
+        })
+    return rows
+
+
+def bench(compiled, catalog, n):
+    print(f"\n⏱️  قياس الرندر الجماعي — شيت فواتير {n:,} صف")
+    rows = make_invoice_rows(n)
+    shared = {
+        "company.company_name": "عيادة النور",
+        "company.phone": "+966112345678",
+        "company.signature": "مع تحيات فريق عيادة النور",
+        "company.payment_link": "https://pay.example.sa/alnoor",
+    }
+    fallbacks = catalog_fallbacks(catalog)
+
+    # نفس منطق calculate_days_overdue: ≤7 أيام gentle وإلا firm
+    gentle = [r for r in rows if int(r["أيام_التأخير"]) <= 7]
+    firm = [r for r in rows if int(r["أيام_التأخير"]) > 7]
+
+    print(f"   {'الصناعة':20s} {'رسالة/ثانية':>14s} {'ms':>9s} {'تجاوزات':>8s}")
+    for industry, templates in sorted(compiled.items()):
+        t0 = time.perf_counter()
+        out = 0
+        violations = 0
+        for name, group in (("invoice_gentle", gentle), ("invoice_firm", firm)):
+            msgs, v = render_batch(templates[name], group, shared, INVOICE_COLUMNS, fallbacks)
+            out += len(msgs)
+            violations += len(v)
+        elapsed = time.perf_counter() - t0
+        print(f"   {industry:20s} {out / elapsed:14,.0f} {elapsed * 1000:9.1f} {violations:8d}")
+
+
+def main():
+    check_only = "--check-only" in sys.argv
+    bench_n = None
+    if "--bench" in sys.argv:
+        i = sys.argv.index("--bench")
+        bench_n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 else BENCH_ROWS
+
+    print("=" * 60)
+    print("✉️  تجميع قوالب الرسائل")
+    print("=" * 60)
+
+    catalog = load_variables()
+    compiled, errors, warnings = compile_messages(load_messages())
+
+    if warnings:
+        print(f"\n⚠️  تحذيرات ({len(warnings)}):")
+        for w in warnings:
+            print(f"   ⚠️  {w}")
+
+    if errors:
+        print(f"\n❌ أخطاء ({len(errors)}):")
+        for e in errors:
+            print(f"   ❌ {e}")
+        print(f"\n❌ التجميع فشل — {len(errors)} خطأ!")
+        sys.exit(1)
+
+    total = sum(len(t) for t in compiled.values())
+    slots = sum(len(c["keys"]) for t in compiled.values() for c in t.values())
+    print(f"\n✅ التحقق نجح!")
+    print(f"   ✉️  قوالب: {total} ({len(compiled)} صناعات)")
+    print(f"   🧩 slots: {slots}")
+
+    if bench_n:
+        bench(compiled, catalog, bench_n)
+
+    if check_only or bench_n:
+        return
+
+    size = write_json(OUTPUT_FILE, compiled, compact=True)
+    print(f"\n📁 تم الكتابة: {OUTPUT_FILE} ({size / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
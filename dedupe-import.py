@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+🧬 dedupe-import.py — تصنيف دفعة استيراد (جديد / مكرر) مقابل فهرس الـ tenant
+
+الاستخدام:
+  python3 dedupe-import.py contacts.csv --tenant 42                    # تصنيف + تحديث الفهرس
+  python3 dedupe-import.py contacts.csv --tenant 42 --check-only --out new.csv --dups dups.csv
+  python3 dedupe-import.py invoices.csv --tenant 42 --date 2026-10-19  # hash(invoice_number + date)
+  python3 dedupe-import.py contacts.csv --tenant 42 --bloom            # Bloom filter قبل الفهرس
+  python3 dedupe-import.py --tenant 42 --stats | --compact | --reset
+  python3 dedupe-import.py --bench                                     # 500,000 صف (مجلد مؤقت)
+
+الأعمدة الافتراضية (sheets-config): الجوال | الإيميل | رقم_الفاتورة
+  --phone-column / --email-column / --invoice-column ("-" لتجاهل العمود)
+الفهرس: data/build/dedupe/<tenant>/
+"""
+
+import csv
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from siyadah.dedupe import DEDUPE_DIR, DEFAULT_FIELDS, DedupeIndex, classify_batch, new_report, tenant_dir
+
+BENCH_ROWS = 500000
+STATUS_ICONS = {"new": "🆕", "duplicate": "♻️ ", "duplicate_in_batch": "🔁", "no_key": "❔"}
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+def make_rows(n, seed=21):
+    """عملاء اصطناعيون — نفس الرقم بصيغ مختلفة + إيميلات بحروف كبيرة"""
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(n):
+        d = f"{rnd.randint(0, 20000000):08d}"
+        phone = rnd.choice(["05" + d, "+9665" + d, "9665" + d, f"05{d[:1]} {d[1:4]} {d[4:]}"])
+        email = rnd.choice([f"user{d}@mail.com", f"User{d}@Mail.com ", ""])
+        rows.append({"الاسم": f"عميل {i}", "الجوال": phone, "الإيميل": email})
+    return rows
+
+
+def print_report(report, seconds):
+    print(f"\n   📄 صفوف: {report['rows']:,} | ⚡ {report['rows'] / max(seconds, 1e-9):,.0f} صف/ثانية "
+          f"({seconds * 1000:.0f} ms)")
+    for status, icon in STATUS_ICONS.items():
+        print(f"   {icon} {status:19s} {report[status]:10,d}")
+    print("   🔑 تطابق: " + " | ".join(f"{k}: {v:,}" for k, v in report["matched"].items()))
+    print(f"   ➕ hashes جديدة في الفهرس: {report['added']:,}")
+
+
+def print_index(index):
+    bloom = index.meta.get("bloom")
+    print(f"   🗂️  [{index.tenant}] {index.count:,} مفتاح | log: {index.meta['logged']:,}"
+          + (f" | 🌸 Bloom {bloom['m'] // 8 // 1024:,} KB، k={bloom['k']}" if bloom else ""))
+    print(f"   📥 تحميل الفهرس الكامل: {index.loads} مرة | تخطّاها الـ Bloom: {index.bloom_skips:,}")
+
+
+def bench(n, use_bloom):
+    rows = make_rows(n)
+    half = n // 2
+    tmp = tempfile.mkdtemp(prefix="siyadah-dedupe-")
+    try:
+        for bloom in ([False, True] if use_bloom is None else [use_bloom]):
+            label = "🌸 Bloom + فهرس" if bloom else "🗂️  فهرس فقط"
+            print(f"\n⏱️  {label} — {half:,} صف أساس ثم {n - half:,} صف جديد")
+            index = DedupeIndex(f"bench-{int(bloom)}", tmp, bloom=bloom, capacity=n)
+            t0 = time.perf_counter()
+            classify_batch(index, rows[:half])
+            index.save()
+            print(f"   📦 بناء الأساس: {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+            index = DedupeIndex(f"bench-{int(bloom)}", tmp, bloom=bloom, capacity=n)
+            t0 = time.perf_counter()
+            _, report = classify_batch(index, rows[half:])
+            index.save()
+            print_report(report, time.perf_counter() - t0)
+            print_index(index)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def main():
+    tenant = option("--tenant")
+    date = option("--date")
+    out_path = option("--out")
+    dups_path = option("--dups")
+    directory = option("--dir", DEDUPE_DIR)
+    fields = dict(DEFAULT_FIELDS)
+    for kind in fields:
+        column = option(f"--{kind}-column")
+        if column is not None:
+            fields[kind] = None if column == "-" else column
+    use_bloom = "--bloom" in sys.argv
+    check_only = "--check-only" in sys.argv
+
+    print("=" * 60)
+    print("🧬 كشف التكرار")
+    print("=" * 60)
+
+    if "--bench" in sys.argv:
+        i = sys.argv.index("--bench")
+        n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else BENCH_ROWS
+        bench(n, True if use_bloom else None)
+        return
+
+    if not tenant:
+        print("❌ --tenant مطلوب")
+        sys.exit(1)
+
+    try:
+        target = tenant_dir(tenant, directory)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if "--reset" in sys.argv:
+        shutil.rmtree(target, ignore_errors=True)
+        print(f"🗑️  تم حذف فهرس {tenant}")
+        return
+
+    index = DedupeIndex(tenant, directory, bloom=use_bloom)
+    if "--compact" in sys.argv:
+        index.compact()
+        print_index(index)
+        return
+    if "--stats" in sys.argv:
+        print_index(index)
+        return
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    with open(args[0], encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        columns = reader.fieldnames or []
+        rows = list(reader)
+    active = {k: c for k, c in fields.items() if c and c in columns}
+    if not active:
+        print(f"❌ ما فيه أعمدة مفاتيح في الملف ({', '.join(c for c in fields.values() if c)})")
+        sys.exit(1)
+    print(f"   📂 {args[0]} — مفاتيح: {', '.join(f'{k}={c}' for k, c in active.items())}"
+          + (f" | 📅 {date}" if date and "invoice" in active else ""))
+
+    t0 = time.perf_counter()
+    statuses, report = classify_batch(index, rows, active, date, update=not check_only, report=new_report())
+    if not check_only:
+        index.save()
+    print_report(report, time.perf_counter() - t0)
+    print_index(index)
+
+    for path, wanted in ((out_path, {"new"}), (dups_path, {"duplicate", "duplicate_in_batch"})):
+        if not path:
+            continue
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=columns + ["dedupe_status"])
+            w.writeheader()
+            for row, status in zip(rows, statuses):
+                if status in wanted:
+                    w.writerow(dict(row, dedupe_status=status))
+        print(f"📁 تم الكتابة: {path}")
+
+
+if __name__ == "__main__":
+    main()
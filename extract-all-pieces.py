@@ -8,6 +8,8 @@ Source: github.com/activepieces/activepieces → packages/pieces/community/
 
 import json, os, re, glob
 
+from siyadah.categories import classify, load_classifier
+
 SOURCE_DIR = "/home/claude/source/community"
 FALLBACK = "/mnt/user-data/uploads/complete_registry.json"
 OUTPUT_REGISTRY = "/home/claude/siyadah/data/registry/tools-full.json"
@@ -54,36 +56,9 @@ TRIGGER_TYPE_MAP = {
     'TriggerStrategy.POLLING': 'scheduled',
 }
 
-# Category mapping
-def guess_category(piece_id):
-    k = piece_id.lower()
-    if k in ['webhook', 'schedule', 'branch', 'code', 'delay', 'loop', 'storage', 'http']:
-        return 'A_essential'
-    if k.startswith('google-') or k in ['gmail', 'googlechat']:
-        return 'B_google'
-    if k.startswith('microsoft-'):
-        return 'L_microsoft'
-    if any(x in k for x in ['openai', 'anthropic', 'gemini', 'claude', 'hugging', 'deepseek', 'groq', 'mistral', 'cohere', 'perplexity', 'replicate', 'stability', 'amazon-bedrock']):
-        return 'D_ai'
-    if any(x in k for x in ['slack', 'discord', 'telegram', 'whatsapp', 'twilio', 'sms', 'sendgrid', 'mailgun', 'smtp', 'email', 'mailer', 'postmark', 'pushover', 'ntfy', 'intercom', 'crisp', 'freshdesk', 'zendesk', 'tawk']):
-        return 'C_communication'
-    if any(x in k for x in ['hubspot', 'salesforce', 'zoho-crm', 'pipedrive', 'freshsales', 'attio', 'close-crm', 'copper']):
-        return 'E_crm'
-    if any(x in k for x in ['shopify', 'woocommerce', 'stripe', 'paypal', 'square', 'lemonsqueezy', 'gumroad', 'paddle']):
-        return 'F_ecommerce'
-    if any(x in k for x in ['mailchimp', 'activecampaign', 'convertkit', 'drip', 'campaign', 'facebook', 'instagram', 'twitter', 'linkedin', 'tiktok', 'youtube', 'pinterest', 'reddit', 'hootsuite', 'buffer']):
-        return 'H_marketing'
-    if any(x in k for x in ['mysql', 'postgres', 'supabase', 'firebase', 'mongodb', 'redis', 'sql', 'database', 'pinecone', 'qdrant', 'weaviate', 'milvus', 'snowflake', 'bigquery', 'clickhouse', 'airtable', 'baserow', 'nocodb']):
-        return 'J_database'
-    if any(x in k for x in ['github', 'gitlab', 'bitbucket', 'jira', 'jenkins', 'docker', 'aws', 'azure', 'vercel', 'netlify', 'sentry', 'datadog', 'pagerduty', 'linear']):
-        return 'K_dev'
-    if any(x in k for x in ['wordpress', 'webflow', 'contentful', 'strapi', 'cms', 'ghost', 'medium']):
-        return 'I_content'
-    if any(x in k for x in ['invoice', 'accounting', 'quickbooks', 'xero', 'freshbooks', 'billing', 'zoho-invoice', 'wave']):
-        return 'M_finance'
-    if any(x in k for x in ['notion', 'trello', 'clickup', 'asana', 'monday', 'todoist', 'basecamp', 'calendly', 'cal-com']):
-        return 'G_productivity'
-    return 'G_productivity'
+# Category mapping — القواعد في data/registry/category-rules.json
+CATEGORY_CLASSIFIER = load_classifier()
+LOW_CONFIDENCE = 0.5
 
 
 def extract_string(text, key):
@@ -288,6 +263,7 @@ all_actions = 0
 all_triggers = 0
 all_props = 0
 errors = []
+low_confidence = []
 
 piece_dirs = sorted([d for d in os.listdir(SOURCE_DIR) if os.path.isdir(os.path.join(SOURCE_DIR, d))])
 
@@ -407,7 +383,9 @@ for piece_id in piece_dirs:
     triggers = unique_triggers
     
     display_name = meta.get('displayName') or piece_id.replace('-', ' ').title()
-    category = guess_category(piece_id)
+    category, confidence = classify(CATEGORY_CLASSIFIER, piece_id)
+    if confidence < LOW_CONFIDENCE:
+        low_confidence.append(piece_id)
     
     # Registry piece entry
     piece = {
@@ -516,6 +494,10 @@ print(f"   📂 السجل: {OUTPUT_REGISTRY}")
 print(f"   📂 الملفات: {OUTPUT_PIECES_DIR}/ ({len(pieces)} ملف)")
 print(f"   📂 التفاصيل: {OUTPUT_TOOLS_DIR}/ ({len(pieces)} ملف)")
 
+if low_confidence:
+    print(f"\n⚠️  تصنيف بثقة منخفضة ({len(low_confidence)}) — أضفها لـ overrides في category-rules.json:")
+    print(f"   {', '.join(low_confidence[:40])}{' ...' if len(low_confidence) > 40 else ''}")
+
 # Top 20 by action count
 top = sorted(pieces, key=lambda p: len(p['actions']), reverse=True)[:20]
 print(f"\n🏆 أكبر 20 أداة:")
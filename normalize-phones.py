@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+📱 normalize-phones.py — تطبيع أرقام الجوال (السعودية + الخليج) لعمود كامل
+
+الاستخدام:
+  python3 normalize-phones.py contacts.csv                       # عمود الجوال → تقرير
+  python3 normalize-phones.py contacts.csv --column Phone --out normalized.csv
+  python3 normalize-phones.py contacts.csv --country AE          # الدولة الافتراضية للأرقام المحلية
+  python3 normalize-phones.py --check "٠٥٠ ١٢٣ ٤٥٦٧" "00971501234567"
+  python3 normalize-phones.py --bench                            # 100,000 رقم
+  python3 normalize-phones.py --bench 1000000
+
+المخرج (--out): نفس الـ CSV + formatted_phone + is_valid (نفس مخرجات خطوة format_phone)
+"""
+
+import csv
+import random
+import sys
+import time
+
+from siyadah.phones import COUNTRIES, cache_info, normalize_column, normalize_phone
+
+DEFAULT_COLUMN = "الجوال"
+BENCH_ROWS = 100000
+ARABIC_DIGITS = str.maketrans("0123456789", "٠١٢٣٤٥٦٧٨٩")
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+def make_phones(n, seed=11):
+    """أرقام بكل الصيغ — ربعها مكرر (عملاء يرجعون)"""
+    rnd = random.Random(seed)
+    shapes = [
+        lambda d: "05" + d,
+        lambda d: "5" + d,
+        lambda d: "+9665" + d,
+        lambda d: "009665" + d,
+        lambda d: "9665" + d,
+        lambda d: f"05{d[:1]} {d[1:4]} {d[4:]}",
+        lambda d: ("05" + d).translate(ARABIC_DIGITS),
+        lambda d: "+9715" + d,
+        lambda d: "+965" + d[:7] + "9",
+        lambda d: d[:5],
+        lambda d: "",
+    ]
+    phones = []
+    for i in range(n):
+        if phones and rnd.random() < 0.25:
+            phones.append(rnd.choice(phones))
+            continue
+        phones.append(rnd.choice(shapes)(f"{rnd.randint(0, 99999999):08d}"))
+    return phones
+
+
+def print_report(report, seconds):
+    print(f"\n   📄 صفوف: {report['rows']:,} | 🔁 فريدة: {report['unique']:,} | "
+          f"✅ صالحة: {report['valid']:,} | ✏️  تغيّرت: {report['changed']:,}")
+    print(f"   ⚡ {report['rows'] / max(seconds, 1e-9):,.0f} رقم/ثانية ({seconds * 1000:.0f} ms)")
+    if report["countries"]:
+        print("   🌍 " + " | ".join(f"{k}: {v:,}" for k, v in report["countries"].most_common())
+              + "   📱 " + " | ".join(f"{k}: {v:,}" for k, v in report["kinds"].most_common()))
+    if report["invalid"]:
+        print("   ❌ " + " | ".join(f"{k}: {v:,}" for k, v in report["invalid"].most_common()))
+
+
+def main():
+    column = option("--column", DEFAULT_COLUMN)
+    country = option("--country", "SA").upper()
+    out_path = option("--out")
+
+    if country not in COUNTRIES:
+        print(f"❌ دولة غير مدعومة: {country} (المتاح: {', '.join(COUNTRIES)})")
+        sys.exit(1)
+
+    if "--check" in sys.argv:
+        for value in sys.argv[sys.argv.index("--check") + 1:]:
+            phone, ok, iso, kind = normalize_phone(value, country)
+            print(f"   {'✅' if ok else '❌'} {value!r:24s} → {phone:16s} {iso or '-':3s} {kind}")
+        return
+
+    print("=" * 60)
+    print("📱 تطبيع أرقام الجوال")
+    print("=" * 60)
+
+    if "--bench" in sys.argv:
+        i = sys.argv.index("--bench")
+        n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else BENCH_ROWS
+        phones = make_phones(n)
+        t0 = time.perf_counter()
+        _, _, report = normalize_column(phones, country)
+        print_report(report, time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        normalize_column(phones, country)
+        info = cache_info()
+        print(f"   ♻️  مرة ثانية (من الكاش): {(time.perf_counter() - t0) * 1000:.0f} ms "
+              f"| كاش: {info.currsize:,} رقم، {info.hits:,} hit")
+        return
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print(__doc__)
+        sys.exit(1)
+
+    with open(args[0], encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        fields = reader.fieldnames or []
+        rows = list(reader)
+    if column not in fields:
+        print(f"❌ العمود '{column}' غير موجود (الأعمدة: {', '.join(fields)})")
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    formatted, valid, report = normalize_column([r[column] for r in rows], country)
+    print(f"   📂 {args[0]} — عمود {column}")
+    print_report(report, time.perf_counter() - t0)
+
+    if out_path:
+        with open(out_path, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=fields + ["formatted_phone", "is_valid"])
+            w.writeheader()
+            for row, phone, ok in zip(rows, formatted, valid):
+                w.writerow(dict(row, formatted_phone=phone, is_valid=ok))
+        print(f"\n📁 تم الكتابة: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
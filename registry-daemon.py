@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+🛰️ registry-daemon.py — خدمة محلية للسجل (بدل ما كل worker يحمّل السجل بنفسه)
+
+الاستخدام:
+  python3 registry-daemon.py                       # Unix socket + HTTP على 127.0.0.1:8765
+  python3 registry-daemon.py --port 9000 --socket /tmp/siyadah.sock --interval 5
+  python3 registry-daemon.py --query search q=sheets          # عميل (عبر الـ socket)
+  python3 registry-daemon.py --query validate piece=gmail action=send_email props=receiver,subject
+
+البروتوكول:
+  Unix socket: سطر JSON لكل طلب  {"op": "piece", "id": "gmail"}
+               سطر JSON لكل رد   {"ok": true, "data": ...} | {"ok": false, "error": "..."}
+  HTTP:        GET /piece?id=gmail  |  /search?q=...  |  /category?category=B_google
+               /validate?piece=..&action=..&kind=action&props=a,b  |  /error?status=401&piece=gmail
+               /flow?id=lead-capture  |  /health  |  /metrics
+
+إعادة التحميل: يراقب data/registry + data/tools + data/flows + error-map.json
+(كل --interval ثانية) ويبني الـ state من جديد لما يتغيّر شي — مثلاً بعد build-registry.py.
+"""
+
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+import time
+import urllib.parse
+
+from siyadah.data import BUILD_DIR
+from siyadah.service import Metrics, RequestError, build_state, dispatch, snapshot
+
+DEFAULT_SOCKET = os.path.join(BUILD_DIR, "registry.sock")
+DEFAULT_PORT = 8765
+LINE_LIMIT = 64 * 1024          # أطول سطر (طلب JSON أو header) — الأطول يُرفض ويُقفل الاتصال
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+class Daemon:
+    def __init__(self):
+        self.state = build_state()
+        self.metrics = Metrics()
+
+    def handle(self, op, params):
+        t0 = time.perf_counter()
+        try:
+            if op == "metrics":
+                response = {"ok": True, "data": self.metrics.report()}
+            else:
+                response = {"ok": True, "data": dispatch(self.state, op, params)}
+        except (RequestError, ValueError) as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            # خطأ غير متوقع في طلب واحد ما يقطع الاتصال ولا يوقف الخدمة
+            response = {"ok": False, "error": f"خطأ داخلي: {type(e).__name__}: {e}"}
+        self.metrics.record(op, time.perf_counter() - t0, response["ok"])
+        return response
+
+    # ---------- Unix socket: JSON lines ----------
+
+    async def serve_socket(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    response = {"ok": False, "error": f"الطلب أطول من {LINE_LIMIT} بايت"}
+                    writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    req = json.loads(line)
+                except ValueError:
+                    response = {"ok": False, "error": "JSON غير صالح"}
+                else:
+                    if isinstance(req, dict):
+                        response = self.handle(req.pop("op", ""), req)
+                    else:
+                        response = {"ok": False, "error": "الطلب لازم يكون JSON object"}
+                writer.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # ---------- HTTP (localhost) ----------
+
+    @staticmethod
+    async def _http_reply(writer, status, response, keep):
+        body = json.dumps(response, ensure_ascii=False).encode("utf-8")
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json; charset=utf-8\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep else 'close'}"
+                     f"\r\n\r\n".encode() + body)
+        await writer.drain()
+
+    async def serve_http(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                    if not request_line:
+                        break
+                    keep = True
+                    while True:
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        if line.lower().startswith(b"connection:") and b"close" in line.lower():
+                            keep = False
+                except (ValueError, asyncio.LimitOverrunError):
+                    await self._http_reply(writer, "431 Request Header Fields Too Large",
+                                           {"ok": False, "error": f"سطر أطول من {LINE_LIMIT} بايت"}, False)
+                    break
+                parts = request_line.decode("latin-1").split()
+                url = urllib.parse.urlsplit(parts[1] if len(parts) > 1 else "/")
+                params = dict(urllib.parse.parse_qsl(url.query))
+                response = self.handle(url.path.strip("/"), params)
+                await self._http_reply(writer, "200 OK" if response["ok"] else "400 Bad Request", response, keep)
+                if not keep:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    # ---------- hot reload ----------
+
+    async def watch(self, interval):
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(interval)
+            if snapshot() == self.state["stamp"]:
+                continue
+            try:
+                state = await loop.run_in_executor(None, build_state)
+            except Exception as e:
+                # أي خطأ (ملف أداة مشوّه → KeyError/TypeError...) ما يوقف المراقبة
+                print(f"   ⚠️  إعادة التحميل فشلت — نكمل على النسخة القديمة: {type(e).__name__}: {e}")
+                continue
+            self.state = state
+            self.metrics.reloads += 1
+            print(f"   🔄 إعادة تحميل: {len(state['pieces'])} أداة ({state['load_ms']} ms)")
+
+
+async def run(sock_path, port, interval):
+    daemon = Daemon()
+    s = daemon.state
+    print("=" * 60)
+    print("🛰️  خدمة السجل")
+    print("=" * 60)
+    print(f"   📦 {s['source']}: {len(s['pieces'])} أداة | 🔀 {len(s['flows'])} flow | ⏱️ {s['load_ms']} ms")
+
+    servers = []
+    if sock_path:
+        os.makedirs(os.path.dirname(sock_path) or ".", exist_ok=True)
+        if os.path.exists(sock_path):
+            os.remove(sock_path)
+        servers.append(await asyncio.start_unix_server(daemon.serve_socket, sock_path, limit=LINE_LIMIT))
+        print(f"   🔌 unix:{sock_path}")
+    if port:
+        servers.append(await asyncio.start_server(daemon.serve_http, "127.0.0.1", port, limit=LINE_LIMIT))
+        print(f"   🌐 http://127.0.0.1:{port}")
+
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    watcher = asyncio.ensure_future(daemon.watch(interval))
+    try:
+        await stop.wait()
+    finally:
+        watcher.cancel()
+        for srv in servers:
+            srv.close()
+        if sock_path and os.path.exists(sock_path):
+            os.remove(sock_path)
+
+
+def client_query(sock_path, op, params):
+    """طلب واحد عبر الـ Unix socket"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(sock_path)
+        s.sendall(json.dumps(dict(params, op=op), ensure_ascii=False).encode("utf-8") + b"\n")
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+
+def main():
+    sock_path = option("--socket", DEFAULT_SOCKET)
+    port = option("--port", DEFAULT_PORT, int)
+    interval = option("--interval", 2.0, float)
+
+    if "--query" in sys.argv:
+        args = sys.argv[sys.argv.index("--query") + 1:]
+        params = {}
+        key = None
+        for a in args[1:]:
+            if "=" in a:
+                key, value = a.split("=", 1)
+                params[key] = value
+            elif key:
+                params[key] += " " + a
+        print(json.dumps(client_query(sock_path, args[0], params), ensure_ascii=False, indent=2))
+        return
+
+    try:
+        asyncio.run(run(sock_path, port, interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+🧮 resolve-variables.py — ترجمة مصادر المتغيرات + تقييم جماعي
+
+الاستخدام:
+  python3 resolve-variables.py                         # ترجمة كل المصادر + ملخص
+  python3 resolve-variables.py --rows leads.csv        # صفوف شيت (trigger.row.*) + تقرير النواقص
+  python3 resolve-variables.py --rows payloads.jsonl   # payload لكل سطر (trigger.body.* / trigger.row.*)
+  python3 resolve-variables.py --rows leads.csv --out resolved.jsonl
+  python3 resolve-variables.py --bench                 # قياس: 100,000 payload
+  python3 resolve-variables.py --bench 500000
+
+المصدر: data/variables/*.json → source | type | validation | required | default/fallback
+"""
+
+import csv
+import json
+import random
+import sys
+import time
+
+from siyadah.data import load_variables
+from siyadah.variables import compile_variables, new_report, resolve_batch, rows_from_columns
+
+BENCH_ROWS = 100000
+BATCH_ROWS = 10000
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+def read_payloads(path):
+    """CSV → {"row": {...}} (trigger.row.*)؛ JSONL → الـ payload كما هو"""
+    with open(path, encoding="utf-8-sig") as f:
+        if path.endswith(".csv"):
+            return [{"row": row} for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def make_payloads(n, seed=5):
+    """نصها webhook (body) ونصها شيت (row) — بأرقام هندية وحقول ناقصة"""
+    rnd = random.Random(seed)
+    names = ["محمد الأحمدي", "سارة العتيبي", "خالد", "نورة الشهري", "", "ع"]
+    phones = ["0501234567", "٠٥٥١٢٣٤٥٦٧", "+966561234567", "00966541234567", "551234567", "12345", ""]
+    payloads = []
+    for i in range(n):
+        fields = {"name": rnd.choice(names), "phone": rnd.choice(phones),
+                  "email": rnd.choice(["a@b.sa", "Sara@Mail.com", "bad-email", ""])}
+        if i % 2:
+            payloads.append({"body": dict(fields, source=rnd.choice(["whatsapp", "Website", "tiktok", ""]))})
+        else:
+            payloads.append({"row": {"الاسم": fields["name"], "الجوال": fields["phone"], "الإيميل": fields["email"]}})
+    return payloads
+
+
+def print_report(report, limit=10):
+    print(f"\n   📄 صفوف: {report['rows']:,} | ❌ صفوف فيها مشاكل: {len(report['row_problems']):,}"
+          f"{'+' if len(report['row_problems']) >= 1000 else ''}")
+    for kind, icon in (("missing", "❓"), ("invalid", "⚠️ ")):
+        if report[kind]:
+            print(f"\n   {icon} {kind}:")
+            for key, count in report[kind].most_common():
+                print(f"      {count:10,d}  {key}")
+    if report["row_problems"]:
+        print(f"\n   📌 أمثلة:")
+        for i, problems in list(report["row_problems"].items())[:limit]:
+            print(f"      صف {i + 1}: " + ", ".join(f"{k} ({p})" for k, p in problems))
+
+
+def resolve_all(compiled, payloads):
+    report = new_report()
+    out = []
+    for start in range(0, len(payloads), BATCH_ROWS):
+        columns, report = resolve_batch(compiled, payloads[start:start + BATCH_ROWS], report=report)
+        out.append(columns)
+    return out, report
+
+
+def main():
+    rows_path = option("--rows")
+    out_path = option("--out")
+
+    catalog = load_variables()
+    compiled = compile_variables(catalog)
+
+    print("=" * 60)
+    print("🧮 ترجمة مصادر المتغيرات")
+    print("=" * 60)
+    kinds = {"row": 0, "scope": 0, "marker": 0}
+    for cv in compiled:
+        for kind, _, _ in cv["alts"]:
+            kinds[kind] += 1
+    per_row = [cv for cv in compiled if any(k == "row" for k, _, _ in cv["alts"])]
+    print(f"   🧮 متغيرات: {len(compiled)} | 📥 من الـ payload: {len(per_row)} | "
+          f"بدائل: {kinds['row']} trigger / {kinds['scope']} scope / {kinds['marker']} جاهزة")
+    for cv in per_row:
+        print(f"      {cv['key']:22s} {'✳️ ' if cv['required'] else '  '} {catalog[cv['key']]['source']}")
+
+    if "--bench" in sys.argv:
+        i = sys.argv.index("--bench")
+        n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else BENCH_ROWS
+        payloads = make_payloads(n)
+        print(f"\n⏱️  قياس التقييم الجماعي — {n:,} payload × {len(per_row)} متغير")
+        t0 = time.perf_counter()
+        _, report = resolve_all(per_row, payloads)
+        elapsed = time.perf_counter() - t0
+        print(f"   ⚡ {n / elapsed:,.0f} صف/ثانية ({elapsed:.2f}s)")
+        print_report(report, limit=5)
+        return
+
+    if not rows_path:
+        return
+
+    payloads = read_payloads(rows_path)
+    t0 = time.perf_counter()
+    batches, report = resolve_all(per_row, payloads)
+    elapsed = time.perf_counter() - t0
+    print(f"\n✅ {rows_path}: {len(payloads):,} صف في {elapsed * 1000:.0f} ms")
+    print_report(report)
+
+    if out_path:
+        with open(out_path, "w", encoding="utf-8") as f:
+            for columns in batches:
+                for row in rows_from_columns(columns):
+                    f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        print(f"\n📁 تم الكتابة: {out_path}")
+
+    missing_required = sum(report["missing"].values())
+    if missing_required:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
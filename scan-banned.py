@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+🛡️ scan-banned.py — فحص الكلمات المحظورة في القوالب والبرومبتات
+
+الاستخدام:
+  python3 scan-banned.py                 # فحص data/templates/messages + data/prompts
+  python3 scan-banned.py --file out.txt  # فحص رسائل مُرندرة (سطر لكل رسالة)
+  python3 scan-banned.py --bench         # قياس: مليون رسالة مُرندرة
+  python3 scan-banned.py --bench 3000000
+
+المصدر: data/prompts/prompts-library.json → banned_words + safety_rules (Max N characters)
+"""
+
+import random
+import sys
+import time
+
+from siyadah.data import PROMPTS_FILE, load_json, load_messages
+from siyadah.messages import compile_messages, render_batch
+from siyadah.safety import build_scanner, max_chars_rule, scan_batch, scan_library
+
+BENCH_MESSAGES = 1000000
+
+
+def print_violations(violations, limit=50):
+    for v in violations[:limit]:
+        if v["kind"] == "too_long":
+            print(f"   ❌ [{v['id']}] الطول {v['length']} يتجاوز الحد")
+        else:
+            print(f"   ❌ [{v['id']}] كلمة محظورة '{v['word']}' عند الموقع {v['offset']}")
+    if len(violations) > limit:
+        print(f"   ... و {len(violations) - limit} مخالفة أخرى")
+
+
+def bench(scanner, max_chars, n):
+    print(f"\n⏱️  قياس الفحص الجماعي — {n:,} رسالة مُرندرة")
+    compiled, _, _ = compile_messages(load_messages())
+    templates = [t for ind in compiled.values() for t in ind.values()]
+    rnd = random.Random(1)
+    names = ["محمد", "سارة", "خالد", "نورة", "عبدالله"]
+    rows = [{k: rnd.choice(names) if k == "customer.name" else str(rnd.randint(1, 9999)) for k in
+             {k for t in templates for k in t["keys"]}} for _ in range(1000)]
+    # رسائل فيها كلمات محظورة بنسبة صغيرة — عشان نقيس المسار البطيء كمان
+    rows[7]["customer.name"] = "دين"
+    rows[500]["customer.name"] = "غبي"
+
+    messages = []
+    while len(messages) < n:
+        t = templates[len(messages) % len(templates)]
+        out, _ = render_batch(t, rows, on_overflow="keep")
+        messages.extend(out)
+    messages = messages[:n]
+
+    t0 = time.perf_counter()
+    violations = scan_batch(scanner, messages, max_chars=max_chars)
+    elapsed = time.perf_counter() - t0
+    print(f"   ⚡ {n / elapsed * 60:,.0f} رسالة/دقيقة ({elapsed:.2f}s)")
+    print(f"   🚫 مخالفات: {len(violations):,}")
+
+
+def main():
+    prompts_doc = load_json(PROMPTS_FILE)
+    banned = prompts_doc.get("banned_words", [])
+    max_chars = max_chars_rule(prompts_doc)
+    scanner = build_scanner(banned)
+
+    print("=" * 60)
+    print("🛡️  فحص الكلمات المحظورة")
+    print("=" * 60)
+    print(f"   🚫 كلمات: {len(scanner)} | 📏 الحد: {max_chars} حرف")
+
+    if "--bench" in sys.argv:
+        i = sys.argv.index("--bench")
+        n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 else BENCH_MESSAGES
+        bench(scanner, max_chars, n)
+        return
+
+    if "--file" in sys.argv:
+        path = sys.argv[sys.argv.index("--file") + 1]
+        with open(path, encoding="utf-8") as f:
+            messages = [line.rstrip("\n") for line in f]
+        violations = scan_batch(scanner, messages, ids=[f"line:{i + 1}" for i in range(len(messages))],
+                                max_chars=max_chars)
+        label = f"{len(messages):,} رسالة"
+    else:
+        violations = scan_library(scanner, load_messages(), prompts_doc, max_chars)
+        label = "القوالب والبرومبتات"
+
+    if violations:
+        print(f"\n❌ مخالفات ({len(violations)}) في {label}:")
+        print_violations(violations)
+        sys.exit(1)
+
+    print(f"\n✅ {label}: بدون مخالفات")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+📊 sheet-stats.py — إحصائيات التقرير الأسبوعي + تأخير الفواتير (NumPy)
+
+الاستخدام:
+  python3 sheet-stats.py --invoices invoices.csv                       # مستويات التذكير (اليوم)
+  python3 sheet-stats.py --invoices invoices.csv --today 2026-10-19 --out overdue.csv
+  python3 sheet-stats.py --leads leads.csv --invoices invoices.csv --week 2026-10-12
+  python3 sheet-stats.py --leads leads.json --industry clinic --json
+  python3 sheet-stats.py --bench                                       # 200,000 فاتورة
+  python3 sheet-stats.py --bench 1000000
+
+القياس: هدف الثانية الوحدة لـ 200,000 فاتورة يتحقق من الأعمدة المقروءة (تحويل + حساب)؛
+مع قراءة CSV بـ csv.reader المجموع فوق الثانية — الرقمين ينطبعوا منفصلين.
+
+المدخلات: تصدير الشيت (.csv) أو صفوف google-sheets.find_rows (.json / .jsonl)
+المخطط: data/templates/sheets/sheets-config.json (+ أعمدة الصناعة مع --industry)
+يتطلب: numpy
+"""
+
+import csv
+import io
+import json
+import random
+import sys
+import time
+from datetime import date, timedelta
+
+from siyadah.sheetstats import (COL_DUE, COL_INVOICE, REMINDER_LEVELS, build_sheet, csv_columns, load_sheet,
+                                overdue, require_numpy, sheet_schema, weekly_stats)
+
+BENCH_ROWS = 200000
+LEVEL_ICONS = {"gentle": "🟢", "firm": "🟡", "urgent": "🟠", "escalation": "🔴"}
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+def make_invoices_csv(n, today, seed=9):
+    """تصدير فواتير اصطناعي — أرقام هندية، عملة، تواريخ فاضية/خاطئة"""
+    rnd = random.Random(seed)
+    out = io.StringIO()
+    w = csv.writer(out)
+    w.writerow(["رقم_الفاتورة", "الاسم", "الجوال", "الإيميل", "المبلغ", "تاريخ_الاستحقاق", "الحالة",
+                "عدد_التذكيرات", "آخر_تذكير"])
+    statuses = ["غير مدفوعة"] * 6 + ["مدفوعة"] * 3 + ["ملغاة"]
+    for i in range(n):
+        due = (today - timedelta(days=rnd.randint(-10, 60))).isoformat()
+        if i % 97 == 0:
+            due = ""
+        elif i % 211 == 0:
+            due = "قريباً"
+        amount = rnd.choice([f"{rnd.randint(100, 50000)}", f"{rnd.randint(100, 9999)}.50",
+                             f"{rnd.randint(1, 40)},000 ر.س", "١٢٥٠"])
+        w.writerow([f"INV-{i:07d}", "عميل", "05" + str(rnd.randint(10000000, 99999999)), "", amount, due,
+                    rnd.choice(statuses), rnd.randint(0, 4), ""])
+    return out.getvalue()
+
+
+def print_overdue(summary):
+    print(f"\n💸 تأخير الفواتير — {summary['today']}")
+    print(f"   📄 فواتير: {summary['invoices']:,} | غير مدفوعة: {summary['selected']:,} | "
+          f"⏳ لم يحن موعدها: {summary['not_due']:,} | ⚠️  تاريخ استحقاق خاطئ/فاضي: {summary['invalid_due']:,}")
+    for name in REMINDER_LEVELS:
+        lv = summary["levels"][name]
+        max_days = f"أقصى {lv['max_days']} يوم" if lv["max_days"] is not None else ""
+        print(f"   {LEVEL_ICONS[name]} {name:11s} {lv['count']:9,d} فاتورة  {lv['amount']:16,.2f} ريال  {max_days}")
+    print(f"   {'':14s}{'':9s}         {summary['total_amount']:16,.2f} ريال")
+
+
+def print_weekly(stats):
+    print(f"\n📈 إحصائيات التقرير الأسبوعي")
+    print(f"   👥 العملاء: {stats['total_leads']:,} (🔥 {stats['hot']:,} | 🟡 {stats['warm']:,} | 🔵 {stats['cold']:,})")
+    print(f"   💰 الإيرادات: {stats['total_revenue']:,.2f} ريال")
+    print(f"   📄 فواتير غير مدفوعة: {stats['unpaid_invoices']:,} ({stats['unpaid_amount']:,.2f} ريال)")
+    if stats["by_source"]:
+        print("   📣 المصادر: " + " | ".join(f"{k}: {v:,}" for k, v in stats["by_source"].items()))
+
+
+def check_schema(sheet):
+    if sheet["missing"]:
+        print(f"   ⚠️  [{sheet['name']}] أعمدة ناقصة: {', '.join(sheet['missing'])}")
+    if sheet["extra"]:
+        print(f"   ℹ️  [{sheet['name']}] أعمدة خارج المخطط: "
+              + ", ".join(f"{c} ({sheet['types'][c]})" for c in sheet["extra"]))
+
+
+def write_overdue(path, invoices, rows):
+    ids = invoices["columns"].get(COL_INVOICE)
+    due = invoices["columns"][COL_DUE]
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow([COL_INVOICE, COL_DUE, "days_overdue", "reminder_level"])
+        for i in rows["selected"].nonzero()[0]:
+            w.writerow([ids[i] if ids is not None else i + 1, due[i], int(rows["days"][i]),
+                        REMINDER_LEVELS[rows["level"][i]]])
+
+
+def bench(n, today):
+    schema = sheet_schema("invoices")
+    print(f"\n⏱️  قياس — {n:,} فاتورة")
+    text = make_invoices_csv(n, today)
+
+    t0 = time.perf_counter()
+    raw = csv_columns(io.StringIO(text))
+    t1 = time.perf_counter()
+    invoices = build_sheet(raw, schema, name="invoices")
+    t2 = time.perf_counter()
+    summary, _ = overdue(invoices, today)
+    stats = weekly_stats(None, invoices)
+    t3 = time.perf_counter()
+
+    print(f"   📥 قراءة CSV:        {(t1 - t0) * 1000:8.0f} ms")
+    print(f"   🔢 تحويل الأنواع:    {(t2 - t1) * 1000:8.0f} ms")
+    print(f"   ⚡ التأخير + الإحصائيات: {(t3 - t2) * 1000:8.0f} ms")
+    print(f"   ✅ المجموع من CSV للنتيجة: {(t3 - t0) * 1000:.0f} ms — {n / (t3 - t0):,.0f} صف/ثانية")
+    print(f"      (بدون قراءة CSV: {(t3 - t1) * 1000:.0f} ms — {n / (t3 - t1):,.0f} صف/ثانية)")
+    print_overdue(summary)
+    print(f"\n   💰 مدفوعة: {stats['total_revenue']:,.2f} ريال | غير مدفوعة: {stats['unpaid_invoices']:,}")
+
+
+def main():
+    leads_path = option("--leads")
+    invoices_path = option("--invoices")
+    industry = option("--industry")
+    today = option("--today", date.today(), date.fromisoformat)
+    week = option("--week", None, date.fromisoformat)
+    out_path = option("--out")
+    as_json = "--json" in sys.argv
+
+    try:
+        require_numpy()
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if "--bench" in sys.argv:
+        i = sys.argv.index("--bench")
+        n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else BENCH_ROWS
+        print("=" * 60)
+        print("📊 إحصائيات الشيتات (NumPy)")
+        print("=" * 60)
+        bench(n, today)
+        return
+
+    if not leads_path and not invoices_path:
+        print(__doc__)
+        sys.exit(1)
+
+    t0 = time.perf_counter()
+    leads = load_sheet(leads_path, "leads", industry) if leads_path else None
+    invoices = load_sheet(invoices_path, "invoices", industry) if invoices_path else None
+    t1 = time.perf_counter()
+
+    result = {}
+    rows = None
+    if invoices is not None:
+        result["overdue"], rows = overdue(invoices, today)
+    if leads is not None or week is not None:
+        result["weekly"] = weekly_stats(leads, invoices, week)
+    t2 = time.perf_counter()
+
+    if as_json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print("=" * 60)
+        print("📊 إحصائيات الشيتات (NumPy)")
+        print("=" * 60)
+        for sheet in (leads, invoices):
+            if sheet is not None:
+                print(f"   📄 {sheet['name']}: {sheet['rows']:,} صف")
+                check_schema(sheet)
+        if "weekly" in result:
+            print_weekly(result["weekly"])
+        if "overdue" in result:
+            print_overdue(result["overdue"])
+        print(f"\n   ⏱️  تحميل {(t1 - t0) * 1000:.0f} ms | حساب {(t2 - t1) * 1000:.0f} ms")
+
+    if out_path and rows is not None:
+        write_overdue(out_path, invoices, rows)
+        if not as_json:
+            print(f"📁 تم الكتابة: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
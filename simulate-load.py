@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+📈 simulate-load.py — محاكاة حِمل الـ flows (رسائل + API + AI لكل ساعة) ومتى كل خطة توصل حدها
+
+الاستخدام:
+  python3 simulate-load.py                                  # 2,000 tenant × 30 يوم، كل قوالب data/flows
+  python3 simulate-load.py --tenants 10000 --days 60 --out hourly.csv --json summary.json
+  python3 simulate-load.py --flows customer-journey,invoice-collection
+  python3 simulate-load.py --mix free=0.7,basic=0.2,advanced=0.1
+  python3 simulate-load.py --quota free=9999                # حدود billing.js بدل README
+  python3 simulate-load.py --show                           # segments كل flow بعد التحويل
+  python3 simulate-load.py --bench                          # 5,000 tenant (ملايين التشغيلات)
+
+الافتراضات (معدلات الأحداث، حجم كل خطة، توزيع الساعات) في siyadah/loadsim.py
+"""
+
+import csv
+import json
+import sys
+
+from siyadah.data import FLOWS_DIR, load_flows, write_json
+from siyadah.loadsim import (LOAD_FIELDS, PLAN_MIX, PLANS, compile_flow, describe, hourly_profile,
+                             make_population, peak, simulate)
+
+DEFAULT_TENANTS = 2000
+BENCH_TENANTS = 5000
+BAR_WIDTH = 40
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+def pairs(text, cast=float):
+    """"free=0.5,basic=0.3" → {"free": 0.5, "basic": 0.3}"""
+    out = {}
+    for part in (text or "").split(","):
+        if "=" in part:
+            key, value = part.split("=", 1)
+            out[key.strip()] = cast(value)
+    return out
+
+
+def fmt_day(value):
+    return "-" if value is None else f"{value:5.1f}"
+
+
+def print_plans(summary):
+    print("\n📋 الحصص الشهرية (اليوم = من بداية الفترة)")
+    print(f"   {'الخطة':10s} {'tenants':>8s} {'حد الرسائل':>10s} {'وصلوا':>7s} {'أول':>6s} {'p10':>6s} {'وسيط':>6s}"
+          f" │ {'AI وصلوا':>8s} {'وسيط':>6s}")
+    for plan, row in summary.items():
+        m, ai = row["messages"], row["ai_calls"]
+        print(f"   {PLANS.get(plan, {}).get('name', plan):10s} {row['tenants']:8,d} {row['messages_quota']:10,d}"
+              f" {m['exhausted_pct']:6.1f}% {fmt_day(m['first_day']):>6s} {fmt_day(m['p10_day']):>6s}"
+              f" {fmt_day(m['median_day']):>6s} │ {ai['exhausted_pct']:7.1f}% {fmt_day(ai['median_day']):>6s}")
+
+
+def print_load(load, days):
+    print("\n⏰ متوسط الحِمل لكل ساعة من اليوم (الرياض)")
+    messages = hourly_profile(load["messages"], days)
+    api = hourly_profile(load["api_calls"], days)
+    top = max(messages) or 1
+    for h in range(24):
+        bar = "█" * round(BAR_WIDTH * messages[h] / top)
+        print(f"   {h:02d}:00 {messages[h]:9,.0f} رسالة {api[h]:10,.0f} API  {bar}")
+    print()
+    for field in ("messages", "api_calls", "ai_calls", "blocked"):
+        h, value, p95 = peak(load[field])
+        print(f"   🔺 {field:10s} ذروة {value:9,d}/ساعة (يوم {h // 24}، {h % 24:02d}:00) | p95 {p95:,}")
+
+
+def main():
+    tenants_n = option("--tenants", DEFAULT_TENANTS, int)
+    days = option("--days", 30, int)
+    seed = option("--seed", 7, int)
+    flows_dir = option("--flows-dir", FLOWS_DIR)
+    only = option("--flows")
+    mix = pairs(option("--mix")) or PLAN_MIX
+    quota = pairs(option("--quota"), int)
+    out_path = option("--out")
+    json_path = option("--json")
+
+    plans = {name: dict(spec) for name, spec in PLANS.items()}
+    for name, value in quota.items():
+        if name not in plans:
+            print(f"❌ خطة غير معروفة: {name} (المتاح: {', '.join(plans)})")
+            sys.exit(1)
+        plans[name].update(messages=value, ai_calls=value)
+
+    print("=" * 60)
+    print("📈 محاكاة حِمل الـ flows مقابل حدود الخطط")
+    print("=" * 60)
+
+    flows = load_flows(flows_dir)
+    if only:
+        wanted = only.split(",")
+        missing = [f for f in wanted if f not in flows]
+        if missing:
+            print(f"❌ flows غير موجودة: {', '.join(missing)}")
+            sys.exit(1)
+        flows = {fid: flows[fid] for fid in wanted}
+    models = [compile_flow(f) for f in flows.values()]
+    if not models:
+        print(f"❌ ما فيه flows في {flows_dir}")
+        sys.exit(1)
+
+    if "--show" in sys.argv:
+        for m in models:
+            limit = m["rate_limit"]
+            print(f"\n🔀 {m['id']} ({m['trigger']})"
+                  + (f" | ⛔ {limit[0]}/{'يوم' if limit[1] == 86400 else 'ساعة'}" if limit else ""))
+            for line in describe(m):
+                print(f"   {line}")
+        return
+
+    if "--bench" in sys.argv:
+        i = sys.argv.index("--bench")
+        tenants_n = int(sys.argv[i + 1]) if len(sys.argv) > i + 1 and sys.argv[i + 1].isdigit() else BENCH_TENANTS
+
+    tenants = make_population(tenants_n, models, mix, seed, plans)
+    print(f"   👥 {tenants_n:,} tenant × {days} يوم | {len(models)} flow | "
+          + " | ".join(f"{p}: {sum(1 for t in tenants if t['plan'] == p):,}" for p in plans))
+
+    result = simulate(models, tenants, days, seed, plans)
+    seconds = result["seconds"]
+    print(f"\n   ⚡ {result['executions']:,} تشغيل | {result['events']:,} حدث | {seconds:.1f} ثانية "
+          f"({result['events'] / max(seconds, 1e-9):,.0f} حدث/ثانية)")
+
+    print("\n🔀 لكل flow")
+    for fid, stats in result["flows"].items():
+        print(f"   {fid:22s} تشغيل {stats.get('executions', 0):9,d} | رسائل {stats.get('messages', 0):9,d}"
+              f" | ⛔ rate limit {stats.get('throttled', 0):7,d} | ⏳ بعد المدة {stats.get('pending', 0):7,d}")
+
+    print_load(result["load"], days)
+    print_plans(result["plans"])
+
+    if out_path:
+        load = result["load"]
+        with open(out_path, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["hour", "day", "hour_of_day"] + list(LOAD_FIELDS))
+            for h in range(days * 24):
+                w.writerow([h, h // 24, h % 24] + [load[field][h] for field in LOAD_FIELDS])
+        print(f"\n📁 تم الكتابة: {out_path}")
+    if json_path:
+        summary = {k: result[k] for k in ("plans", "flows", "events", "executions")}
+        summary.update(tenants=tenants_n, days=days, seed=seed,
+                       peaks={field: dict(zip(("hour", "value", "p95"), peak(result["load"][field])))
+                              for field in LOAD_FIELDS})
+        write_json(json_path, summary)
+        print(f"📁 تم الكتابة: {json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+"""
+🐍 siyadah — أدوات البناء والتحليل بلغة Python
+
+مكتبة مشتركة للسكربتات اللي في جذر المشروع (build-registry.py, compile-flows.py ...).
+كل وحدة تقرأ من data/ مباشرة — ما فيه أي اعتماد على محرك Node.
+"""
@@ -0,0 +1,49 @@
+"""
+🔤 تطبيع النص العربي
+
+  - حذف التشكيل والتطويل والمحارف غير المرئية
+  - توحيد الألف (أ إ آ ٱ → ا) والياء (ى ئ → ي) والتاء المربوطة (ة → ه) و ؤ → و
+  - الأرقام الهندية (٠-٩ و ۰-۹) → 0-9
+  - lowercase للحروف اللاتينية
+
+الجدول ثابت ويُطبّق بـ str.translate (C) — مناسب للدفعات الكبيرة.
+"""
+
+REMOVED = (
+    [chr(c) for c in range(0x064B, 0x0660)]        # التشكيل
+    + ["\u0670", "\u0640"]                          # ألف خنجرية + تطويل
+    + ["\u200c", "\u200d", "\u200e", "\u200f", "\ufeff"]  # محارف غير مرئية
+)
+
+FOLDED = {
+    "أ": "ا", "إ": "ا", "آ": "ا", "ٱ": "ا",
+    "ى": "ي", "ئ": "ي",
+    "ة": "ه",
+    "ؤ": "و",
+}
+
+DIGITS = {}
+for i in range(10):
+    DIGITS[chr(0x0660 + i)] = str(i)   # ٠-٩
+    DIGITS[chr(0x06F0 + i)] = str(i)   # ۰-۹ (فارسي)
+
+TABLE = str.maketrans({**{c: None for c in REMOVED}, **FOLDED, **DIGITS})
+DIGITS_TABLE = str.maketrans(DIGITS)
+_REMOVED_SET = frozenset(REMOVED)
+
+
+def normalize(text):
+    return text.translate(TABLE).lower()
+
+
+def normalize_digits(text):
+    """الأرقام فقط — للجوالات والمبالغ"""
+    return text.translate(DIGITS_TABLE)
+
+
+def offsets(text):
+    """
+    موقع كل حرف من normalize(text) في النص الأصلي.
+    يُستخدم بس لما نلقى تطابق — عشان نرجع الموقع الحقيقي للمستخدم.
+    """
+    return [i for i, ch in enumerate(text) if ch not in _REMOVED_SET]
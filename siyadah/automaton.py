@@ -0,0 +1,93 @@
+"""
+🔎 Aho-Corasick — مطابقة كلمات كثيرة في مرور واحد
+
+يُبنى مرة وحدة من قائمة الكلمات، وبعدها كل بحث = مرور واحد على النص
+مهما كان عدد الكلمات. يرجع كل التطابقات (حتى المتداخلة) مع مواقعها.
+
+screen: regex واحد مبني من نفس الكلمات — فحص سريع (C) يستبعد النصوص
+النظيفة قبل تشغيل الـ automaton (الأغلبية الساحقة في الدفعات الكبيرة).
+"""
+
+import re
+from collections import deque
+
+
+class Automaton:
+    def __init__(self, patterns=None):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        self.patterns = []
+        self.values = []
+        self.screen = None
+        for p in patterns or []:
+            if isinstance(p, tuple):
+                self.add(*p)
+            else:
+                self.add(p)
+        if patterns:
+            self.build()
+
+    def add(self, pattern, value=None):
+        """يضيف كلمة — value اختياري (يرجع مع كل تطابق)"""
+        if not pattern:
+            raise ValueError("نمط فارغ")
+        state = 0
+        for ch in pattern:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        idx = len(self.patterns)
+        self.patterns.append(pattern)
+        self.values.append(pattern if value is None else value)
+        self.out[state].append(idx)
+        return idx
+
+    def build(self):
+        """روابط الفشل (BFS) + دمج المخرجات"""
+        queue = deque()
+        for nxt in self.goto[0].values():
+            self.fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+        unique = sorted(set(self.patterns), key=len, reverse=True)
+        self.screen = re.compile("|".join(map(re.escape, unique))) if unique else None
+        return self
+
+    def iter(self, text):
+        """يولّد (start, end, pattern_index) لكل تطابق"""
+        goto = self.goto
+        fail = self.fail
+        out = self.out
+        patterns = self.patterns
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                for idx in out[state]:
+                    yield i + 1 - len(patterns[idx]), i + 1, idx
+
+    def findall(self, text):
+        """[(start, end, value)] — يتخطى النص كامل لو screen ما لقى شي"""
+        if self.screen is not None and self.screen.search(text) is None:
+            return []
+        values = self.values
+        return [(s, e, values[idx]) for s, e, idx in self.iter(text)]
+
+    def __len__(self):
+        return len(self.patterns)
@@ -0,0 +1,351 @@
+"""
+🤖 تشغيل برومبتات data/prompts على دفعات (N عنصر في طلب واحد)
+
+بدل طلب لكل عميل (classify_lead) أو شكوى (classify_complaint):
+  system = system_prompt + التعليمات الثابتة + industry_additions + تعليمات الدفعة
+           ← نفس النص بالبايت لكل الطلبات (يُبنى مرة وحدة) عشان كاش البادئة عند المزوّد
+  user   = العناصر فقط: "### 1\\nالاسم: ...\\nالرسالة: ..."
+  الرد   = {"results": [{"id": 1, ...expected_output}, ...]}
+
+سطور القالب اللي فيها customer.* / trigger.* تصير "كتلة العنصر"؛ الباقي ثابت
+(company.* و context.* تنطوي فيه مرة وحدة).
+
+العنصر اللي يرجع ناقص أو بقيم خارج expected_output يُعاد في دفعة ثانية
+(retry.max_attempts)؛ بعدها fallback_on_failure:
+  default_values — القيم الثابتة
+  keyword_rules  — كلمات hot/warm على حقل الرسالة فقط (customer.message ... أو rules.field)
+البرومبت اللي fallback حقه غير هذي (template / regex_extraction) يُرفض في build_plan.
+
+الـ backend أي كائن فيه:  async complete(system, user, max_tokens, temperature) → (text, usage)
+  StubBackend   — محلي وحتمي (قواعد fallback نفسها) مع زمن استجابة محاكى
+  OpenAIBackend — /v1/chat/completions عبر HttpPool (keep-alive)
+"""
+
+import asyncio
+import hashlib
+import json
+import re
+import time
+
+from siyadah import arabic, placeholders
+from siyadah.verify import HttpPool
+
+ITEM_ROOTS = ("customer", "trigger", "loop", "body")
+ITEM_MARK = "### "
+ITEM_MARK_RE = re.compile(r"^### (\d+)$", re.MULTILINE)
+DEFAULT_BATCH = 20
+DEFAULT_CONCURRENCY = 8
+DEFAULT_ATTEMPTS = 2
+MAX_TOKENS_CAP = 16000
+FALLBACK_STRATEGIES = (None, "default_values", "keyword_rules")
+MESSAGE_FIELDS = ("message", "complaint_text", "text", "body")
+
+BATCH_INSTRUCTION = (
+    "ستوصلك عدة عناصر، كل عنصر يبدأ بـ \"### رقم\". طبّق التعليمات على كل عنصر لحاله.\n"
+    "رد بـ JSON واحد فقط بدون أي نص إضافي:\n"
+    "{{\"results\": [{{\"id\": رقم العنصر, {fields}}}]}}\n"
+    "عنصر واحد في results لكل عنصر مرسل، بنفس الترتيب."
+)
+
+# ============================================================
+# 1. تجهيز البرومبت (مرة وحدة لكل برومبت + صناعة + قيم مشتركة)
+# ============================================================
+
+def _is_item_key(key):
+    return key.split(".", 1)[0] in ITEM_ROOTS
+
+
+def _one_line(value):
+    return " ".join(str(value).split()).replace(ITEM_MARK.strip(), "#")
+
+
+def build_plan(prompt, shared=None, industry=None):
+    """
+    {"id", "system", "item_segments", "item_keys", "fields", "enums", ...}
+    shared: {"company.industry": "clinic", ...} — تنطوي داخل النص الثابت
+    """
+    shared = shared or {}
+    static_lines = []
+    item_lines = []
+    for line in prompt.get("user_prompt_template", "").split("\n"):
+        _, keys = placeholders.split(line)
+        if any(_is_item_key(k) for k in keys):
+            item_lines.append(line)
+        else:
+            static_lines.append(line)
+    if not item_lines:
+        raise ValueError(f"[{prompt.get('id')}] ما فيه متغيرات لكل عنصر ({'/'.join(ITEM_ROOTS)}.*) — ما ينفع دفعات")
+
+    segments, keys = placeholders.split("\n".join(static_lines).strip())
+    static = segments[0] + "".join(str(shared.get(k, "")) + segments[i + 1] for i, k in enumerate(keys))
+
+    fallback = prompt.get("fallback_on_failure") or {}
+    strategy = fallback.get("strategy")
+    if strategy not in FALLBACK_STRATEGIES:
+        raise ValueError(f"[{prompt.get('id')}] fallback_on_failure '{strategy}' غير مدعوم في الدفعات "
+                         f"(المدعوم: {', '.join(s for s in FALLBACK_STRATEGIES if s)})")
+    item_segments, item_keys = placeholders.split("\n".join(item_lines))
+    message_key = None
+    if strategy == "keyword_rules":
+        message_key = (fallback.get("rules") or {}).get("field") or next(
+            (k for k in item_keys if k.rsplit(".", 1)[-1] in MESSAGE_FIELDS), None)
+        if message_key not in item_keys:
+            raise ValueError(f"[{prompt.get('id')}] keyword_rules بدون حقل رسالة في القالب")
+
+    expected = prompt.get("expected_output") or {}
+    enums = {f: frozenset(t.split("|")) for f, t in expected.items() if isinstance(t, str) and "|" in t}
+    field_hint = ", ".join(f"\"{f}\": ..." for f in expected)
+
+    parts = [prompt.get("system_prompt", ""), static]
+    addition = (prompt.get("industry_additions") or {}).get(industry)
+    if addition:
+        parts.append(addition)
+    parts.append(BATCH_INSTRUCTION.format(fields=field_hint))
+
+    return {
+        "id": prompt.get("id"),
+        "system": "\n\n".join(p for p in parts if p),
+        "item_segments": item_segments,
+        "item_keys": item_keys,
+        "fields": list(expected),
+        "types": expected,
+        "enums": enums,
+        "model": prompt.get("model"),
+        "temperature": prompt.get("temperature", 0),
+        "max_tokens": prompt.get("max_tokens", 200),
+        "attempts": (prompt.get("retry") or {}).get("max_attempts", DEFAULT_ATTEMPTS),
+        "fallback": fallback,
+        "message_key": message_key,
+        "item_re": re.compile("".join(re.escape(seg) + ("(.*)" if i < len(item_keys) else "")
+                                      for i, seg in enumerate(item_segments))),
+    }
+
+
+def render_item(plan, values):
+    segments = plan["item_segments"]
+    out = [segments[0]]
+    for i, key in enumerate(plan["item_keys"]):
+        value = values.get(key)
+        out.append(_one_line(value) if value not in (None, "") else "-")
+        out.append(segments[i + 1])
+    return "".join(out)
+
+
+def parse_item(plan, block):
+    """عكس render_item: كتلة عنصر → {key: value} ("-" → None) — للـ stub"""
+    m = plan["item_re"].search(block)
+    if not m:
+        return {}
+    return {k: (None if v == "-" else v) for k, v in zip(plan["item_keys"], m.groups())}
+
+
+def render_batch(plan, batch):
+    """batch: [(id, values)] → نص الـ user"""
+    blocks = [f"{ITEM_MARK}{item_id}\n{render_item(plan, values)}" for item_id, values in batch]
+    return f"العناصر ({len(batch)}):\n\n" + "\n\n".join(blocks)
+
+# ============================================================
+# 2. قراءة الرد + fallback
+# ============================================================
+
+def _valid(plan, result):
+    for field, kind in plan["types"].items():
+        value = result.get(field)
+        if field in plan["enums"]:
+            if value not in plan["enums"][field]:
+                return False
+        elif kind == "boolean":
+            if not isinstance(value, bool):
+                return False
+        elif value is None:
+            return False
+    return True
+
+
+def parse_results(plan, text, ids):
+    """{id: result} للعناصر الصالحة فقط — الناقص/الخاطئ يرجع للمحاولة التالية"""
+    try:
+        doc = json.loads(text)
+    except (ValueError, TypeError):
+        return {}
+    results = doc.get("results") if isinstance(doc, dict) else doc
+    if not isinstance(results, list):
+        return {}
+    wanted = set(ids)
+    out = {}
+    for r in results:
+        if not isinstance(r, dict):
+            continue
+        try:
+            item_id = int(r.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if item_id in wanted and _valid(plan, r):
+            out[item_id] = {f: r[f] for f in plan["fields"]}
+    return out
+
+
+def _contains(text, words):
+    return any(arabic.normalize(w) in text for w in words)
+
+
+def fallback_result(plan, values):
+    """fallback_on_failure من البرومبت — values: قيم العنصر {key: value}"""
+    fb = plan["fallback"]
+    strategy = fb.get("strategy")
+    result = dict.fromkeys(plan["fields"])
+    if strategy == "default_values":
+        result.update(fb.get("defaults") or {})
+    elif strategy == "keyword_rules":
+        rules = fb.get("rules") or {}
+        norm = arabic.normalize(str(values.get(plan["message_key"]) or ""))
+        if _contains(norm, rules.get("hot_keywords", [])):
+            level = "hot"
+        elif _contains(norm, rules.get("warm_keywords", [])):
+            level = "warm"
+        else:
+            level = "cold"
+        result.update({"lead_type": level, "priority": {"hot": "high", "warm": "medium", "cold": "low"}[level],
+                       "service": "", "reason": "keyword_rules"})
+    return {f: result.get(f) for f in plan["fields"]}
+
+# ============================================================
+# 3. الـ backends
+# ============================================================
+
+class StubBackend:
+    """
+    محلي وحتمي: يقرأ العناصر من نص الـ user ويرد بقواعد fallback نفسها.
+    latency + per_item ثواني لكل طلب (محاكاة زمن النموذج)؛
+    invalid_every=k: كل k طلب يرجع JSON مكسور (لاختبار إعادة المحاولة).
+    """
+
+    def __init__(self, plan, latency=0.4, per_item=0.01, invalid_every=0):
+        self.plan = plan
+        self.latency = latency
+        self.per_item = per_item
+        self.invalid_every = invalid_every
+        self.calls = 0
+
+    async def complete(self, system, user, max_tokens, temperature):
+        self.calls += 1
+        call_no = self.calls
+        marks = list(ITEM_MARK_RE.finditer(user))
+        await asyncio.sleep(self.latency + self.per_item * len(marks))
+        if self.invalid_every and call_no % self.invalid_every == 0:
+            return '{"results": [', {}
+        results = []
+        for i, m in enumerate(marks):
+            end = marks[i + 1].start() if i + 1 < len(marks) else len(user)
+            block = user[m.end():end]
+            r = fallback_result(self.plan, parse_item(self.plan, block))
+            if "reason" in r:
+                r["reason"] = "stub:" + hashlib.sha1(block.encode("utf-8")).hexdigest()[:8]
+            results.append({"id": int(m.group(1)), **r})
+        return json.dumps({"results": results}, ensure_ascii=False), {"prompt_chars": len(system) + len(user)}
+
+
+class OpenAIBackend:
+    """OpenAI-compatible /v1/chat/completions — response_format: json_object"""
+
+    def __init__(self, base_url, api_key, model, concurrency=DEFAULT_CONCURRENCY, timeout=60):
+        self.model = model
+        self.pool = HttpPool(base_url, limit=concurrency, timeout=timeout,
+                             headers={"Authorization": f"Bearer {api_key}"} if api_key else None)
+
+    async def complete(self, system, user, max_tokens, temperature):
+        status, body = await self.pool.post_json("/v1/chat/completions", {
+            "model": self.model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "response_format": {"type": "json_object"},
+            "messages": [{"role": "system", "content": system}, {"role": "user", "content": user}],
+        })
+        if status != 200:
+            raise RuntimeError(f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}")
+        doc = json.loads(body)
+        usage = doc.get("usage") or {}
+        return doc["choices"][0]["message"]["content"], {
+            "prompt_tokens": usage.get("prompt_tokens", 0),
+            "cached_tokens": (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0),
+            "completion_tokens": usage.get("completion_tokens", 0),
+        }
+
+    async def close(self):
+        await self.pool.close()
+
+# ============================================================
+# 4. التشغيل
+# ============================================================
+
+def new_stats(items):
+    return {"items": items, "calls": 0, "baseline_calls": items, "retried": 0, "fallback": 0,
+            "errors": 0, "usage": {}, "seconds": 0.0}
+
+
+async def run(plan, items, backend, batch_size=DEFAULT_BATCH, concurrency=DEFAULT_CONCURRENCY):
+    """
+    items: [{key: value}] — مفاتيح القالب (customer.name ...)
+    يرجع (results [{...fields, "_source": batch|retry|fallback}] بنفس ترتيب items, stats)
+    """
+    stats = new_stats(len(items))
+    sem = asyncio.Semaphore(concurrency)
+    results = [None] * len(items)
+    max_tokens = lambda n: min(MAX_TOKENS_CAP, plan["max_tokens"] * n)
+
+    async def call(batch):
+        async with sem:
+            stats["calls"] += 1
+            try:
+                text, usage = await backend.complete(plan["system"], render_batch(plan, batch),
+                                                     max_tokens(len(batch)), plan["temperature"])
+            except (RuntimeError, OSError, ValueError, KeyError, asyncio.TimeoutError) as e:
+                stats["errors"] += 1
+                stats["last_error"] = str(e)
+                return {}
+        for k, v in (usage or {}).items():
+            stats["usage"][k] = stats["usage"].get(k, 0) + v
+        return parse_results(plan, text, [item_id for item_id, _ in batch])
+
+    t0 = time.perf_counter()
+    pending = list(range(len(items)))
+    for attempt in range(max(1, plan["attempts"])):
+        if not pending:
+            break
+        if attempt:
+            stats["retried"] += len(pending)
+        batches = [[(i + 1, items[i]) for i in pending[s:s + batch_size]]
+                   for s in range(0, len(pending), batch_size)]
+        for parsed in await asyncio.gather(*(call(b) for b in batches)):
+            for item_id, r in parsed.items():
+                results[item_id - 1] = dict(r, _source="retry" if attempt else "batch")
+        pending = [i for i in pending if results[i] is None]
+
+    for i in pending:
+        stats["fallback"] += 1
+        results[i] = dict(fallback_result(plan, items[i]), _source="fallback")
+    stats["seconds"] = time.perf_counter() - t0
+    return results, stats
+
+
+def summarize(plan, stats):
+    """leads/s + الطلبات الموفّرة مقارنة بطلب لكل عنصر + حجم البرومبت"""
+    seconds = max(stats["seconds"], 1e-9)
+    per_item_chars = len(render_item(plan, {})) + len(ITEM_MARK) + 4
+    batched_chars = stats["calls"] * len(plan["system"]) + stats["items"] * per_item_chars
+    baseline_chars = stats["baseline_calls"] * (len(plan["system"]) + per_item_chars)
+    return {
+        "items": stats["items"],
+        "calls": stats["calls"],
+        "baseline_calls": stats["baseline_calls"],
+        "calls_saved": stats["baseline_calls"] - stats["calls"],
+        "calls_saved_pct": round(100 * (1 - stats["calls"] / max(stats["baseline_calls"], 1)), 1),
+        "items_per_second": round(stats["items"] / seconds, 1),
+        "seconds": round(stats["seconds"], 3),
+        "retried": stats["retried"],
+        "fallback": stats["fallback"],
+        "errors": stats["errors"],
+        "prefix_chars": len(plan["system"]),
+        "prompt_chars_saved_pct": round(100 * (1 - batched_chars / max(baseline_chars, 1)), 1),
+        "usage": stats["usage"],
+    }
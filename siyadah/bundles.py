@@ -0,0 +1,238 @@
+"""
+📦 تجميع قوالب الـ Flows إلى حزم جاهزة لكل صناعة
+
+قالب × صناعة → حزمة (bundle) فيها:
+  - body:  الـ flow بعد دمج industry_variants و sheets_template ونصوص الرسائل
+  - slots: جدول المتغيرات (مفهرس) — كل متغير له رقم ثابت
+  - holes: أماكن النصوص اللي فيها متغيرات → segments + أرقام slots
+
+وقت التشغيل ما فيه تحليل نصوص: fill_bundle يعبّي الـ slots بس.
+"""
+
+import copy
+import json
+
+from siyadah import placeholders
+from siyadah.placeholders import PLACEHOLDER_RE, NESTED_RE
+
+BUNDLE_VERSION = "1.0"
+
+# templates.<group>.<sub> → اسم القالب في data/templates/messages/{industry}.json
+TEMPLATE_ALIASES = {
+    "followup.day3": "follow_up_day3",
+    "followup.day7": "follow_up_day7",
+    "appointment.confirmation": "appointment_confirmation",
+    "appointment.reminder_day_before": "reminder_appointment",
+    "appointment.reminder_hour_before": "reminder_hour_before",
+    "complaint.acknowledgement": "complaint_ack",
+}
+# templates.<group>.{company.industry} → القالب من ملف الصناعة نفسها
+INDUSTRY_GROUPS = {
+    "welcome": "welcome",
+    "review": "review_request",
+}
+
+# ============================================================
+# 1. ربط مراجع templates.* بنصوص الرسائل
+# ============================================================
+
+def resolve_template(ref, industry, messages):
+    """templates.welcome.clinic → نص القالب (أو None)"""
+    parts = ref.split(".")
+    if len(parts) != 3 or parts[0] != "templates":
+        return None
+    _, group, sub = parts
+    if group in INDUSTRY_GROUPS and sub in messages:
+        tmpl = messages[sub].get(INDUSTRY_GROUPS[group])
+    else:
+        name = TEMPLATE_ALIASES.get(f"{group}.{sub}", f"{group}_{sub}")
+        tmpl = messages.get(industry, {}).get(name)
+    return tmpl.get("text") if tmpl else None
+
+
+def _switch_cases(key, industry, messages):
+    """templates.invoice.{step.x.level} → {level: text} لكل مستوى موجود"""
+    m = NESTED_RE.search(key)
+    selector = m.group(1)
+    group = key[:m.start()].split(".")[1]  # "templates.invoice." → invoice
+    cases = {}
+    for name, tmpl in messages.get(industry, {}).items():
+        if name.startswith(group + "_"):
+            cases[name[len(group) + 1:]] = tmpl.get("text", "")
+    return selector.strip(), cases
+
+# ============================================================
+# 2. تجميع حزمة واحدة
+# ============================================================
+
+class _Compiler:
+    def __init__(self, flow_id, industry, messages, catalog, static):
+        self.where = f"{flow_id}/{industry}"
+        self.industry = industry
+        self.messages = messages
+        self.catalog = catalog
+        self.static = static
+        self.slots = []
+        self.slot_index = {}
+        self.holes = []
+        self.errors = []
+        self.warnings = []
+
+    def slot(self, key):
+        idx = self.slot_index.get(key)
+        if idx is None:
+            idx = len(self.slots)
+            self.slot_index[key] = idx
+            var = self.catalog.get(key, {})
+            entry = {"key": key, "kind": placeholders.classify(key)}
+            for field in ("required", "fallback", "default", "type"):
+                if field in var:
+                    entry[field] = var[field]
+            self.slots.append(entry)
+            errors, warnings = placeholders.check_keys([key], self.catalog, self.where)
+            self.errors.extend(errors)
+            self.warnings.extend(warnings)
+        return idx
+
+    def compile_text(self, text):
+        segments, keys = placeholders.split(text)
+        return {"segments": segments, "slots": [self.slot(k) for k in keys]}
+
+    def inline_static(self, text):
+        """يحل المراجع المعروفة وقت البناء (company.industry + templates.*)"""
+        def nested(m):
+            return self.static.get(m.group(1).strip(), m.group(0))
+
+        def outer(m):
+            key = NESTED_RE.sub(nested, m.group(1).strip())
+            if key.startswith("templates.") and "{" not in key:
+                resolved = resolve_template(key, self.industry, self.messages)
+                if resolved is not None:
+                    return resolved
+                self.warnings.append(f"[{self.where}] قالب رسالة غير موجود: {key}")
+            return "{{" + key + "}}"
+
+        return PLACEHOLDER_RE.sub(outer, text)
+
+    def walk(self, node, path):
+        if isinstance(node, dict):
+            return {k: self.walk(v, path + [k]) for k, v in node.items()}
+        if isinstance(node, list):
+            return [self.walk(v, path + [i]) for i, v in enumerate(node)]
+        if not placeholders.has_placeholders(node):
+            return node
+
+        text = self.inline_static(node)
+        segments, keys = placeholders.split(text)
+        # قالب ديناميكي بالكامل: {{templates.invoice.{step.x.level}}}
+        if len(keys) == 1 and segments == ["", ""] and keys[0].startswith("templates.") and "{" in keys[0]:
+            selector, cases = _switch_cases(keys[0], self.industry, self.messages)
+            if cases:
+                self.holes.append({
+                    "path": path,
+                    "switch": self.slot(selector),
+                    "cases": {v: self.compile_text(t) for v, t in sorted(cases.items())},
+                })
+                return text
+            self.warnings.append(f"[{self.where}] لا توجد قوالب لـ {keys[0]}")
+        if keys:
+            hole = self.compile_text(text)
+            hole["path"] = path
+            self.holes.append(hole)
+        return text
+
+
+def compile_bundle(flow, industry, messages, catalog):
+    """يرجع (bundle, errors[], warnings[])"""
+    flow_id = flow.get("_meta", {}).get("id", "?")
+    body = copy.deepcopy(flow)
+    variants = body.pop("industry_variants", {}) or {}
+    variant = variants.get(industry, {})
+
+    sheets = body.get("sheets_template")
+    if sheets and variant.get("sheets_extra_columns"):
+        columns = list(sheets.get("columns", []))
+        columns += [c for c in variant["sheets_extra_columns"] if c not in columns]
+        body["sheets_template"] = dict(sheets, columns=columns)
+    body["industry_variant"] = variant
+
+    static = {"company.industry": industry}
+    compiler = _Compiler(flow_id, industry, messages, catalog, static)
+    body = compiler.walk(body, [])
+
+    required = []
+    for category, names in (flow.get("required_variables") or {}).items():
+        if category == "optional":
+            continue
+        required += [f"{category}.{n}" for n in names]
+
+    bundle = {
+        "_bundle": {
+            "version": BUNDLE_VERSION,
+            "flow_id": flow_id,
+            "industry": industry,
+            "has_variant": bool(variant),
+        },
+        "static": static,
+        "slots": compiler.slots,
+        "required": required,
+        "holes": compiler.holes,
+        "body": body,
+    }
+    return bundle, compiler.errors, compiler.warnings
+
+# ============================================================
+# 3. وقت التشغيل: تعبئة الـ slots
+# ============================================================
+
+def _render(hole, slots, vector):
+    segments = hole["segments"]
+    idxs = hole["slots"]
+    if len(idxs) == 1 and segments[0] == "" and segments[1] == "":
+        value = vector[idxs[0]]
+        return value if value is not None else "{{" + slots[idxs[0]]["key"] + "}}"
+    out = [segments[0]]
+    for i, idx in enumerate(idxs):
+        value = vector[idx]
+        out.append("{{" + slots[idx]["key"] + "}}" if value is None else str(value))
+        out.append(segments[i + 1])
+    return "".join(out)
+
+
+def fill_bundle(bundle, values):
+    """
+    values: {"company.company_name": "...", ...}
+    المتغيرات الناقصة تبقى {{key}} عشان يحلها ActivePieces وقت التشغيل.
+    """
+    slots = bundle["slots"]
+    values = dict(bundle.get("static", {}), **values)
+    vector = [values.get(s["key"]) for s in slots]
+    for i, s in enumerate(slots):
+        if vector[i] is None and "default" in s:
+            # default نفسه ممكن يكون فيه متغيرات: "مع تحيات فريق {{company.company_name}}"
+            default = s["default"]
+            if placeholders.has_placeholders(default):
+                default = PLACEHOLDER_RE.sub(
+                    lambda m: str(values.get(m.group(1).strip(), m.group(0))), default)
+            vector[i] = default
+    flow = json.loads(json.dumps(bundle["body"], ensure_ascii=False))
+
+    for hole in bundle["holes"]:
+        if "switch" in hole:
+            case = hole["cases"].get(vector[hole["switch"]])
+            if case is None:
+                continue
+            value = _render(case, slots, vector)
+        else:
+            value = _render(hole, slots, vector)
+        node = flow
+        for key in hole["path"][:-1]:
+            node = node[key]
+        node[hole["path"][-1]] = value
+    return flow
+
+
+def missing_required(bundle, values):
+    """متغيرات required_variables اللي ما انعطت"""
+    static = bundle.get("static", {})
+    return [k for k in bundle["required"] if k not in static and values.get(k) in (None, "")]
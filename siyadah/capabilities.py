@@ -0,0 +1,210 @@
+"""
+🔁 فهرس القدرات المشتركة بين الأدوات (capability → [(piece, action)])
+
+كل action/trigger يتحول لمفتاح قانوني "verb:object" من اسمه المعروض واسمه:
+  gmail.send_email + sendgrid.send_email + smtp.send-email  → send:email
+  google-sheets.googlesheets_new_row_added + airtable.new_record → new:record
+
+التطبيع:
+  - تقسيم camelCase / - / _ + حذف اسم الأداة نفسها (slack-add-reaction → add reaction)
+  - مرادفات الأفعال والأسماء (fetch→get، row/item→record، mail→email) + المفرد
+  - الجمع يغيّر الفعل: get_customers → list:customer، insert_multiple_rows → create_many:record
+  - كلمات الوجهة بآخر الاسم تُحذف: send_channel_message / send_message_with_bot → send:message
+  - triggers: new/added/created/scheduled → new، updated/changed → updated
+  - لو الاسم بدون object → أول اسم معروف في الوصف
+
+by_member بالأسماء بعد الطيّ (sendMessage = send_message) — نفس مطابقة flowcheck.
+custom_api_call وأمثاله عامة (كل أداة فيها) — ما تدخل الفهرس.
+"""
+
+import re
+from collections import Counter, defaultdict
+
+from siyadah.flowcheck import fold, resolve
+
+CAMEL_RE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+SPLIT_RE = re.compile(r"[^a-z0-9]+")
+
+GENERIC_ACTIONS = frozenset(["custom_api_call"])
+STOPWORDS = frozenset([
+    "a", "an", "the", "to", "of", "by", "from", "in", "into", "on", "for", "with", "and", "or", "as", "at",
+    "your", "my", "all", "any", "anywhere", "public", "recently", "based", "using", "via",
+])
+VERB_SYNONYMS = {
+    "fetch": "get", "retrieve": "get", "read": "get", "lookup": "find", "search": "find",
+    "add": "create", "insert": "create", "new": "create", "make": "create",
+    "edit": "update", "modify": "update", "change": "update", "upsert": "update",
+    "remove": "delete", "post": "send",
+}
+NOUN_SYNONYMS = {
+    "mail": "email", "e": "email", "msg": "message",
+    "row": "record", "item": "record", "entry": "record",
+    "person": "contact", "people": "contact", "lead": "contact",
+    "meeting": "event", "appointment": "event", "booking": "event",
+    "document": "doc", "spreadsheet": "sheet", "worksheet": "sheet",
+}
+# كلمات ما تنجمع رغم الـ s → (المفرد، جمع؟)
+UNCOUNTED = {"status": "status", "news": "news", "details": "detail", "analytics": "analytics"}
+# كلمات تعني "أكثر من عنصر" — row(s) يصير توكن "s"
+MANY_WORDS = frozenset(["many", "multiple", "bulk", "batch", "s"])
+# get + جمع = list؛ find/list ترجع أكثر من عنصر أصلاً
+PLURAL_VERBS = {"get": "list", "list": "list", "find": "find"}
+DESTINATION_WORDS = frozenset(["channel", "user", "bot", "webhook", "chat", "group", "direct"])
+TRIGGER_NEW = frozenset(["new", "added", "created", "received", "posted", "submitted", "scheduled", "booked"])
+TRIGGER_UPDATED = frozenset(["updated", "changed", "modified", "edited", "change"])
+TRIGGER_DELETED = frozenset(["deleted", "removed", "cancelled", "canceled"])
+
+# ============================================================
+# 1. التطبيع
+# ============================================================
+
+def words(text):
+    return [w for w in SPLIT_RE.split(CAMEL_RE.sub(" ", text or "").lower()) if w]
+
+
+def _singular(w):
+    """(المفرد، كان جمع؟)"""
+    if w in UNCOUNTED:
+        return UNCOUNTED[w], False
+    if len(w) > 3 and w.endswith("ies"):
+        return w[:-3] + "y", True
+    if len(w) > 3 and w.endswith("s") and not w.endswith("ss"):
+        return w[:-1], True
+    return w, False
+
+
+def _piece_words(piece_id):
+    parts = words(piece_id)
+    return frozenset(parts + ["".join(parts)])
+
+
+def _object_words(tokens, skip):
+    """(كلمات الـ object، جمع؟) — الجمع من آخر اسم أو كلمة many/multiple"""
+    out = []
+    many = False
+    for w in tokens:
+        if w in STOPWORDS or w in skip or w.isdigit():
+            continue
+        if w in MANY_WORDS:
+            many = True
+            continue
+        w, plural = _singular(w)
+        out.append((NOUN_SYNONYMS.get(w, w), plural))
+    while len(out) > 1 and out[-1][0] in DESTINATION_WORDS:
+        out.pop()
+    return [w for w, _ in out], many or bool(out and out[-1][1])
+
+
+def capability_key(piece_id, name, display_name=None, kind="action", description=None, vocabulary=None):
+    """مفتاح قانوني "verb:object" — None لو عام أو اسم قالب ($, {)"""
+    if name in GENERIC_ACTIONS or "$" in name or "{" in name:
+        return None
+    source = display_name if display_name and "$" not in display_name else name
+    skip = _piece_words(piece_id)
+    tokens = [w for w in words(source) if w not in skip]
+    if not tokens:
+        tokens = [w for w in words(name) if w not in skip]
+    if not tokens:
+        return None
+
+    if kind == "trigger":
+        token_set = set(tokens)
+        if token_set & TRIGGER_NEW and token_set & TRIGGER_UPDATED:
+            verb = "new_or_updated"
+        elif token_set & TRIGGER_UPDATED:
+            verb = "updated"
+        elif token_set & TRIGGER_DELETED:
+            verb = "deleted"
+        else:
+            verb = "new"
+        # triggers تطلق لكل عنصر — الجمع ما يفرق
+        obj, _ = _object_words(tokens, TRIGGER_NEW | TRIGGER_UPDATED | TRIGGER_DELETED | {"or"})
+    else:
+        verb = VERB_SYNONYMS.get(tokens[0], tokens[0])
+        obj, plural = _object_words(tokens[1:], skip)
+        if plural and obj:
+            verb = PLURAL_VERBS.get(verb, f"{verb}_many")
+
+    if not obj and description and vocabulary:
+        known = [w for w in _object_words(words(description), skip)[0] if w in vocabulary and w != verb]
+        obj = known[:1]
+    return f"{verb}:{'_'.join(obj)}" if obj else verb
+
+# ============================================================
+# 2. بناء الفهرس
+# ============================================================
+
+def _entries(piece):
+    """(kind, name, display_name, description) — يقبل actions كـ list (السجل) أو dict (data/tools)"""
+    for kind in ("actions", "triggers"):
+        items = piece.get(kind) or []
+        if isinstance(items, dict):
+            items = [dict(v, name=k) for k, v in items.items()]
+        for a in items:
+            if isinstance(a, dict) and a.get("name"):
+                yield (kind[:-1], a["name"], a.get("display_name") or a.get("displayName"),
+                       a.get("description"))
+
+
+def build_capability_index(pieces):
+    """
+    pieces: سجل الأدوات أو تفاصيل data/tools (أو الاثنين — التكرار يُحذف).
+    يرجع {"capabilities": {key: {kind, label, members: [[piece, name]]}}, "by_member": {"piece.foldedname": key}}
+    """
+    # المرور الأول: مفاتيح من الأسماء + مفردات الأسماء (للاستعانة بالوصف)
+    rows = []
+    seen = set()
+    for p in pieces:
+        pid = p["id"]
+        for kind, name, display, desc in _entries(p):
+            if (pid, kind, name) in seen:
+                continue
+            seen.add((pid, kind, name))
+            rows.append((pid, kind, name, display, desc))
+
+    vocabulary = Counter()
+    for pid, kind, name, display, desc in rows:
+        key = capability_key(pid, name, display, kind)
+        if key and ":" in key:
+            vocabulary.update(key.split(":", 1)[1].split("_"))
+
+    groups = defaultdict(list)
+    labels = defaultdict(Counter)
+    for pid, kind, name, display, desc in rows:
+        key = capability_key(pid, name, display, kind, desc, vocabulary)
+        if not key:
+            continue
+        key = f"{kind}/{key}"
+        groups[key].append([pid, name])
+        if display:
+            labels[key][display] += 1
+
+    capabilities = {}
+    by_member = {}
+    for key in sorted(groups):
+        kind = key.split("/", 1)[0]
+        capabilities[key] = {
+            "kind": kind,
+            "label": (min(labels[key].items(), key=lambda kv: (-kv[1], len(kv[0])))[0]
+                      if labels[key] else key.split("/", 1)[1]),
+            "members": sorted(groups[key]),
+        }
+        for pid, name in groups[key]:
+            by_member[f"{pid}.{fold(name)}"] = key
+    return {"capabilities": capabilities, "by_member": by_member}
+
+
+def alternatives(index, piece_id, name, exclude=()):
+    """[(piece, name)] بنفس القدرة من أدوات ثانية — lookup واحد (أسماء الـ templates تُحوّل بـ resolve)"""
+    piece_id, folded = resolve(piece_id, name)
+    key = index["by_member"].get(f"{piece_id}.{folded}")
+    if not key:
+        return []
+    skip = set(exclude) | {piece_id}
+    return [(p, n) for p, n in index["capabilities"][key]["members"] if p not in skip]
+
+
+def shared_capabilities(index, min_pieces=2):
+    """القدرات اللي فيها أكثر من أداة (فيها بدائل فعلاً)"""
+    return {k: c for k, c in index["capabilities"].items()
+            if len({p for p, _ in c["members"]}) >= min_pieces}
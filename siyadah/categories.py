@@ -0,0 +1,96 @@
+"""
+🗂️ تصنيف الأدوات حسب الـ ID (data/registry/category-rules.json)
+
+القواعد تُبنى مرة وحدة: overrides = dict، وكل الأنماط (prefix/contains/exact)
+في Automaton واحد — تصنيف أي ID = مرور واحد عليه مهما كان عدد القواعد.
+الأولوية = ترتيب القواعد بالملف (نفس ترتيب guess_category القديم).
+
+الثقة:
+  override                 1.0
+  النمط = الـ ID كامل      0.95
+  prefix                   0.9
+  contains                 0.5 → 0.9 (حسب نسبة النمط من طول الـ ID)
+  فئة ثانية طابقت كمان     × 0.8
+  ما طابق شي (default)     default_confidence
+"""
+
+from siyadah.automaton import Automaton
+from siyadah.data import CATEGORY_RULES, load_json
+
+MATCH_KINDS = ("exact", "prefix", "contains")
+AMBIGUOUS_FACTOR = 0.8
+
+
+def compile_rules(doc):
+    """يرجع classifier: {"overrides", "automaton", "default", "default_confidence"}"""
+    meta = doc.get("_meta", {})
+    automaton = Automaton()
+    for priority, rule in enumerate(doc.get("rules", [])):
+        kind = rule.get("match", "contains")
+        if kind not in MATCH_KINDS:
+            raise ValueError(f"قاعدة {priority}: match غير صالح '{kind}'")
+        for pattern in rule["patterns"]:
+            automaton.add(pattern.lower(), (priority, kind, rule["category"], pattern))
+    return {
+        "overrides": {k.lower(): v for k, v in doc.get("overrides", {}).items()},
+        "automaton": automaton.build(),
+        "default": meta.get("default", "G_productivity"),
+        "default_confidence": meta.get("default_confidence", 0.2),
+    }
+
+
+def load_classifier(path=CATEGORY_RULES):
+    return compile_rules(load_json(path))
+
+
+def _matches(classifier, key):
+    """[(priority, kind, category, pattern, confidence)] — الصالحة فقط، الأقوى أولاً"""
+    found = []
+    n = len(key)
+    for start, end, (priority, kind, category, pattern) in classifier["automaton"].findall(key):
+        if kind == "exact" and (start or end != n):
+            continue
+        if kind == "prefix" and start:
+            continue
+        if start == 0 and end == n:
+            confidence = 0.95
+        elif kind == "prefix":
+            confidence = 0.9
+        else:
+            confidence = min(0.9, 0.5 + 0.4 * (end - start) / n)
+        found.append((priority, kind, category, pattern, confidence))
+    found.sort(key=lambda m: (m[0], -m[4]))
+    return found
+
+
+def classify(classifier, piece_id):
+    """(category, confidence)"""
+    key = piece_id.lower()
+    category = classifier["overrides"].get(key)
+    if category:
+        return category, 1.0
+    found = _matches(classifier, key)
+    if not found:
+        return classifier["default"], classifier["default_confidence"]
+    _, _, category, _, confidence = found[0]
+    if any(m[2] != category for m in found):
+        confidence *= AMBIGUOUS_FACTOR
+    return category, round(confidence, 2)
+
+
+def explain(classifier, piece_id):
+    """نفس classify + كل القواعد اللي طابقت (للعرض)"""
+    key = piece_id.lower()
+    category, confidence = classify(classifier, piece_id)
+    if key in classifier["overrides"]:
+        matched = [{"rule": "override", "category": category, "pattern": key, "confidence": 1.0}]
+    else:
+        matched = [{"rule": f"rules[{p}] {kind}", "category": cat, "pattern": pat, "confidence": round(c, 2)}
+                   for p, kind, cat, pat, c in _matches(classifier, key)]
+    return {"id": piece_id, "category": category, "confidence": confidence,
+            "default": not matched, "matched": matched}
+
+
+def classify_many(classifier, piece_ids):
+    """{id: (category, confidence)}"""
+    return {pid: classify(classifier, pid) for pid in piece_ids}
@@ -0,0 +1,134 @@
+"""
+📂 تحميل ملفات البيانات (data/)
+
+مسارات ثابتة نسبةً لجذر المشروع — نفس المسارات اللي يستخدمها محرك Node.
+"""
+
+import json
+import os
+import glob
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(ROOT, "data")
+
+FLOWS_DIR = os.path.join(DATA_DIR, "flows")
+MESSAGES_DIR = os.path.join(DATA_DIR, "templates", "messages")
+SHEETS_CONFIG = os.path.join(DATA_DIR, "templates", "sheets", "sheets-config.json")
+VARIABLES_DIR = os.path.join(DATA_DIR, "variables")
+ERROR_MAP = os.path.join(DATA_DIR, "errors", "error-map.json")
+PROMPTS_FILE = os.path.join(DATA_DIR, "prompts", "prompts-library.json")
+PIECES_DIR = os.path.join(DATA_DIR, "registry", "pieces")
+REGISTRY_FILES = [
+    os.path.join(DATA_DIR, "registry", "tools-full.json"),
+    os.path.join(DATA_DIR, "registry", "tools.json"),
+]
+CATEGORY_RULES = os.path.join(DATA_DIR, "registry", "category-rules.json")
+TOOLS_DIR = os.path.join(DATA_DIR, "tools")
+TOOLS_DIRS = [os.path.join(DATA_DIR, "tools-full"), TOOLS_DIR]
+BUILD_DIR = os.path.join(DATA_DIR, "build")
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def write_json(path, data, compact=False):
+    """يكتب JSON ويرجع الحجم بالبايت"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        if compact:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        else:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    return os.path.getsize(path)
+
+
+def load_flows(flows_dir=FLOWS_DIR):
+    """{flow_id: flow} لكل قوالب data/flows"""
+    flows = {}
+    for path in sorted(glob.glob(os.path.join(flows_dir, "*.json"))):
+        flow = load_json(path)
+        fid = flow.get("_meta", {}).get("id") or os.path.basename(path)[:-5]
+        flows[fid] = flow
+    return flows
+
+
+def load_messages(messages_dir=MESSAGES_DIR):
+    """{industry: {template_name: template}}"""
+    messages = {}
+    for path in sorted(glob.glob(os.path.join(messages_dir, "*.json"))):
+        doc = load_json(path)
+        industry = doc.get("_meta", {}).get("industry") or os.path.basename(path)[:-5]
+        messages[industry] = doc.get("templates", {})
+    return messages
+
+
+def load_variables(variables_dir=VARIABLES_DIR):
+    """{"company.company_name": variable, ...} — كل المتغيرات المعرّفة بالمفتاح الكامل"""
+    catalog = {}
+    for path in sorted(glob.glob(os.path.join(variables_dir, "*.json"))):
+        doc = load_json(path)
+        category = doc.get("_meta", {}).get("category") or os.path.basename(path)[:-5]
+        for name, var in doc.get("variables", {}).items():
+            key = var.get("key") or f"{category}.{name}"
+            catalog[key] = var
+    return catalog
+
+
+def load_registry(pieces_dir=PIECES_DIR, tools_dirs=TOOLS_DIRS):
+    """
+    يرجع (pieces[], source) — المصدر: data/registry/pieces/ أولاً،
+    ثم السجل المُجمّع (tools-full.json ثم tools.json)، وإلا تفاصيل data/tools بشكل السجل
+    (source = مجلد الأدوات — سجل جزئي، شوف is_partial_registry). ([], None) إذا ما فيه شي.
+    """
+    files = sorted(glob.glob(os.path.join(pieces_dir, "*.json")))
+    if files:
+        return [load_json(f) for f in files], pieces_dir
+    for path in REGISTRY_FILES:
+        if os.path.exists(path):
+            return load_json(path).get("pieces", []), path
+    details = load_tool_details(tools_dirs)
+    if details:
+        source = next(d for d in tools_dirs if glob.glob(os.path.join(d, "*.json")))
+        return [tool_as_piece(pid, d) for pid, d in sorted(details.items())], source
+    return [], None
+
+
+def is_partial_registry(source):
+    """السجل جاي من data/tools (تفاصيل بعض الأدوات بس) مو السجل الكامل"""
+    return source in TOOLS_DIRS
+
+
+def tool_as_piece(pid, detail):
+    """تفاصيل data/tools → شكل سجل مختصر (نفس حقول tools-full.json)"""
+    auth = detail.get("auth")
+    auth_type = detail.get("auth_type") or (auth.get("type") if isinstance(auth, dict) else auth)
+    if auth_type in ("none", "NONE"):
+        auth_type = None
+
+    def entries(kind):
+        return [{"name": n, "display_name": e.get("displayName") or e.get("display_name")}
+                for n, e in (detail.get(kind) or {}).items()]
+
+    return {
+        "id": pid,
+        "package": detail.get("package"),
+        "display_name": detail.get("displayName") or detail.get("display_name"),
+        "display_name_ar": detail.get("display_name_ar"),
+        "description": detail.get("description"),
+        "category": detail.get("category"),
+        "auth_type": auth_type,
+        "actions": entries("actions"),
+        "triggers": entries("triggers"),
+    }
+
+
+def load_tool_details(tools_dirs=TOOLS_DIRS):
+    """{piece_id: detail} — actions/triggers مع props؛ data/tools-full أولاً ثم data/tools"""
+    details = {}
+    for d in reversed(tools_dirs):
+        for path in glob.glob(os.path.join(d, "*.json")):
+            doc = load_json(path)
+            details[doc.get("id") or os.path.basename(path)[:-5]] = doc
+    return details
@@ -0,0 +1,324 @@
+"""
+🧬 كشف التكرار بالـ hash لكل tenant (جوال / إيميل / فاتورة)
+
+بدل store_get لكل صف (customer-journey.check_duplicate) أو hash(invoice_number + date)
+لكل فاتورة — فهرس hashes محفوظ على القرص، والدفعة كلها تتصنّف بمرور واحد:
+
+  المفاتيح:  p:+9665XXXXXXXX (siyadah.phones) | e:name@mail.com | i:INV-001[:2026-10-19]
+  الـ hash:  blake2b 64-bit (ثابت بين التشغيلات — مو hash() حق بايثون)
+  الصف مكرر لو أي مفتاح من مفاتيحه موجود (في الفهرس أو في صف سابق بنفس الدفعة)
+
+التخزين: data/build/dedupe/<tenant>/
+  index.bin  — snapshot مرتّب (array 'Q')
+  log.bin    — الإضافات الجديدة (append فقط) → تندمج في index.bin عند compact
+  bloom.bin  — Bloom filter اختياري: المفتاح اللي يقول عنه "غير موجود" ما يحتاج الفهرس
+               (الفهرس الكامل ما يتحمّل من القرص إلا عند أول إيجابي)
+  meta.json  — bloom.count = عدد المفاتيح وقت حفظ الـ Bloom؛ لو اختلف عن count (تشغيل بدون
+               --bloom أضاف مفاتيح) الـ Bloom قديم ويُبنى من جديد
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from siyadah import arabic
+from siyadah.data import BUILD_DIR
+from siyadah.phones import normalize_column
+
+DEDUPE_DIR = os.path.join(BUILD_DIR, "dedupe")
+DEFAULT_FIELDS = {"phone": "الجوال", "email": "الإيميل", "invoice": "رقم_الفاتورة"}
+DEFAULT_CAPACITY = 1000000
+DEFAULT_FP_RATE = 0.01
+COMPACT_RATIO = 0.5
+MASK32 = 0xFFFFFFFF
+
+
+def key_hash(key):
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _safe(tenant):
+    return re.sub(r"[^\w.-]", "_", str(tenant)) or "_"
+
+
+def tenant_dir(tenant, directory=DEDUPE_DIR):
+    """مجلد الـ tenant تحت directory — ValueError لو الاسم نقاط بس ("." / "..") أو يطلع برّا المجلد"""
+    name = _safe(tenant)
+    if not name.strip("."):
+        raise ValueError(f"اسم tenant غير صالح: {tenant!r}")
+    root = os.path.realpath(directory)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.dirname(path) != root:
+        raise ValueError(f"مجلد الـ tenant {tenant!r} يطلع برّا {directory}")
+    return os.path.join(directory, name)
+
+
+def _read(path):
+    out = array("Q")
+    if os.path.exists(path):
+        with open(path, "rb") as f:
+            out.frombytes(f.read())
+    return out
+
+# ============================================================
+# 1. Bloom filter
+# ============================================================
+
+class Bloom:
+    def __init__(self, m, k, bits=None):
+        self.m = m
+        self.k = k
+        self.bits = bits if bits is not None else bytearray((m + 7) // 8)
+
+    @classmethod
+    def sized(cls, capacity, fp_rate=DEFAULT_FP_RATE):
+        m = max(64, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        return cls(m, max(1, round(m / capacity * math.log(2))))
+
+    def _positions(self, h):
+        h1 = h & MASK32
+        h2 = (h >> 32) | 1
+        m = self.m
+        return [(h1 + i * h2) % m for i in range(self.k)]
+
+    def add(self, h):
+        bits = self.bits
+        for p in self._positions(h):
+            bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, h):
+        bits = self.bits
+        for p in self._positions(h):
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+        return True
+
+    def _positions_np(self, hashes):
+        h = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+        h1 = h & np.uint64(MASK32)
+        h2 = (h >> np.uint64(32)) | np.uint64(1)
+        return (h1[:, None] + np.arange(self.k, dtype=np.uint64)[None, :] * h2[:, None]) % np.uint64(self.m)
+
+    def contains_many(self, hashes):
+        """[bool] — بـ numpy لو موجود (كل المواقع بعملية وحدة)"""
+        if np is None or not hashes:
+            return [h in self for h in hashes]
+        pos = self._positions_np(hashes)
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        hit = (bits[pos >> np.uint64(3)] >> (pos & np.uint64(7)).astype(np.uint8)) & 1
+        return hit.all(axis=1).tolist()
+
+    def add_many(self, hashes):
+        if np is None or not hashes:
+            for h in hashes:
+                self.add(h)
+            return
+        pos = self._positions_np(hashes).ravel()
+        bits = np.frombuffer(self.bits, dtype=np.uint8)
+        np.bitwise_or.at(bits, pos >> np.uint64(3), np.left_shift(1, pos & np.uint64(7)).astype(np.uint8))
+
+# ============================================================
+# 2. الفهرس (لكل tenant)
+# ============================================================
+
+class DedupeIndex:
+    def __init__(self, tenant, directory=DEDUPE_DIR, bloom=False, capacity=DEFAULT_CAPACITY,
+                 fp_rate=DEFAULT_FP_RATE):
+        self.tenant = tenant
+        self.dir = tenant_dir(tenant, directory)
+        self.paths = {name: os.path.join(self.dir, name) for name in ("index.bin", "log.bin", "bloom.bin", "meta.json")}
+        meta_path = self.paths["meta.json"]
+        self.meta = {"count": 0, "logged": 0}
+        if os.path.exists(meta_path):
+            with open(meta_path, encoding="utf-8") as f:
+                self.meta.update(json.load(f))
+        self._hashes = None
+        self._pending = array("Q")
+        self.loads = 0
+        self.bloom_skips = 0
+
+        self.bloom = None
+        if bloom:
+            saved = self.meta.get("bloom")
+            if saved and saved.get("count") == self.meta["count"] and os.path.exists(self.paths["bloom.bin"]):
+                with open(self.paths["bloom.bin"], "rb") as f:
+                    self.bloom = Bloom(saved["m"], saved["k"], bytearray(f.read()))
+            else:
+                self._rebuild_bloom(max(capacity, 2 * self.meta["count"]), fp_rate)
+
+    @property
+    def count(self):
+        return self.meta["count"]
+
+    def _load(self):
+        """الفهرس الكامل (lazy) — index.bin + log.bin + الإضافات اللي ما انحفظت"""
+        if self._hashes is None:
+            self.loads += 1
+            hashes = set(_read(self.paths["index.bin"]))
+            hashes.update(_read(self.paths["log.bin"]))
+            hashes.update(self._pending)
+            self._hashes = hashes
+        return self._hashes
+
+    def _rebuild_bloom(self, capacity, fp_rate=DEFAULT_FP_RATE):
+        self.bloom = Bloom.sized(capacity, fp_rate)
+        self.meta["bloom"] = {"m": self.bloom.m, "k": self.bloom.k, "capacity": capacity}
+        if self.meta["count"]:
+            for h in self._load():
+                self.bloom.add(h)
+
+    def __contains__(self, h):
+        if self.bloom is not None and h not in self.bloom:
+            self.bloom_skips += 1
+            return False
+        return h in self._load()
+
+    def add(self, h):
+        """True لو الـ hash جديد"""
+        if h in self:
+            return False
+        if self._hashes is not None:
+            self._hashes.add(h)
+        self._pending.append(h)
+        if self.bloom is not None:
+            self.bloom.add(h)
+        self.meta["count"] += 1
+        return True
+
+    def existing(self, hashes):
+        """الموجود منها في الفهرس — الـ Bloom يصفّي أول، والفهرس الكامل يتحمّل بس لو فيه مرشّحين"""
+        candidates = hashes
+        if self.bloom is not None:
+            candidates = [h for h, maybe in zip(hashes, self.bloom.contains_many(hashes)) if maybe]
+            self.bloom_skips += len(hashes) - len(candidates)
+            if not candidates:
+                return set()
+        return self._load().intersection(candidates)
+
+    def add_many(self, hashes):
+        """hashes معروف إنها جديدة (من existing)"""
+        if self._hashes is not None:
+            self._hashes.update(hashes)
+        self._pending.extend(hashes)
+        if self.bloom is not None:
+            self.bloom.add_many(hashes)
+        self.meta["count"] += len(hashes)
+
+    def save(self):
+        """يلحق الإضافات بـ log.bin — ويدمج (compact) لو كبر الـ log"""
+        os.makedirs(self.dir, exist_ok=True)
+        if self._pending:
+            with open(self.paths["log.bin"], "ab") as f:
+                self._pending.tofile(f)
+            self.meta["logged"] += len(self._pending)
+            self._pending = array("Q")
+        if self.meta["logged"] > COMPACT_RATIO * self.meta["count"] and self.meta["count"] > 1024:
+            self.compact()
+            return
+        self._write_meta()
+
+    def compact(self):
+        """index.bin = كل الـ hashes مرتّبة؛ log.bin يتصفّر؛ الـ Bloom يكبر لو تعدّى سعته"""
+        os.makedirs(self.dir, exist_ok=True)
+        snapshot = array("Q", sorted(self._load()))
+        tmp = self.paths["index.bin"] + ".tmp"
+        with open(tmp, "wb") as f:
+            snapshot.tofile(f)
+        os.replace(tmp, self.paths["index.bin"])
+        open(self.paths["log.bin"], "wb").close()
+        self._pending = array("Q")
+        self.meta.update(count=len(snapshot), logged=0)
+        if self.bloom is not None and self.meta["count"] > self.meta["bloom"]["capacity"]:
+            self._rebuild_bloom(2 * self.meta["count"])
+        self._write_meta()
+
+    def _write_meta(self):
+        if self.bloom is not None:
+            with open(self.paths["bloom.bin"], "wb") as f:
+                f.write(self.bloom.bits)
+            self.meta["bloom"]["count"] = self.meta["count"]
+        with open(self.paths["meta.json"], "w", encoding="utf-8") as f:
+            json.dump(dict(self.meta, tenant=self.tenant), f, ensure_ascii=False, indent=2)
+
+# ============================================================
+# 3. المفاتيح + التصنيف
+# ============================================================
+
+def _email(value):
+    value = str(value or "").strip().lower()
+    return value if "@" in value else ""
+
+
+def _invoice(value):
+    return arabic.normalize_digits(str(value or "")).strip().upper()
+
+
+def new_report():
+    return {"rows": 0, "new": 0, "duplicate": 0, "duplicate_in_batch": 0, "no_key": 0,
+            "matched": {"phone": 0, "email": 0, "invoice": 0}, "added": 0}
+
+
+def classify_batch(index, rows, fields=None, invoice_date=None, update=True, report=None, country="SA"):
+    """
+    rows: [dict] — يرجع (statuses[], report)
+      status: "new" | "duplicate" | "duplicate_in_batch" | "no_key"
+    update: يضيف مفاتيح كل الصفوف للفهرس (حتى المكرر — عشان الإيميل الجديد لنفس الجوال ينربط)
+    invoice_date: يضاف لمفتاح الفاتورة — hash(invoice_number + date) مثل invoice-collection
+    """
+    fields = fields or DEFAULT_FIELDS
+    report = report or new_report()
+    n = len(rows)
+
+    columns = []
+    if fields.get("phone"):
+        formatted, valid, _ = normalize_column([r.get(fields["phone"]) for r in rows], country)
+        columns.append(("phone", ["p:" + p if ok else "" for p, ok in zip(formatted, valid)]))
+    if fields.get("email"):
+        columns.append(("email", ["e:" + e if e else "" for e in (_email(r.get(fields["email"])) for r in rows)]))
+    if fields.get("invoice"):
+        suffix = f":{invoice_date}" if invoice_date else ""
+        columns.append(("invoice", ["i:" + v + suffix if v else "" for v in
+                                    (_invoice(r.get(fields["invoice"])) for r in rows)]))
+
+    hashed = [(kind, [key_hash(k) if k else None for k in col]) for kind, col in columns]
+    unique = list({h for _, col in hashed for h in col if h is not None})
+    existing = index.existing(unique)
+
+    statuses = []
+    batch = set()
+    matched = report["matched"]
+    for i in range(n):
+        keys = [(kind, col[i]) for kind, col in hashed if col[i] is not None]
+        if not keys:
+            statuses.append("no_key")
+            continue
+        status = "new"
+        for kind, h in keys:
+            if h in existing:
+                status = "duplicate"
+            elif h in batch:
+                status = "duplicate_in_batch"
+            else:
+                continue
+            matched[kind] += 1
+            break
+        statuses.append(status)
+        batch.update(h for _, h in keys)
+
+    if update:
+        added = [h for h in unique if h not in existing]
+        index.add_many(added)
+        report["added"] += len(added)
+
+    report["rows"] += n
+    for s in statuses:
+        report[s] += 1
+    return statuses, report
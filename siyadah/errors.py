@@ -0,0 +1,206 @@
+"""
+🚨 فهرس خريطة الأخطاء (error-map.json)
+
+بدل المرور على error_categories كاملة لكل فشل، نبني جداول بحث مباشرة:
+  by_status_piece: "401|gmail"   → [أرقام الأكواد]
+  by_status_auth:  "401|oauth2"  → [...]
+  by_status:       "401"         → [...]   (affected_pieces = ["*"])
+
+الترتيب داخل كل قائمة: الأكثر تكراراً أولاً (frequency).
+البحث = 3 قراءات dict كحد أقصى → O(1).
+"""
+
+import re
+from datetime import datetime
+
+INDEX_VERSION = "1.0"
+NO_STATUS = "-"
+FREQUENCY_RANK = {"high": 0, "medium": 1, "low": 2}
+
+
+def _status_key(status):
+    return NO_STATUS if status is None else str(status)
+
+# ============================================================
+# 1. البناء
+# ============================================================
+
+def build_error_index(error_map, pieces=None, partial=False):
+    """
+    يرجع (index, errors[], warnings[])
+    pieces:  قائمة أدوات السجل — للتحقق من affected_pieces ولجدول piece_auth
+    partial: السجل من data/tools (بعض الأدوات بس) → الأداة غير الموجودة تحذير مو خطأ
+    """
+    errors = []
+    warnings = []
+    user_messages = error_map.get("error_to_user_message", {})
+    registry_ids = {p["id"] for p in pieces} if pieces else None
+
+    entries = []
+    for category, cat in error_map.get("error_categories", {}).items():
+        for e in cat.get("errors", []):
+            entries.append((category, e))
+    entries.sort(key=lambda ce: FREQUENCY_RANK.get(ce[1].get("frequency"), 3))
+
+    codes = []
+    by_status_piece = {}
+    by_status_auth = {}
+    by_status = {}
+    seen = set()
+
+    for category, e in entries:
+        code = e.get("code")
+        if not code:
+            errors.append(f"[{category}] خطأ بدون code")
+            continue
+        if code in seen:
+            errors.append(f"[{code}] كود مكرر")
+            continue
+        seen.add(code)
+
+        fix = e.get("auto_fix") or {}
+        idx = len(codes)
+        codes.append({
+            "code": code,
+            "category": category,
+            "http_status": e.get("http_status"),
+            "message_en": e.get("message_en", ""),
+            "auto_fix": fix.get("strategy"),
+            "max_retries": fix.get("max_retries", 0),
+            "retry_delay_ms": fix.get("retry_delay_ms", 0),
+            "user_message": user_messages.get(code, e.get("message_ar", "")),
+        })
+
+        status = _status_key(e.get("http_status"))
+        affected = e.get("affected_pieces") or ["*"]
+        auth_types = e.get("affected_auth_types") or []
+
+        for pid in affected:
+            if pid == "*":
+                continue
+            by_status_piece.setdefault(f"{status}|{pid}", []).append(idx)
+            if registry_ids is not None and pid not in registry_ids:
+                (warnings if partial else errors).append(
+                    f"[{code}] affected_pieces يستخدم '{pid}' — غير موجود في السجل!")
+        for auth in auth_types:
+            by_status_auth.setdefault(f"{status}|{auth}", []).append(idx)
+        # "*" بدون قيد auth → ينطبق على أي أداة بنفس الحالة
+        if "*" in affected and not auth_types:
+            by_status.setdefault(status, []).append(idx)
+
+    if registry_ids is None:
+        warnings.append("السجل غير موجود — تم تخطي التحقق من affected_pieces")
+
+    piece_auth = {}
+    for p in pieces or []:
+        if p.get("auth_type"):
+            # affected_auth_types بحروف صغيرة: SECRET_TEXT → secret_text
+            piece_auth[p["id"]] = str(p["auth_type"]).lower()
+
+    index = {
+        "_metadata": {
+            "version": INDEX_VERSION,
+            "built_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "total_codes": len(codes),
+            "status_piece_keys": len(by_status_piece),
+            "status_auth_keys": len(by_status_auth),
+            "status_keys": len(by_status),
+        },
+        "codes": codes,
+        "by_status_piece": by_status_piece,
+        "by_status_auth": by_status_auth,
+        "by_status": by_status,
+        "piece_auth": piece_auth,
+    }
+    return index, errors, warnings
+
+# ============================================================
+# 2. البحث
+# ============================================================
+
+def lookup(index, http_status, piece=None, auth_type=None):
+    """كل الأكواد المرشّحة بالترتيب: الأداة → نوع المصادقة → wildcard"""
+    status = _status_key(http_status)
+    if auth_type is None and piece:
+        auth_type = index["piece_auth"].get(piece)
+
+    found = []
+    if piece:
+        found += index["by_status_piece"].get(f"{status}|{piece}", [])
+    if auth_type:
+        found += index["by_status_auth"].get(f"{status}|{auth_type}", [])
+    found += index["by_status"].get(status, [])
+
+    codes = index["codes"]
+    return [codes[i] for i in dict.fromkeys(found)]
+
+
+def classify(index, http_status, piece=None, auth_type=None):
+    """أفضل كود مطابق أو None"""
+    candidates = lookup(index, http_status, piece, auth_type)
+    return candidates[0] if candidates else None
+
+# ============================================================
+# 3. التصنيف بنص الرسالة (سجلات التشغيل)
+# ============================================================
+
+# أنماط رسائل ActivePieces/المزوّدين → كود في error-map.json
+# الأسبق في النص يفوز؛ عند نفس الموضع يفوز الأسبق في القائمة (الأدق أولاً)
+MESSAGE_PATTERNS = [
+    ("AUTH_TOKEN_EXPIRED", r"invalid_grant|token (?:has )?expired|expired token|jwt expired"),
+    ("AUTH_OAUTH_REVOKED", r"revoked|token_revoked|access (?:was )?denied by user"),
+    ("AUTH_INSUFFICIENT_SCOPE", r"insufficient[ _]?(?:authentication )?scope|missing_scope|insufficientpermissions"),
+    ("AUTH_INVALID_API_KEY", r"(?:invalid|incorrect|wrong) api[ _]?key|invalid_api_key|unauthorized api key"),
+    ("RATE_LIMIT_DAILY_QUOTA", r"daily (?:limit|quota)|quota exceeded|quota exhausted|user rate limit exceeded for the day"),
+    ("RATE_LIMIT_EXCEEDED", r"rate[ _]?limit|too many requests|ratelimited"),
+    ("SPREADSHEET_NOT_FOUND", r"spreadsheet.*not found|unable to parse range|requested entity was not found"),
+    ("CHANNEL_NOT_FOUND", r"channel_not_found|unknown channel|channel not found"),
+    ("SHEET_PROTECTED", r"protected (?:cell|range|sheet)|you are trying to edit a protected"),
+    ("DUPLICATE_RECORD", r"duplicate|already exists|conflict"),
+    ("INVALID_EMAIL_FORMAT", r"invalid (?:email|e-mail)|email.*(?:invalid|malformed)"),
+    ("INVALID_PHONE_FORMAT", r"invalid (?:phone|mobile|number)|not a valid phone|(?:recipient|to) .*invalid"),
+    ("INVALID_DATE_FORMAT", r"invalid (?:date|time)|date.*(?:invalid|malformed)"),
+    ("MISSING_REQUIRED_FIELD", r"(?:is )?required|missing (?:required )?(?:field|param)"),
+    ("PAYLOAD_TOO_LARGE", r"payload too large|entity too large|msg_too_long|too long"),
+    ("ENCODING_ERROR", r"encoding|codec|malformed utf|invalid byte sequence"),
+    ("FLOW_TIMEOUT", r"flow (?:execution )?(?:timed out|timeout)|execution time exceeded"),
+    ("CONNECTION_REFUSED", r"econnrefused|connection refused"),
+    ("CONNECTION_TIMEOUT", r"etimedout|esockettimedout|timed? ?out"),
+    ("SERVICE_UNAVAILABLE", r"service unavailable|bad gateway|econnreset|temporarily unavailable"),
+    ("PERMISSION_DENIED", r"permission denied|forbidden|not authorized|does not have permission"),
+    ("INFINITE_LOOP_DETECTED", r"iteration limit|too many iterations"),
+    ("BRANCH_NO_MATCH", r"no branch|no condition matched"),
+    ("RESOURCE_NOT_FOUND", r"not found|does not exist|no such"),
+]
+UNKNOWN_CODE = "UNKNOWN"
+
+
+def compile_message_patterns(patterns=MESSAGE_PATTERNS):
+    """regex واحد بمجموعات مسمّاة → مرور واحد على الرسالة"""
+    parts = [f"(?P<g{i}>{rx})" for i, (_, rx) in enumerate(patterns)]
+    return re.compile("|".join(parts), re.IGNORECASE), [code for code, _ in patterns]
+
+
+def classify_failure(index, http_status, piece, message, matcher=None):
+    """
+    يرجع (code_entry أو None, الطريقة) — الطريقة: message | status | none
+    نص الرسالة يرجّح بين المرشحين؛ لو ما فيه مرشحين بالحالة نعتمد الرسالة وحدها.
+    """
+    regex, pattern_codes = matcher or compile_message_patterns()
+    candidates = lookup(index, http_status, piece)
+    hinted = None
+    if message:
+        m = regex.search(message)
+        if m:
+            hinted = pattern_codes[int(m.lastgroup[1:])]
+    if hinted:
+        for c in candidates:
+            if c["code"] == hinted:
+                return c, "message"
+        if http_status is None or not candidates:
+            for c in index["codes"]:
+                if c["code"] == hinted:
+                    return c, "message"
+    if candidates and http_status is not None:
+        return candidates[0], "status"
+    return None, "none"
@@ -0,0 +1,295 @@
+"""
+✅ التحقق من الـ Flows المولّدة مقابل السجل
+
+المعرفة تُبنى مرة وحدة (build_knowledge) كمجموعات hash:
+  pieces:   {piece_id}
+  actions:  {(piece_id, action)}
+  triggers: {(piece_id, trigger)}
+  required: {(piece_id, action|trigger): (props المطلوبة)}
+
+وبعدها كل flow = قراءات set فقط. نفس شكل data/flows/*.json
+(tool_id/action) مع قبول piece/name كأسماء بديلة.
+
+أسماء الـ actions/props تُطابق بعد الطيّ (fold): sendMessage = send_message = send-message.
+أسماء الـ templates المجرّدة (run_javascript, delay_for, telegram...) تُحوّل لأسماء السجل
+عبر PIECE_ALIASES / NAME_ALIASES قبل المطابقة.
+missing_prop تحذير — props الـ templates مجرّدة وما تطابق السجل دائماً.
+"""
+
+import json
+import re
+from collections import Counter
+from functools import lru_cache
+
+RULES = (
+    "parse", "unknown_piece", "unknown_action", "unknown_trigger",
+    "missing_prop", "bad_field_type", "duplicate_step_id", "bad_after_step", "bad_branch_route",
+    "bad_contains_steps", "bad_step_ref",
+)
+WARNING_RULES = frozenset(["missing_prop"])
+MAX_EXAMPLES = 20
+FOLD_RE = re.compile(r"[^a-z0-9]")
+# {{step.X...}} و {{step.X || ...}} — على نص الـ JSON الخام بدل المشي على كل النصوص
+STEP_REF_RE = re.compile(r"\{\{[^{}]*?\bstep\.(\w+)")
+
+# أسماء data/flows → أسماء السجل (نفس اختيارات engine/tool-selector.js)
+PIECE_ALIASES = {"telegram": "telegram-bot"}
+NAME_ALIASES = {
+    ("code", "runjavascript"): "runcode",
+    ("delay", "delayfor"): "delay",
+    ("slack", "sendmessage"): "sendchannelmessage",
+    ("storage", "storeget"): "storageget",
+    ("storage", "storeput"): "storageput",
+    ("google-sheets", "newrow"): "googlesheetsnewrowadded",
+}
+
+
+@lru_cache(maxsize=4096)
+def fold(name):
+    return FOLD_RE.sub("", name.lower())
+
+
+def resolve(pid, name):
+    """(piece, اسم بعد الطيّ) بأسماء السجل — name ممكن يكون None"""
+    pid = PIECE_ALIASES.get(pid, pid)
+    if not name:
+        return pid, name
+    key = fold(name)
+    return pid, NAME_ALIASES.get((pid, key), key)
+
+# ============================================================
+# 1. بناء المعرفة من السجل
+# ============================================================
+
+def _names(items):
+    if isinstance(items, dict):
+        return [fold(n) for n in items]
+    return [fold(i["name"]) for i in items or [] if isinstance(i, dict) and i.get("name")]
+
+
+def _required(props):
+    """CHECKBOX دايماً له قيمة (false) — ما يُعتبر ناقص"""
+    return tuple(p["name"] for p in props or []
+                 if isinstance(p, dict) and p.get("required") and p.get("type") != "CHECKBOX")
+
+
+def build_knowledge(pieces, details):
+    """pieces: سجل الأدوات؛ details: تفاصيل data/tools (للـ props المطلوبة)"""
+    kb = {"pieces": set(), "actions": set(), "triggers": set(), "required": {}}
+    for p in pieces:
+        pid = p["id"]
+        kb["pieces"].add(pid)
+        kb["actions"].update((pid, a) for a in _names(p.get("actions")))
+        kb["triggers"].update((pid, t) for t in _names(p.get("triggers")))
+    for pid, d in details.items():
+        kb["pieces"].add(pid)
+        for kind in ("actions", "triggers"):
+            entries = d.get(kind) or {}
+            kb[kind].update((pid, n) for n in _names(entries))
+            if isinstance(entries, dict):
+                for name, entry in entries.items():
+                    req = _required(entry.get("props"))
+                    if req:
+                        kb["required"][(pid, fold(name))] = req
+    return kb
+
+# ============================================================
+# 2. التحقق من flow واحد
+# ============================================================
+
+def _list(value):
+    """قائمة أو [] — steps/branches/chain مشوّهة ما توقف التحقق"""
+    return value if isinstance(value, list) else []
+
+
+def step_nodes(flow):
+    """يولّد (location, node, kind) لكل خطوة تستخدم أداة"""
+    trigger = flow.get("trigger")
+    if isinstance(trigger, dict):
+        yield "trigger", trigger, "trigger"
+    for i, s in enumerate(_list(flow.get("steps"))):
+        if not isinstance(s, dict):
+            continue
+        loc = f"steps[{s.get('id', i)}]"
+        yield loc, s, "action"
+        on_error = s.get("on_error")
+        for j, alt in enumerate(_list(on_error.get("chain") if isinstance(on_error, dict) else None)):
+            if isinstance(alt, dict):
+                yield f"{loc}.on_error.chain[{j}]", alt, "fallback"
+    for i, b in enumerate(_list(flow.get("branches"))):
+        if not isinstance(b, dict):
+            continue
+        routes = b.get("routes") or {}
+        items = routes.items() if isinstance(routes, dict) else enumerate(_list(routes))
+        for rname, route in items:
+            if not isinstance(route, dict):
+                continue
+            for j, s in enumerate(_list(route.get("additional_steps") or route.get("steps"))):
+                if isinstance(s, dict):
+                    yield f"branches[{i}].{rname}[{j}]", s, "action"
+
+
+def _is_key(value):
+    """قيم ids/orders/أسماء لازم تكون نص أو رقم (list/dict ما تنفع كمفتاح)"""
+    return isinstance(value, (str, int)) and not isinstance(value, bool)
+
+
+def _step_ids(flow):
+    ids = []
+    for s in _list(flow.get("steps")):
+        if isinstance(s, dict) and _is_key(s.get("id")) and s.get("id") != "":
+            ids.append(s["id"])
+    for b in _list(flow.get("branches")):
+        if not isinstance(b, dict):
+            continue
+        routes = b.get("routes") or {}
+        for route in (routes.values() if isinstance(routes, dict) else _list(routes)):
+            if not isinstance(route, dict):
+                continue
+            for s in _list(route.get("additional_steps") or route.get("steps")):
+                if isinstance(s, dict) and _is_key(s.get("id")) and s.get("id") != "":
+                    ids.append(s["id"])
+    return ids
+
+
+def _route_values(step, field):
+    """قيم output.<field> المسموحة ("hot|warm|cold") أو None لو مو enum"""
+    output = step.get("output") if isinstance(step, dict) else None
+    value = output.get(field) if isinstance(output, dict) and _is_key(field) else None
+    if not isinstance(value, str) or "|" not in value:
+        return None
+    return set(value.split("|"))
+
+
+def check_flow(flow, kb, text=None):
+    """يرجع [(rule, message)] — text: نص الـ JSON لو متوفر (يوفّر json.dumps)"""
+    problems = []
+    pieces = kb["pieces"]
+    actions = kb["actions"]
+    triggers = kb["triggers"]
+    required = kb["required"]
+
+    for loc, node, kind in step_nodes(flow):
+        pid = node.get("tool_id") or node.get("piece")
+        name = node.get("action") or node.get("name")
+        if not pid:
+            continue
+        if not isinstance(pid, str) or (name and not isinstance(name, str)):
+            problems.append(("bad_field_type", f"{loc}: tool_id/action لازم يكونوا نص"))
+            continue
+        key = resolve(pid, name)
+        if key[0] not in pieces:
+            problems.append(("unknown_piece", f"{loc}: '{pid}' غير موجود في السجل"))
+            continue
+        if not name:
+            continue
+        if kind == "trigger":
+            if key not in triggers:
+                problems.append(("unknown_trigger", f"{loc}: trigger '{name}' غير موجود في {pid}"))
+                continue
+        elif key not in actions:
+            problems.append(("unknown_action", f"{loc}: action '{name}' غير موجود في {pid}"))
+            continue
+        req = required.get(key)
+        if req and kind != "fallback":
+            given = {fold(k) for field in ("config", "input_mapping", "props")
+                     for k in (node.get(field) if isinstance(node.get(field), dict) else ()) if isinstance(k, str)}
+            for prop in req:
+                if fold(prop) not in given:
+                    problems.append(("missing_prop", f"{loc}: {pid}.{name} يحتاج '{prop}'"))
+
+    ids = _step_ids(flow)
+    id_set = set(ids)
+    if len(id_set) != len(ids):
+        dups = sorted({i for i in ids if ids.count(i) > 1}, key=str)
+        problems.append(("duplicate_step_id", f"ids مكررة: {', '.join(map(str, dups))}"))
+
+    for field in ("steps", "branches"):
+        if flow.get(field) is not None and not isinstance(flow.get(field), list):
+            problems.append(("bad_field_type", f"{field} لازم تكون قائمة"))
+    steps = [s for s in _list(flow.get("steps")) if isinstance(s, dict)]
+    for s in steps:
+        if "id" in s and not _is_key(s["id"]):
+            problems.append(("bad_field_type", f"steps: id لازم يكون نص — {s['id']!r}"))
+    orders = {s.get("order") for s in steps if _is_key(s.get("order"))}
+    for s in steps:
+        contains = s.get("contains_steps") or []
+        if not isinstance(contains, list):
+            problems.append(("bad_field_type", f"steps[{s.get('id')}]: contains_steps لازم تكون قائمة"))
+            continue
+        for o in contains:
+            if not _is_key(o) or o not in orders:
+                problems.append(("bad_contains_steps", f"steps[{s.get('id')}]: contains_steps {o!r} غير موجود"))
+    steps_by_id = {s.get("id"): s for s in steps if _is_key(s.get("id"))}
+    for i, b in enumerate(_list(flow.get("branches"))):
+        if not isinstance(b, dict):
+            continue
+        after = b.get("after_step")
+        if after and (not _is_key(after) or after not in id_set):
+            problems.append(("bad_after_step", f"branches[{i}]: after_step '{after}' غير موجود"))
+            continue
+        allowed = _route_values(steps_by_id.get(after), b.get("condition_field"))
+        routes = b.get("routes")
+        if allowed and isinstance(routes, dict):
+            for rname in routes:
+                if rname != "default" and rname not in allowed:
+                    problems.append(("bad_branch_route", f"branches[{i}]: المسار '{rname}' مو من قيم "
+                                                         f"{after}.{b.get('condition_field')} ({'|'.join(sorted(allowed))})"))
+
+    if text is None:
+        text = json.dumps(flow)
+    for ref in set(STEP_REF_RE.findall(text)) - id_set:
+        problems.append(("bad_step_ref", f"{{{{step.{ref}...}}}} يشير لخطوة غير موجودة"))
+    return problems
+
+# ============================================================
+# 3. دفعات (للـ process pool)
+# ============================================================
+
+_KB = {}
+
+
+def init_worker(kb):
+    _KB["kb"] = kb
+
+
+def new_report():
+    return {"flows": 0, "failed": 0, "warned": 0, "rules": Counter(), "examples": []}
+
+
+def check_batch(items):
+    """items: [(source, flow_or_json_text)] → report جزئي"""
+    kb = _KB["kb"]
+    report = new_report()
+    for source, raw in items:
+        report["flows"] += 1
+        problems = None
+        text = None
+        if isinstance(raw, str):
+            text = raw
+            try:
+                raw = json.loads(raw)
+            except ValueError as e:
+                problems = [("parse", f"JSON غير صالح: {e}")]
+        if problems is None:
+            problems = check_flow(raw, kb, text) if isinstance(raw, dict) else [("parse", "ليس object")]
+        if problems:
+            rules = {r for r, _ in problems}
+            if rules - WARNING_RULES:
+                report["failed"] += 1
+            else:
+                report["warned"] += 1
+            for rule in rules:
+                report["rules"][rule] += 1
+            if len(report["examples"]) < MAX_EXAMPLES:
+                report["examples"].append({"source": source, "problems": [list(p) for p in problems[:5]]})
+    return report
+
+
+def merge_report(into, part):
+    into["flows"] += part["flows"]
+    into["failed"] += part["failed"]
+    into["warned"] += part["warned"]
+    into["rules"].update(part["rules"])
+    into["examples"].extend(part["examples"][:MAX_EXAMPLES - len(into["examples"])])
+    return into
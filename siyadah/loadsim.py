@@ -0,0 +1,458 @@
+"""
+📈 محاكاة الحِمل (discrete-event) لقوالب data/flows مقابل حدود الخطط
+
+كل flow يتحوّل مرة وحدة (compile_flow) لـ segments تفصلها خطوات delay:
+  customer-journey:   [welcome] —3d→ [followup_1] —4d→ [followup_2] —7d→ [review + update]
+  invoice-collection: [fetch → loop(format → days → reminder → update, كل 3 ثواني) → summary → notify]
+
+  الخطوة  → (رسائل، API calls، AI calls)   whatsapp/gmail send = رسالة | openai = AI | code/delay/loop = محلي
+  branches → احتمال كل route من output الخطوة ("hot|warm|cold" → الثلث لكل قيمة)
+  protection.rate_limit "Max N .../day|hour" → سقف لكل tenant (على عناصر الـ loop لو فيه loop، وإلا على التشغيلات)
+  delay ديناميكي ({{calculated...}}) → عشوائي بين DYNAMIC_DELAY_HOURS
+
+المحاكاة: heap واحد للأحداث (triggers + استكمال بعد كل delay)، يوم بيوم.
+الحصة الشهرية (رسائل + AI) تنحسب مثل billing.useResource: بعد الحد الرسالة تنرفض (blocked).
+اليوم 0 = أحد (بداية الأسبوع السعودي) والساعات بتوقيت الرياض.
+"""
+
+import bisect
+import heapq
+import math
+import random
+import re
+import time
+from collections import Counter
+from itertools import accumulate
+
+DAY = 86400
+HOUR = 3600
+PERIOD_DAYS = 30
+UNITS = {"seconds": 1, "minutes": 60, "hours": HOUR, "days": DAY, "weeks": 7 * DAY}
+
+# نفس جدول الخطط في README (billing.js فيه free = 9999 — قيمة تطوير)
+PLANS = {
+    "free": {"name": "مجاني", "automations": 1, "messages": 50, "ai_calls": 50},
+    "basic": {"name": "أساسي", "automations": 5, "messages": 500, "ai_calls": 500},
+    "advanced": {"name": "متقدم", "automations": 15, "messages": 2000, "ai_calls": 2000},
+    "business": {"name": "أعمال", "automations": -1, "messages": 10000, "ai_calls": 10000},
+}
+# افتراضات السكان: توزيع الخطط + حجم النشاط النسبي لكل خطة
+PLAN_MIX = {"free": 0.5, "basic": 0.3, "advanced": 0.15, "business": 0.05}
+PLAN_SCALE = {"free": 0.3, "basic": 1.0, "advanced": 3.0, "business": 10.0}
+
+# أحداث/يوم لـ tenant حجمه 1 (triggers غير المجدولة) + عناصر الـ loop لكل تشغيل
+EVENT_RATES = {"lead-capture": 6, "customer-journey": 4, "appointment-booking": 5, "complaint-handling": 0.6}
+DEFAULT_EVENT_RATE = 2
+LOOP_ITEMS = {"invoice-collection": 6}
+DEFAULT_LOOP_ITEMS = 5
+DYNAMIC_DELAY_HOURS = (1, 72)
+
+# توزيع الأحداث على ساعات اليوم (الرياض) وأيام الأسبوع (أحد → سبت)
+HOUR_WEIGHTS = (1, 1, 1, 1, 1, 2, 3, 5, 8, 10, 11, 11, 10, 9, 9, 9, 9, 10, 11, 11, 10, 8, 5, 2)
+DAY_WEIGHTS = (1, 1, 1, 1, 1, 0.6, 0.8)
+
+MESSAGE_TOOLS = frozenset(["whatsapp", "gmail", "twilio", "sms", "telegram-customer"])
+AI_TOOLS = frozenset(["openai", "claude", "gemini"])
+LOCAL_TOOLS = frozenset(["code", "delay", "loop", "branch", "router"])
+RATE_LIMIT_RE = re.compile(r"max\s+(\d+)\s+[^/]*/\s*(day|hour)", re.I)
+LOAD_FIELDS = ("executions", "messages", "blocked", "api_calls", "ai_calls", "ai_blocked")
+ZERO = (0, 0, 0)
+
+# ============================================================
+# 1. تحويل الـ flow لـ segments
+# ============================================================
+
+def step_cost(step):
+    """(رسائل، API، AI) لخطوة وحدة"""
+    tool = step.get("tool_id") or ""
+    if tool in LOCAL_TOOLS:
+        return ZERO
+    message = tool in MESSAGE_TOOLS and "send" in (step.get("action") or "")
+    return int(message), 1, int(tool in AI_TOOLS)
+
+
+def _add(a, b):
+    return a[0] + b[0], a[1] + b[1], a[2] + b[2]
+
+
+def _total(steps):
+    out = ZERO
+    for s in steps:
+        out = _add(out, step_cost(s))
+    return out
+
+
+def delay_seconds(step):
+    """ثواني الـ delay — أو None لو ديناميكي"""
+    config = step.get("config") or {}
+    amount = config.get("amount")
+    if not isinstance(amount, (int, float)):
+        return None
+    return amount * UNITS.get(config.get("unit") or "seconds", 1)
+
+
+def rate_limit(flow):
+    """(N، نافذة بالثواني) من protection.rate_limit — أو None"""
+    m = RATE_LIMIT_RE.search(str((flow.get("protection") or {}).get("rate_limit") or ""))
+    if not m:
+        return None
+    return int(m.group(1)), DAY if m.group(2).lower() == "day" else HOUR
+
+
+def _branches(flow, steps_by_id):
+    """{after_step: (cum_weights, [cost لكل route])} — قيم الـ output غير الموجودة في routes = بدون خطوات"""
+    out = {}
+    for b in flow.get("branches") or []:
+        routes = b.get("routes") or {}
+        after = steps_by_id.get(b.get("after_step")) or {}
+        enum = str((after.get("output") or {}).get(b.get("condition_field"), ""))
+        values = enum.split("|") if "|" in enum else list(routes)
+        if not values:
+            continue
+        costs = [_total((routes.get(v) or {}).get("additional_steps") or []) for v in values]
+        out[b["after_step"]] = (list(range(1, len(values) + 1)), costs)
+    return out
+
+
+def compile_flow(flow):
+    """
+    {id, trigger, rate_limit, loop_items, segments}
+      segment: {"units": [unit], "delay": ثواني | None (ديناميكي) — الانتظار قبل الـ segment التالي,
+                "loop": فيه loop (عدد العناصر ينسحب لما يبدأ الـ segment)}
+      unit:    ("steps", cost, branches) | ("loop", cost, branches, spacing)
+    """
+    fid = (flow.get("_meta") or {}).get("id")
+    steps = [s for s in flow.get("steps") or [] if isinstance(s, dict)]
+    by_id = {s.get("id"): s for s in steps}
+    by_order = {s.get("order"): s for s in steps}
+    branches = _branches(flow, by_id)
+    in_loop = {o for s in steps for o in s.get("contains_steps") or []}
+
+    segments = []
+    units = []
+    last_loop = None
+    for s in steps:
+        if s.get("order") in in_loop:
+            continue
+        tool = s.get("tool_id")
+        if tool == "delay":
+            seconds = delay_seconds(s)
+            if last_loop is not None and units and units[-1] is last_loop and seconds is not None and seconds < HOUR:
+                # delay_between_messages: فاصل بين عناصر الـ loop مو segment جديد
+                units[-1] = last_loop = last_loop[:3] + (last_loop[3] + seconds,)
+                continue
+            segments.append({"units": units, "delay": seconds})
+            units = []
+            continue
+        if tool == "loop":
+            body = [by_order[o] for o in s.get("contains_steps") or [] if o in by_order]
+            spacing = sum(delay_seconds(b) or 0 for b in body if b.get("tool_id") == "delay")
+            body_branches = [branches[b.get("id")] for b in body if b.get("id") in branches]
+            last_loop = ("loop", _total(body), body_branches, spacing)
+            units.append(last_loop)
+            continue
+        cost = step_cost(s)
+        extra = [branches[s["id"]]] if s.get("id") in branches else []
+        if units and units[-1][0] == "steps":
+            _, prev, prev_branches = units[-1]
+            units[-1] = ("steps", _add(prev, cost), prev_branches + extra)
+        else:
+            units.append(("steps", cost, extra))
+    segments.append({"units": units, "delay": None})
+    for seg in segments:
+        seg["loop"] = any(u[0] == "loop" for u in seg["units"])
+
+    trigger = flow.get("trigger") or {}
+    return {
+        "id": fid,
+        "trigger": trigger.get("tool_id"),
+        "schedule": (trigger.get("action"), trigger.get("config") or {}) if trigger.get("tool_id") == "schedule" else None,
+        "event_rate": EVENT_RATES.get(fid, DEFAULT_EVENT_RATE),
+        "loop_items": LOOP_ITEMS.get(fid, DEFAULT_LOOP_ITEMS),
+        "has_loop": any(seg["loop"] for seg in segments),
+        "rate_limit": rate_limit(flow),
+        "segments": segments,
+    }
+
+
+def describe(model):
+    """سطر لكل segment — للعرض"""
+    lines = []
+    for i, seg in enumerate(model["segments"]):
+        parts = []
+        for unit in seg["units"]:
+            m, a, ai = unit[1]
+            text = f"{m} رسالة، {a} API، {ai} AI"
+            if unit[2]:
+                text += f" + {len(unit[2])} branch"
+            parts.append(f"loop[{text}، كل {unit[3]:g}s]" if unit[0] == "loop" else text)
+        wait = seg["delay"]
+        nxt = "" if i == len(model["segments"]) - 1 else (" —ديناميكي→" if wait is None else f" —{_duration(wait)}→")
+        lines.append(f"[{' | '.join(parts) or '-'}]{nxt}")
+    return lines
+
+
+def _duration(seconds):
+    for unit, size in (("d", DAY), ("h", HOUR), ("m", 60)):
+        if seconds >= size and seconds % size == 0:
+            return f"{seconds // size:g}{unit}"
+    return f"{seconds:g}s"
+
+# ============================================================
+# 2. السكان
+# ============================================================
+
+def make_population(n, models, mix=None, seed=7, plans=None):
+    """[{"plan", "scale", "flows": [index في models]}] — الخطة تحدد عدد الأتمتات المفعّلة"""
+    plans = plans or PLANS
+    mix = mix or PLAN_MIX
+    rnd = random.Random(seed)
+    names = [p for p in mix if p in plans]
+    weights = [mix[p] for p in names]
+    tenants = []
+    for _ in range(n):
+        plan = rnd.choices(names, weights)[0]
+        limit = plans[plan]["automations"]
+        flows = list(range(len(models)))
+        if 0 <= limit < len(flows):
+            flows = sorted(rnd.sample(flows, limit))
+        tenants.append({"plan": plan, "scale": PLAN_SCALE.get(plan, 1.0) * rnd.lognormvariate(0, 0.5),
+                        "flows": flows})
+    return tenants
+
+
+def _poisson(rnd, lam):
+    if lam <= 0:
+        return 0
+    if lam > 30:
+        return max(0, int(rnd.gauss(lam, math.sqrt(lam)) + 0.5))
+    limit = math.exp(-lam)
+    k = 0
+    p = rnd.random()
+    while p > limit:
+        k += 1
+        p *= rnd.random()
+    return k
+
+
+def _scheduled(model, day):
+    """ثانية التشغيل في اليوم — أو None لو ما يشتغل اليوم"""
+    action, config = model["schedule"]
+    at = config.get("hour", 9) * HOUR + config.get("minute", 0) * 60
+    if action == "every_week" and day % 7 != config.get("day_of_week", 0):
+        return None
+    return at
+
+# ============================================================
+# 3. المحاكاة
+# ============================================================
+
+def simulate(models, tenants, days=30, seed=7, plans=None, period_days=PERIOD_DAYS):
+    """
+    يرجع {"load": {field: [لكل ساعة]}, "plans": {...}, "flows": {...}, "events", "executions", "seconds"}
+    """
+    plans = plans or PLANS
+    rnd = random.Random(seed)
+    random_ = rnd.random
+    hours = days * 24
+    horizon = days * DAY
+    period = period_days * DAY
+    load = {f: [0] * hours for f in LOAD_FIELDS}
+    executions, sent, blocked, api_calls, ai_calls, ai_blocked = (load[f] for f in LOAD_FIELDS)
+    hour_cum = list(accumulate(HOUR_WEIGHTS))
+    hour_range = range(24)
+
+    quotas = [(plans[t["plan"]]["messages"], plans[t["plan"]]["ai_calls"]) for t in tenants]
+    usage = [[0, 0, -1] for _ in tenants]          # رسائل، AI، رقم الفترة
+    exhausted = {p: {"messages": [], "ai_calls": []} for p in plans}
+    flow_stats = {m["id"]: Counter() for m in models}
+    limits = {}
+
+    def spend(ti, cost, t):
+        """يسجّل الحِمل ويطبّق الحصة — يرجع الرسائل اللي انرسلت فعلاً"""
+        msgs, api, ai = cost
+        h = int(t // HOUR)
+        u = usage[ti]
+        p = int(t // period)
+        if u[2] != p:
+            u[0] = u[1] = 0
+            u[2] = p
+        q_msgs, q_ai = quotas[ti]
+        denied = 0
+        ok_msgs = msgs
+        if msgs:
+            ok = ok_msgs = msgs if q_msgs < 0 else min(msgs, max(0, q_msgs - u[0]))
+            if ok < msgs:
+                blocked[h] += msgs - ok
+                denied += msgs - ok
+            if ok:
+                if 0 <= q_msgs <= u[0] + ok and u[0] < q_msgs:
+                    exhausted[tenants[ti]["plan"]]["messages"].append(t - p * period)
+                u[0] += ok
+                sent[h] += ok
+        if ai:
+            ok = ai if q_ai < 0 else min(ai, max(0, q_ai - u[1]))
+            if ok < ai:
+                ai_blocked[h] += ai - ok
+                denied += ai - ok
+            if ok:
+                if 0 <= q_ai <= u[1] + ok and u[1] < q_ai:
+                    exhausted[tenants[ti]["plan"]]["ai_calls"].append(t - p * period)
+                u[1] += ok
+                ai_calls[h] += ok
+        api_calls[h] += api - denied
+        return ok_msgs
+
+    def branch_cost(branches):
+        cost = ZERO
+        for cum, costs in branches:
+            cost = _add(cost, costs[bisect.bisect(cum, random_() * cum[-1])])
+        return cost
+
+    def run(ti, model, seg_i, t, items):
+        """يرجع وقت النهاية — أو None لو الـ segment تجاوز نهاية المحاكاة (يُحسب pending)"""
+        stats = flow_stats[model["id"]]
+        for unit in model["segments"][seg_i]["units"]:
+            if t >= horizon:
+                stats["pending"] += 1
+                return None
+            if unit[0] == "steps":
+                cost = _add(unit[1], branch_cost(unit[2])) if unit[2] else unit[1]
+                stats["messages"] += spend(ti, cost, t)
+                continue
+            _, cost, branches, spacing = unit
+            for _ in range(items):
+                if t >= horizon:
+                    stats["pending"] += 1
+                    return None
+                stats["messages"] += spend(ti, _add(cost, branch_cost(branches)) if branches else cost, t)
+                stats["loop_items"] += 1
+                t += spacing
+        return t
+
+    heap = []
+    seq = 0
+    events = 0
+    started = time.perf_counter()
+    for day in range(days):
+        base = day * DAY
+        weight = DAY_WEIGHTS[day % 7]
+        for ti, tenant in enumerate(tenants):
+            scale = tenant["scale"]
+            for mi in tenant["flows"]:
+                model = models[mi]
+                if model["schedule"]:
+                    at = _scheduled(model, day)
+                    if at is not None:
+                        seq += 1
+                        heap.append((base + at, seq, ti, mi, 0))
+                    continue
+                n = _poisson(rnd, model["event_rate"] * scale * weight)
+                if n:
+                    for h in rnd.choices(hour_range, cum_weights=hour_cum, k=n):
+                        seq += 1
+                        heap.append((base + h * HOUR + random_() * HOUR, seq, ti, mi, 0))
+        heapq.heapify(heap)
+
+        end = base + DAY
+        while heap and heap[0][0] < end:
+            t, _, ti, mi, seg_i = heapq.heappop(heap)
+            events += 1
+            model = models[mi]
+            stats = flow_stats[model["id"]]
+            segment = model["segments"][seg_i]
+            limit = model["rate_limit"]
+            if seg_i == 0:
+                if limit and not model["has_loop"]:
+                    key = (ti, mi, int(t // limit[1]))
+                    used = limits.get(key, 0)
+                    if used >= limit[0]:
+                        stats["throttled"] += 1
+                        continue
+                    limits[key] = used + 1
+                stats["executions"] += 1
+                executions[int(t // HOUR)] += 1
+            items = 0
+            if segment["loop"]:
+                # الـ loop ممكن يجي بعد delay — العناصر والـ rate limit وقت تشغيله
+                items = _poisson(rnd, model["loop_items"] * tenants[ti]["scale"])
+                if limit:
+                    key = (ti, mi, int(t // limit[1]))
+                    used = limits.get(key, 0)
+                    allowed = min(items, max(0, limit[0] - used))
+                    stats["throttled"] += items - allowed
+                    items = allowed
+                    limits[key] = used + allowed
+            t = run(ti, model, seg_i, t, items)
+            if t is None:
+                continue
+            if seg_i + 1 < len(model["segments"]):
+                wait = segment["delay"]
+                if wait is None:
+                    wait = rnd.uniform(*DYNAMIC_DELAY_HOURS) * HOUR
+                if t + wait < horizon:
+                    seq += 1
+                    heapq.heappush(heap, (t + wait, seq, ti, mi, seg_i + 1))
+                else:
+                    flow_stats[model["id"]]["pending"] += 1
+        limits.clear()
+
+    for t, _, ti, mi, _ in heap:
+        flow_stats[models[mi]["id"]]["pending"] += 1
+
+    return {
+        "load": load,
+        "plans": plan_summary(tenants, usage, exhausted, plans, days, period_days),
+        "flows": {fid: dict(c) for fid, c in flow_stats.items()},
+        "events": events,
+        "executions": sum(executions),
+        "seconds": time.perf_counter() - started,
+    }
+
+# ============================================================
+# 4. التقارير
+# ============================================================
+
+def _percentile(values, q):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def plan_summary(tenants, usage, exhausted, plans, days, period_days=PERIOD_DAYS):
+    """لكل خطة: كم tenant وصل الحد ومتى (أيام من بداية الفترة)"""
+    counts = Counter(t["plan"] for t in tenants)
+    periods = max(1, math.ceil(days / period_days))
+    out = {}
+    for plan, spec in plans.items():
+        if not counts[plan]:
+            continue
+        row = {"tenants": counts[plan], "messages_quota": spec["messages"], "ai_quota": spec["ai_calls"]}
+        for field in ("messages", "ai_calls"):
+            hits = [s / DAY for s in exhausted[plan][field]]
+            row[field] = {
+                "exhausted": len(hits),
+                "exhausted_pct": round(100 * len(hits) / (counts[plan] * periods), 1),
+                "first_day": round(min(hits), 2) if hits else None,
+                "median_day": round(_percentile(hits, 0.5), 2) if hits else None,
+                "p10_day": round(_percentile(hits, 0.1), 2) if hits else None,
+            }
+        out[plan] = row
+    return out
+
+
+def hourly_profile(series, days):
+    """متوسط كل ساعة من اليوم (0..23)"""
+    out = [0.0] * 24
+    for h, v in enumerate(series):
+        out[h % 24] += v
+    return [v / max(days, 1) for v in out]
+
+
+def peak(series):
+    """(الساعة، القيمة، p95)"""
+    if not series:
+        return 0, 0, 0
+    h = max(range(len(series)), key=series.__getitem__)
+    return h, series[h], _percentile(series, 0.95)
@@ -0,0 +1,163 @@
+"""
+✉️ قوالب الرسائل المُجمّعة + رندر جماعي
+
+كل قالب في data/templates/messages/*.json يتحول إلى:
+  segments (نصوص ثابتة) + keys (متغيرات بالترتيب)
+
+الرندر الجماعي:
+  1. متغيرات الشركة/السياق (shared) تنطوي داخل النص الثابت مرة وحدة للدفعة
+  2. اللي يبقى متغيرات الصف فقط → صيغة % جاهزة + itemgetter
+  3. كل صف = عملية تنسيق وحدة، مع فحص max_length
+"""
+
+from operator import itemgetter
+
+from siyadah import placeholders
+
+TRUNCATE_MARK = "…"
+MISSING = (None, "")
+
+# ============================================================
+# 1. التجميع + التحقق من variables_used
+# ============================================================
+
+def compile_template(tmpl, where="?"):
+    """يرجع (compiled, errors[], warnings[])"""
+    errors = []
+    warnings = []
+    text = tmpl.get("text", "")
+    segments, keys = placeholders.split(text)
+
+    declared = tmpl.get("variables_used")
+    if declared is None:
+        warnings.append(f"[{where}] بدون variables_used")
+    else:
+        in_text = set(keys)
+        for k in sorted(in_text - set(declared)):
+            errors.append(f"[{where}] {{{{{k}}}}} مستخدم في النص وغير مذكور في variables_used")
+        for k in sorted(set(declared) - in_text):
+            warnings.append(f"[{where}] '{k}' في variables_used لكن غير موجود في النص")
+
+    max_length = tmpl.get("max_length")
+    if max_length and len("".join(segments)) > max_length:
+        errors.append(f"[{where}] النص الثابت وحده ({len(''.join(segments))}) أطول من max_length ({max_length})")
+
+    compiled = {
+        "id": tmpl.get("id", where),
+        "channel": tmpl.get("channel"),
+        "segments": segments,
+        "keys": keys,
+        "max_length": max_length,
+    }
+    return compiled, errors, warnings
+
+
+def compile_messages(messages):
+    """{industry: {name: compiled}} + errors + warnings لكل ملفات الصناعات"""
+    compiled = {}
+    errors = []
+    warnings = []
+    for industry, templates in messages.items():
+        compiled[industry] = {}
+        for name, tmpl in templates.items():
+            c, errs, warns = compile_template(tmpl, f"{industry}.{name}")
+            compiled[industry][name] = c
+            errors.extend(errs)
+            warnings.extend(warns)
+    return compiled, errors, warnings
+
+# ============================================================
+# 2. الرندر
+# ============================================================
+
+def render(compiled, values, fallbacks=None):
+    """رندر رسالة وحدة — values بمفاتيح المتغيرات الكاملة"""
+    fallbacks = fallbacks or {}
+    segments = compiled["segments"]
+    out = [segments[0]]
+    for i, key in enumerate(compiled["keys"]):
+        value = values.get(key)
+        if value is None or value == "":
+            value = fallbacks.get(key, "")
+        out.append(str(value))
+        out.append(segments[i + 1])
+    return "".join(out)
+
+
+def _plan(compiled, shared, columns, fallbacks):
+    """
+    يطوي المتغيرات المشتركة داخل النص ويرجع (fmt, row_columns)
+    columns: {"invoice.amount": "المبلغ", ...} — من مفتاح المتغير لعمود الصف
+    """
+    parts = [compiled["segments"][0].replace("%", "%%")]
+    row_columns = []
+    for i, key in enumerate(compiled["keys"]):
+        if key in shared:
+            value = shared[key]
+            if value is None or value == "":
+                value = fallbacks.get(key, "")
+            parts.append(str(value).replace("%", "%%"))
+        else:
+            parts.append("%s")
+            row_columns.append(columns.get(key, key))
+        parts.append(compiled["segments"][i + 1].replace("%", "%%"))
+    return "".join(parts), row_columns
+
+
+def render_batch(compiled, rows, shared=None, columns=None, fallbacks=None, on_overflow="truncate"):
+    """
+    يرندر قالب واحد على كل الصفوف في استدعاء واحد.
+
+    rows:        قائمة dicts (صفوف الشيت)
+    shared:      متغيرات ثابتة للدفعة كلها (company.*, context.*)
+    columns:     ربط مفتاح المتغير → اسم العمود في الصف
+    fallbacks:   قيم بديلة للأعمدة الناقصة أو الفاضية (None / "") — مثل customer.name → "عميلنا الكريم"
+    on_overflow: truncate | skip | keep — لما الرسالة تتجاوز max_length
+
+    يرجع (messages[], violations[]) — violations: (row_index, template_id, length)
+    messages بنفس ترتيب rows وطولها؛ مع on_overflow="skip" الرسالة الطويلة = None مكانها.
+    """
+    shared = shared or {}
+    columns = columns or {}
+    fallbacks = fallbacks or {}
+    fmt, row_columns = _plan(compiled, shared, columns, fallbacks)
+    max_length = compiled.get("max_length") or 0
+    template_id = compiled["id"]
+
+    if not row_columns:
+        getter = lambda row: ()
+    elif len(row_columns) == 1:
+        col = row_columns[0]
+        getter = lambda row: (row[col],)
+    else:
+        getter = itemgetter(*row_columns)
+
+    col_fallbacks = {}
+    for key in compiled["keys"]:
+        if key not in shared:
+            col_fallbacks[columns.get(key, key)] = fallbacks.get(key, "")
+
+    messages = []
+    violations = []
+    append = messages.append
+    for i, row in enumerate(rows):
+        try:
+            values = getter(row)
+        except KeyError:
+            values = None
+        if values is None or None in values or "" in values:
+            values = tuple(col_fallbacks[c] if row.get(c) in MISSING else row[c] for c in row_columns)
+        text = fmt % values
+        if max_length and len(text) > max_length:
+            violations.append((i, template_id, len(text)))
+            if on_overflow == "truncate":
+                text = text[:max_length - len(TRUNCATE_MARK)] + TRUNCATE_MARK
+            elif on_overflow == "skip":
+                text = None
+        append(text)
+    return messages, violations
+
+
+def catalog_fallbacks(catalog):
+    """{key: fallback} من data/variables (مثل customer.name → عميلنا الكريم)"""
+    return {k: v["fallback"] for k, v in catalog.items() if "fallback" in v}
@@ -0,0 +1,46 @@
+"""
+⚙️ تشغيل متوازي بذاكرة محدودة
+
+ProcessPoolExecutor.map يسحب كل المهام مقدماً — مع ملفات بالـ GB هذا يعني
+كل البيانات في الذاكرة. bounded_map يبقي عدد محدود من المهام معلّقة.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+
+def chunked(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def bounded_map(fn, items, workers=None, initializer=None, initargs=(), max_pending=None):
+    """
+    يولّد fn(item) لكل item (بترتيب الانتهاء، مو بترتيب الإدخال).
+    workers=1 → نفس العملية بدون pool (أسهل للتتبع والقياس).
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        if initializer:
+            initializer(*initargs)
+        for item in items:
+            yield fn(item)
+        return
+
+    max_pending = max_pending or workers * 2
+    with ProcessPoolExecutor(workers, initializer=initializer, initargs=initargs) as pool:
+        pending = set()
+        for item in items:
+            pending.add(pool.submit(fn, item))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+        for fut in pending:
+            yield fut.result()
@@ -0,0 +1,139 @@
+"""
+📱 تطبيع أرقام الجوال (السعودية + الخليج) → E.164
+
+  "٠٥٠ ١٢٣ ٤٥٦٧" | "0501234567" | "501234567" | "966501234567" | "00966 50 123 4567" | "+966 050..."
+      → ("+966501234567", True, "SA", "mobile")
+
+نفس مخرجات خطوة format_phone في الـ flows (formatted_phone + is_valid) بدون خطوة لكل عميل:
+  normalize_phone(value)           — رقم واحد (lru_cache: الأرقام المكررة ما تنحسب مرتين)
+  normalize_column(values)         — عمود كامل: القيم الفريدة تنحسب مرة وحدة + تقرير
+
+النتيجة: (formatted, is_valid, country, kind)
+  kind: mobile | landline — أو سبب الرفض: empty | not_gcc | bad_format
+  الرقم غير الصالح يرجع بأفضل صيغة ممكنة (مثل الـ JS) عشان ما يضيع من الشيت.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+from siyadah import arabic
+
+DEFAULT_COUNTRY = "SA"
+CACHE_SIZE = 1 << 17
+
+# code: مفتاح الدولة | trunk: الصفر المحلي | mobile/landline: الرقم المحلي بعد المفتاح
+COUNTRIES = {
+    "SA": {"code": "966", "trunk": "0", "mobile": r"5\d{8}", "landline": r"1[1-7]\d{7}"},
+    "AE": {"code": "971", "trunk": "0", "mobile": r"5[024568]\d{7}", "landline": r"[2-79]\d{7}"},
+    "KW": {"code": "965", "trunk": "", "mobile": r"[569]\d{7}", "landline": r"2\d{7}"},
+    "QA": {"code": "974", "trunk": "", "mobile": r"[3567]\d{7}", "landline": r"4\d{7}"},
+    "BH": {"code": "973", "trunk": "", "mobile": r"[36]\d{7}", "landline": r"1\d{7}"},
+    "OM": {"code": "968", "trunk": "", "mobile": r"[79]\d{7}", "landline": r"2\d{7}"},
+}
+RULES = {iso: (c["code"], c["trunk"], re.compile(c["mobile"]), re.compile(c["landline"]))
+         for iso, c in COUNTRIES.items()}
+BY_CODE = {c["code"]: iso for iso, c in COUNTRIES.items()}
+
+# الأرقام الهندية → لاتينية، والفواصل الشائعة تنشال (مسافات، -، أقواس، نقاط، محارف الاتجاه)
+SEPARATORS = " \u00a0\t-\u2013\u2014()./\u200e\u200f\u202a\u202c\u2066\u2069"
+PHONE_TABLE = str.maketrans({**arabic.DIGITS, **dict.fromkeys(SEPARATORS)})
+NON_DIGIT_RE = re.compile(r"\D")
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _national(iso, nsn):
+    """(kind, nsn) لو الرقم المحلي صالح للدولة — يشيل صفر الـ trunk لو موجود"""
+    _, trunk, mobile, landline = RULES[iso]
+    if trunk and nsn.startswith(trunk):
+        nsn = nsn[len(trunk):]
+    if mobile.fullmatch(nsn):
+        return "mobile", nsn
+    if landline.fullmatch(nsn):
+        return "landline", nsn
+    return None, nsn
+
+
+def _international(digits):
+    """(iso, kind, nsn) من رقم يبدأ بمفتاح الدولة — iso = None لو مو خليجي"""
+    iso = BY_CODE.get(digits[:3])
+    if iso is None:
+        return None, None, digits
+    kind, nsn = _national(iso, digits[3:])
+    return iso, kind, nsn
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _normalize(text, country):
+    cleaned = text.translate(PHONE_TABLE).strip()
+    plus = cleaned.startswith("+")
+    digits = NON_DIGIT_RE.sub("", cleaned)
+    if not digits:
+        return "", False, None, "empty"
+
+    if plus or digits.startswith("00"):
+        digits = digits if plus else digits[2:]
+        iso, kind, nsn = _international(digits)
+        if iso is None:
+            return "+" + digits, False, None, "not_gcc"
+        if kind is None:
+            return "+" + RULES[iso][0] + nsn, False, iso, "bad_format"
+        return "+" + RULES[iso][0] + nsn, True, iso, kind
+
+    kind, nsn = _national(country, digits)
+    if kind is not None:
+        return "+" + RULES[country][0] + nsn, True, country, kind
+    iso, kind, intl_nsn = _international(digits)
+    if kind is not None:
+        return "+" + RULES[iso][0] + intl_nsn, True, iso, kind
+    return digits, False, country, "bad_format"
+
+
+def normalize_phone(value, country=DEFAULT_COUNTRY):
+    """(formatted, is_valid, country, kind|reason) — country: الدولة الافتراضية للأرقام المحلية"""
+    return _normalize(_text(value), country)
+
+
+def cache_info():
+    return _normalize.cache_info()
+
+# ============================================================
+# عمود كامل
+# ============================================================
+
+def new_report():
+    return {"rows": 0, "unique": 0, "valid": 0, "kinds": Counter(), "countries": Counter(),
+            "invalid": Counter(), "changed": 0}
+
+
+def normalize_column(values, country=DEFAULT_COUNTRY, report=None):
+    """
+    يرجع (formatted[], valid[], report) — بنفس ترتيب values
+    القيم الفريدة تنحسب مرة وحدة للعمود (والكاش يشيلها عبر الأعمدة/الدفعات).
+    """
+    report = report or new_report()
+    counts = Counter(values)
+    results = {v: _normalize(_text(v), country) for v in counts}
+    formatted = [results[v][0] for v in values]
+    valid = [results[v][1] for v in values]
+
+    for value, (phone, ok, iso, kind) in results.items():
+        n = counts[value]
+        if ok:
+            report["kinds"][kind] += n
+            report["countries"][iso] += n
+            report["valid"] += n
+        else:
+            report["invalid"][kind] += n
+        if phone != value:
+            report["changed"] += n
+    report["rows"] += len(formatted)
+    report["unique"] += len(results)
+    return formatted, valid, report
@@ -0,0 +1,64 @@
+"""
+🧩 تحليل المتغيرات {{category.variable}}
+
+نفس التصنيف اللي في tests/test-templates.js:
+  - catalog: company/customer/context/ai  ← لازم تكون معرّفة في data/variables
+  - entity:  appointment/invoice/...      ← بيانات الحدث نفسه (مسموحة)
+  - runtime: trigger/step/loop/...        ← يحلّها ActivePieces وقت التشغيل
+"""
+
+import re
+
+# {{a.b}} و {{templates.welcome.{company.industry}}} (مستوى تداخل واحد)
+PLACEHOLDER_RE = re.compile(r"\{\{((?:[^{}]|\{[^{}]*\})*)\}\}")
+NESTED_RE = re.compile(r"\{([^{}]+)\}")
+SIMPLE_KEY_RE = re.compile(r"^[\w؀-ۿ]+(\.[\w؀-ۿ]+)*$")
+
+CATALOG_CATEGORIES = ("company", "customer", "context", "ai")
+ENTITY_CATEGORIES = ("appointment", "invoice", "complaint", "order", "project", "stats")
+RUNTIME_ROOTS = ("trigger", "step", "loop", "body", "calculated", "templates")
+
+
+def split(text):
+    """يقسم النص → (segments, keys) حيث len(segments) == len(keys) + 1"""
+    segments = []
+    keys = []
+    pos = 0
+    for m in PLACEHOLDER_RE.finditer(text):
+        segments.append(text[pos:m.start()])
+        keys.append(m.group(1).strip())
+        pos = m.end()
+    segments.append(text[pos:])
+    return segments, keys
+
+
+def has_placeholders(text):
+    return isinstance(text, str) and "{{" in text and PLACEHOLDER_RE.search(text) is not None
+
+
+def classify(key):
+    """يرجع نوع المتغير: catalog | entity | runtime | expr | unknown"""
+    if not SIMPLE_KEY_RE.match(key):
+        # تعابير: a || b ، a + 1 ، lookup(x) ، templates.x.{y}
+        return "runtime" if key.split(".", 1)[0] == "templates" else "expr"
+    root = key.split(".", 1)[0]
+    if root in CATALOG_CATEGORIES:
+        return "catalog"
+    if root in ENTITY_CATEGORIES:
+        return "entity"
+    if root in RUNTIME_ROOTS:
+        return "runtime"
+    return "unknown"
+
+
+def check_keys(keys, catalog, where):
+    """يرجع (errors[], warnings[]) لمتغيرات غير معرّفة"""
+    errors = []
+    warnings = []
+    for key in keys:
+        kind = classify(key)
+        if kind == "catalog" and key not in catalog:
+            errors.append(f"[{where}] متغير غير معرّف في data/variables: {{{{{key}}}}}")
+        elif kind == "unknown":
+            warnings.append(f"[{where}] متغير بفئة غير معروفة: {{{{{key}}}}}")
+    return errors, warnings
@@ -0,0 +1,185 @@
+"""
+📏 قياس أداء أدوات السجل (build-registry.py / add-piece.py) على أحجام كبيرة
+
+شجرة اصطناعية مؤقتة: data/registry/pieces/{id}.json + data/flows/*.json
+بنفس الصيغة اللي يتحقق منها validate_piece. السكربتات تستخدم مسارات نسبية،
+فالقياس يصير بعد chdir لجذر الشجرة المؤقتة.
+
+لكل مرحلة: الزمن (أفضل N تكرار) + ذروة الذاكرة (tracemalloc في تشغيل منفصل،
+عشان ما يأثر على الزمن).
+"""
+
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import random
+import time
+import tracemalloc
+
+from siyadah.data import ROOT
+
+STAGES = ("load_all_pieces", "check_flow_compatibility", "build_registry", "cmd_list")
+CATEGORIES = (
+    "A_essential", "B_google", "C_communication", "D_ai", "E_crm", "F_ecommerce", "G_productivity",
+    "H_marketing", "I_content", "J_database", "K_dev", "L_microsoft", "M_finance",
+)
+AUTH_TYPES = ("none", "oauth2", "secret_text", "basic_auth", "custom")
+VERBS = ("send", "create", "update", "get", "find", "delete", "list", "add", "upload", "search")
+NOUNS = ("message", "row", "contact", "invoice", "file", "event", "task", "order", "record", "comment")
+
+# فرق زمن أقل من هذا ما يُحسب تراجع (ضجيج القياس)
+MIN_SECONDS = 0.005
+MIN_PEAK_KB = 64
+
+
+def load_script(filename):
+    """يحمّل سكربت بالجذر (اسمه فيه -) كموديول"""
+    spec = importlib.util.spec_from_file_location(filename[:-3].replace("-", "_"), os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# ============================================================
+# 1. الشجرة الاصطناعية
+# ============================================================
+
+def make_piece(i, rnd):
+    pid = f"synthetic-{i:05d}"
+    actions = [{"name": f"{v}_{n}", "display_name": f"{v.title()} {n.title()}",
+                "description": f"{v} a {n}"}
+               for v, n in rnd.sample([(v, n) for v in VERBS for n in NOUNS], rnd.randint(2, 12))]
+    triggers = [{"name": f"new_{n}", "display_name": f"New {n.title()}", "type": rnd.choice(("instant", "scheduled"))}
+                for n in rnd.sample(NOUNS, rnd.randint(0, 3))]
+    return {
+        "id": pid,
+        "package": f"@activepieces/piece-{pid}",
+        "display_name": f"Synthetic {i}",
+        "display_name_ar": f"أداة {i}",
+        "description": "Synthetic piece for registry benchmarks",
+        "logo_url": f"https://cdn.activepieces.com/pieces/{pid}.png",
+        "category": rnd.choice(CATEGORIES),
+        "auth_type": rnd.choice(AUTH_TYPES),
+        "_source": f"https://www.activepieces.com/pieces/{pid}",
+        "_verified": rnd.random() < 0.5,
+        "_verified_date": None,
+        "actions": actions,
+        "triggers": triggers,
+    }
+
+
+def make_flow(i, piece_ids, rnd):
+    steps = [{"order": s + 1, "id": f"step_{s + 1}", "tool_id": rnd.choice(piece_ids), "action": "send_message"}
+             for s in range(rnd.randint(3, 10))]
+    return {
+        "_meta": {"id": f"synthetic-flow-{i}"},
+        "trigger": {"tool_id": rnd.choice(piece_ids), "action": "new_row"},
+        "steps": steps,
+        "branches": [{"after_step": steps[0]["id"], "routes": {
+            "yes": {"additional_steps": [{"tool_id": rnd.choice(piece_ids), "action": "send_message"}]}}}],
+        "required_connections": rnd.sample(piece_ids, min(3, len(piece_ids))),
+    }
+
+
+def generate_tree(root, n_pieces, n_flows=None, seed=11):
+    """يكتب شجرة data/ اصطناعية ويرجع عدد الـ flows"""
+    rnd = random.Random(seed)
+    pieces_dir = os.path.join(root, "data", "registry", "pieces")
+    flows_dir = os.path.join(root, "data", "flows")
+    os.makedirs(pieces_dir, exist_ok=True)
+    os.makedirs(flows_dir, exist_ok=True)
+    ids = []
+    for i in range(n_pieces):
+        piece = make_piece(i, rnd)
+        ids.append(piece["id"])
+        with open(os.path.join(pieces_dir, piece["id"] + ".json"), "w", encoding="utf-8") as f:
+            json.dump(piece, f, ensure_ascii=False, indent=2)
+    n_flows = n_flows or max(6, n_pieces // 50)
+    for i in range(n_flows):
+        with open(os.path.join(flows_dir, f"synthetic-flow-{i}.json"), "w", encoding="utf-8") as f:
+            json.dump(make_flow(i, ids, rnd), f, ensure_ascii=False, indent=2)
+    return n_flows
+
+# ============================================================
+# 2. القياس
+# ============================================================
+
+def stage_calls(build, add):
+    """{stage: fn} — المدخلات المشتركة تُجهّز مرة وحدة خارج القياس"""
+    pieces, _, _ = build.load_all_pieces()
+    piece_ids = {p["id"] for p in pieces}
+
+    def cmd_list():
+        with contextlib.redirect_stdout(io.StringIO()):
+            add.cmd_list()
+
+    return {
+        "load_all_pieces": build.load_all_pieces,
+        "check_flow_compatibility": lambda: build.check_flow_compatibility(piece_ids),
+        "build_registry": lambda: build.build_registry(list(pieces)),
+        "cmd_list": cmd_list,
+    }
+
+
+def measure(fn, repeat=3):
+    """(أفضل زمن بالثواني، ذروة الذاكرة KB)"""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak / 1024
+
+
+def run_size(root, build, add, repeat=3):
+    """يقيس كل المراحل داخل root — يرجع {stage: {"seconds", "peak_kb"}}"""
+    cwd = os.getcwd()
+    os.chdir(root)
+    try:
+        calls = stage_calls(build, add)
+        results = {}
+        for stage in STAGES:
+            seconds, peak_kb = measure(calls[stage], repeat)
+            results[stage] = {"seconds": round(seconds, 4), "peak_kb": round(peak_kb, 1)}
+        return results
+    finally:
+        os.chdir(cwd)
+
+# ============================================================
+# 3. المقارنة مع الـ baseline
+# ============================================================
+
+def compare(results, baseline, threshold):
+    """
+    يرجع regressions: [(size, stage, metric, old, new)]
+    تراجع = new > old × (1 + threshold) وفوق حد الضجيج.
+    """
+    regressions = []
+    for size, stages in results.items():
+        old_stages = baseline.get("sizes", {}).get(size, {})
+        for stage, metrics in stages.items():
+            old = old_stages.get(stage)
+            if not old:
+                continue
+            for metric, floor in (("seconds", MIN_SECONDS), ("peak_kb", MIN_PEAK_KB)):
+                new_v, old_v = metrics[metric], old.get(metric)
+                if old_v is None:
+                    continue
+                if new_v > old_v * (1 + threshold) and new_v - old_v > floor:
+                    regressions.append((size, stage, metric, old_v, new_v))
+    return regressions
+
+
+def change_label(old, new):
+    """"+35%" — ولو الـ baseline صفر (ما فيه نسبة) الفرق المطلق"""
+    if not old:
+        return f"+{new - old:,} (baseline = 0)"
+    return f"+{new / old - 1:.0%}"
@@ -0,0 +1,222 @@
+"""
+📜 تحليل سجلات تشغيل ActivePieces (JSONL / JSONL.gz) مقابل خريطة الأخطاء
+
+قراءة متدفقة بذاكرة ثابتة:
+  - ملفات كثيرة → كل ملف مهمة مستقلة في الـ process pool
+  - ملف واحد ضخم → القارئ يقطّعه دفعات أسطر، والعمّال يحللون ويصنّفون
+  - عدد المهام المعلّقة محدود (workers × 2) → الذاكرة ما تكبر مع حجم الملف
+
+كل عامل يرجع تجميع جزئي (Counters + أمثلة) والدمج في العملية الرئيسية.
+"""
+
+import gzip
+import json
+import os
+import re
+from collections import Counter
+
+from siyadah.errors import UNKNOWN_CODE, classify_failure, compile_message_patterns
+from siyadah.parallel import bounded_map, chunked
+
+FAILED_STATUSES = {"FAILED", "INTERNAL_ERROR", "TIMEOUT", "QUOTA_EXCEEDED", "MEMORY_LIMIT_EXCEEDED"}
+PIECE_PREFIX = "@activepieces/piece-"
+STATUS_IN_MESSAGE = re.compile(r"\b(?:status(?: code)?|http|error|code)[ :=/]*([45]\d\d)\b", re.IGNORECASE)
+
+BATCH_LINES = 20000
+CACHE_LIMIT = 100000
+TOP_EXAMPLES = 3
+
+# ============================================================
+# 1. استخراج الفشل من سجل واحد
+# ============================================================
+
+def _piece_id(name):
+    if not name:
+        return "?"
+    return name[len(PIECE_PREFIX):] if name.startswith(PIECE_PREFIX) else name
+
+
+def _failed_step(rec):
+    step = rec.get("failedStep")
+    if isinstance(step, dict):
+        return step
+    steps = rec.get("steps")
+    if isinstance(steps, dict):
+        steps = steps.values()
+    for s in steps or []:
+        if isinstance(s, dict) and str(s.get("status", "")).upper() == "FAILED":
+            return s
+    return {}
+
+
+def extract_failure(rec):
+    """يرجع (tenant, flow, piece, http_status, message) أو None لو التشغيل ما فشل"""
+    status = str(rec.get("status", "")).upper()
+    if status and status not in FAILED_STATUSES:
+        return None
+    if not status and not rec.get("error"):
+        return None
+
+    step = _failed_step(rec)
+    error = rec.get("error")
+    if not isinstance(error, dict):
+        error = {"message": error} if error else {}
+
+    piece = step.get("pieceName") or (step.get("settings") or {}).get("pieceName") or rec.get("piece")
+    output = step.get("output")
+    message = (step.get("errorMessage")
+               or (output.get("message") if isinstance(output, dict) else None)
+               or error.get("message") or "")
+    if not isinstance(message, str):
+        message = json.dumps(message, ensure_ascii=False)
+    if not message and status == "TIMEOUT":
+        message = "flow execution timeout"
+
+    http_status = step.get("statusCode") or error.get("statusCode") or rec.get("http_status")
+    if http_status is None and message:
+        m = STATUS_IN_MESSAGE.search(message)
+        if m:
+            http_status = m.group(1)
+    if http_status is not None:
+        try:
+            http_status = int(http_status)
+        except (TypeError, ValueError):
+            http_status = None
+    tenant = rec.get("tenant_id") or rec.get("projectId") or rec.get("project_id") or "?"
+    flow = rec.get("flowId") or rec.get("flow_id") or rec.get("flowDisplayName") or "?"
+    return tenant, flow, _piece_id(piece), http_status, message
+
+# ============================================================
+# 2. التجميع
+# ============================================================
+
+def new_summary():
+    return {
+        "lines": 0,
+        "bad_lines": 0,
+        "failures": 0,
+        "by_code": Counter(),
+        "by_piece": Counter(),
+        "by_tenant": Counter(),
+        "by_piece_code": Counter(),
+        "by_method": Counter(),
+        "auto_fix": Counter(),
+        "examples": {},
+    }
+
+
+def merge_summary(into, part, top=TOP_EXAMPLES):
+    for k in ("lines", "bad_lines", "failures"):
+        into[k] += part[k]
+    for k in ("by_code", "by_piece", "by_tenant", "by_piece_code", "by_method", "auto_fix"):
+        into[k].update(part[k])
+    for code, examples in part["examples"].items():
+        bucket = into["examples"].setdefault(code, [])
+        bucket.extend(examples[:top - len(bucket)])
+    return into
+
+
+_STATE = {}
+
+
+def _init_worker(index, top):
+    _STATE["index"] = index
+    _STATE["matcher"] = compile_message_patterns()
+    _STATE["top"] = top
+
+
+def process_lines(lines):
+    """يحلل دفعة أسطر ويرجع تجميع جزئي"""
+    index = _STATE["index"]
+    matcher = _STATE["matcher"]
+    top = _STATE["top"]
+    summary = new_summary()
+    by_code = summary["by_code"]
+    examples = summary["examples"]
+    cache = {}
+
+    for line in lines:
+        summary["lines"] += 1
+        if not line.strip():
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            summary["bad_lines"] += 1
+            continue
+        failure = extract_failure(rec)
+        if failure is None:
+            continue
+        tenant, flow, piece, http_status, message = failure
+
+        # نفس (حالة, أداة, رسالة) تتكرر كثير في السجلات — نصنّفها مرة وحدة
+        ckey = (http_status, piece, message)
+        hit = cache.get(ckey)
+        if hit is None:
+            if len(cache) >= CACHE_LIMIT:
+                cache.clear()
+            entry, method = classify_failure(index, http_status, piece, message, matcher)
+            hit = cache[ckey] = (entry["code"] if entry else UNKNOWN_CODE,
+                                 entry["auto_fix"] if entry else None, method)
+        code, fix, method = hit
+
+        summary["failures"] += 1
+        by_code[code] += 1
+        summary["by_piece"][piece] += 1
+        summary["by_tenant"][tenant] += 1
+        summary["by_piece_code"][f"{piece}|{code}"] += 1
+        summary["by_method"][method] += 1
+        summary["auto_fix"][fix or "—"] += 1
+        bucket = examples.setdefault(code, [])
+        if len(bucket) < top:
+            bucket.append({"tenant": tenant, "flow": flow, "piece": piece,
+                           "http_status": http_status, "message": message[:300]})
+    return summary
+
+
+def process_file(path):
+    with open_lines(path) as f:
+        return process_lines(f)
+
+
+def process_task(task):
+    """مهمة وحدة: مسار ملف (ملف كامل) أو [أسطر] (دفعة)"""
+    return process_file(task) if isinstance(task, str) else process_lines(task)
+
+# ============================================================
+# 3. القراءة المتدفقة + الـ pool
+# ============================================================
+
+def open_lines(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def _batches(path, size):
+    with open_lines(path) as f:
+        yield from chunked(f, size)
+
+
+def triage(paths, index, workers=None, batch_lines=BATCH_LINES, top=TOP_EXAMPLES):
+    """يرجع summary مدموج لكل الملفات"""
+    workers = workers or os.cpu_count() or 1
+    summary = new_summary()
+
+    # ملفات كثيرة → ملف لكل مهمة؛ وإلا دفعات أسطر (workers=1 دايماً دفعات — ذاكرة ثابتة)
+    if workers > 1 and len(paths) >= workers:
+        tasks = iter(paths)
+    else:
+        tasks = (b for p in paths for b in _batches(p, batch_lines))
+
+    for part in bounded_map(process_task, tasks, workers, initializer=_init_worker, initargs=(index, top)):
+        merge_summary(summary, part, top)
+    return summary
+
+
+def summary_to_json(summary, limit=50):
+    out = {k: summary[k] for k in ("lines", "bad_lines", "failures")}
+    for k in ("by_code", "by_piece", "by_tenant", "by_piece_code", "by_method", "auto_fix"):
+        out[k] = dict(summary[k].most_common(limit))
+    out["examples"] = summary["examples"]
+    return out
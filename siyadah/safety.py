@@ -0,0 +1,129 @@
+"""
+🛡️ فحص الكلمات المحظورة وطول الرسائل (prompts-library.json → banned_words)
+
+الماسح يُبنى مرة وحدة: banned_words بعد التطبيع → Aho-Corasick.
+الفحص على النص بعد التطبيع (تشكيل، همزات، تطويل) والمواقع ترجع للنص الأصلي.
+
+المطابقة بحدود الكلمة مع السوابق العربية (ال، و، ب ...) — عشان "دين"
+ما تطابق "مدينة" لكن تطابق "والدين".
+"""
+
+import re
+
+from siyadah import arabic
+from siyadah.automaton import Automaton
+
+DEFAULT_MAX_CHARS = 500
+MAX_CHARS_RULE = re.compile(r"max\s+(\d+)\s+characters", re.IGNORECASE)
+
+PROCLITICS = frozenset(["", "و", "ف", "ب", "ل", "ك", "ال", "وال", "بال", "فال", "كال", "لل", "ولل"])
+SUFFIXES = frozenset(["", "ه", "ها", "هم", "ي", "ك", "ات", "ين", "ون", "ا"])
+
+# حقول البرومبت اللي ما تنفحص (بيانات وصفية أو قوائم الفحص نفسها)
+SKIP_PROMPT_KEYS = {"id", "purpose", "used_in_flow", "model", "safety_check", "expected_output", "rules"}
+
+
+def max_chars_rule(prompts_doc):
+    """يقرأ "Max 500 characters per message" من safety_rules"""
+    for rule in prompts_doc.get("_meta", {}).get("safety_rules", []):
+        m = MAX_CHARS_RULE.search(rule)
+        if m:
+            return int(m.group(1))
+    return DEFAULT_MAX_CHARS
+
+# ============================================================
+# 1. بناء الماسح
+# ============================================================
+
+def build_scanner(words):
+    """Automaton على الكلمات بعد التطبيع — القيمة = الكلمة الأصلية"""
+    automaton = Automaton()
+    for w in dict.fromkeys(words):
+        norm = arabic.normalize(w).strip()
+        if norm:
+            automaton.add(norm, w)
+    return automaton.build()
+
+
+def _is_whole_word(norm, start, end):
+    i = start
+    while i > 0 and norm[i - 1].isalpha():
+        i -= 1
+    j = end
+    while j < len(norm) and norm[j].isalpha():
+        j += 1
+    return norm[i:start] in PROCLITICS and norm[end:j] in SUFFIXES
+
+
+def scan_text(scanner, text, whole_word=True):
+    """[(start, end, word)] بمواقع النص الأصلي"""
+    norm = arabic.normalize(text)
+    if scanner.screen is None or scanner.screen.search(norm) is None:
+        return []
+    found = []
+    pos = None
+    for s, e, word in scanner.findall(norm):
+        if whole_word and not _is_whole_word(norm, s, e):
+            continue
+        if pos is None:
+            pos = arabic.offsets(text)
+            if len(pos) != len(norm):   # lower() غيّر الطول (نادر) — نرجع مواقع النص المطبّع
+                pos = list(range(len(norm)))
+        found.append((pos[s], pos[e - 1] + 1, word))
+    return found
+
+# ============================================================
+# 2. الفحص الجماعي
+# ============================================================
+
+def scan_batch(scanner, messages, ids=None, max_chars=DEFAULT_MAX_CHARS, whole_word=True):
+    """
+    يفحص دفعة رسائل مُرندرة. يرجع violations:
+      {"id", "kind": banned_word|too_long, "word", "offset", "length"}
+    """
+    normalize = arabic.normalize
+    screen = scanner.screen.search if scanner.screen is not None else None
+    violations = []
+    for i, text in enumerate(messages):
+        if text is None:
+            continue
+        mid = ids[i] if ids is not None else i
+        if max_chars and len(text) > max_chars:
+            violations.append({"id": mid, "kind": "too_long", "length": len(text)})
+        if screen is not None and screen(normalize(text)) is not None:
+            for s, e, word in scan_text(scanner, text, whole_word):
+                violations.append({"id": mid, "kind": "banned_word", "word": word, "offset": s})
+    return violations
+
+
+def _walk_strings(node, path):
+    if isinstance(node, str):
+        yield path, node
+    elif isinstance(node, dict):
+        for k, v in node.items():
+            if k not in SKIP_PROMPT_KEYS:
+                yield from _walk_strings(v, f"{path}.{k}")
+    elif isinstance(node, list):
+        for i, v in enumerate(node):
+            yield from _walk_strings(v, f"{path}[{i}]")
+
+
+def library_texts(messages, prompts_doc):
+    """(template_id, text, is_message) لكل النصوص في data/templates/messages و data/prompts"""
+    for industry, templates in messages.items():
+        for name, tmpl in templates.items():
+            yield tmpl.get("id", f"{industry}.{name}"), tmpl.get("text", ""), True
+    for pid, prompt in prompts_doc.get("prompts", {}).items():
+        for path, text in _walk_strings(prompt, f"prompt:{pid}"):
+            yield path, text, False
+
+
+def scan_library(scanner, messages, prompts_doc, max_chars=DEFAULT_MAX_CHARS):
+    """فحص وقت البناء — يرجع violations بنفس شكل scan_batch"""
+    violations = []
+    for tid, text, is_message in library_texts(messages, prompts_doc):
+        if is_message and max_chars and len(text) > max_chars:
+            violations.append({"id": tid, "kind": "too_long", "length": len(text)})
+        for s, e, word in scan_text(scanner, text):
+            violations.append({"id": tid, "kind": "banned_word", "word": word, "offset": s})
+    return violations
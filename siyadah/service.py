@@ -0,0 +1,196 @@
+"""
+🛰️ خدمة السجل المشتركة — السجل + الـ flows + خريطة الأخطاء في الذاكرة مرة وحدة
+
+كل العمليات تمر على dispatch(state, op, params) — نفس المنطق للـ Unix socket
+(JSON سطر بسطر) وللـ HTTP المحلي (GET /op?param=...).
+
+العمليات:
+  piece     id                     → الأداة (السجل، أو تفاصيل data/tools لو ما فيه سجل)
+  search    q, limit               → أدوات تطابق كل كلمات البحث (بداية الكلمة)
+  category  category               → [[piece, action]] في الفئة
+  validate  piece, action, kind, props → مشاكل الخطوة (نفس قواعد flowcheck)
+  error     status, piece, auth    → أكواد error-map المرشّحة
+  flow      id                     → الـ flow
+  metrics / health
+
+الـ state يُبنى كامل ثم يُبدّل بمرجع واحد — الطلبات الجارية تكمل على القديم.
+"""
+
+import bisect
+import os
+import time
+from collections import Counter, deque
+
+from siyadah import arabic
+from siyadah.data import (ERROR_MAP, FLOWS_DIR, PIECES_DIR, REGISTRY_FILES, TOOLS_DIRS, is_partial_registry,
+                          load_flows, load_json, load_registry, load_tool_details)
+from siyadah.errors import build_error_index, lookup
+from siyadah.flowcheck import build_knowledge, check_flow
+
+WATCHED = [PIECES_DIR, *REGISTRY_FILES, *TOOLS_DIRS, FLOWS_DIR, ERROR_MAP]
+OPS = ("piece", "search", "category", "validate", "error", "flow", "health", "metrics")
+OTHER_OP = "other"
+LATENCY_WINDOW = 2048
+SEARCH_LIMIT = 20
+
+
+class RequestError(Exception):
+    pass
+
+# ============================================================
+# 1. بناء الـ state
+# ============================================================
+
+def _mtime(path):
+    """أحدث mtime للملف أو لمحتوى المجلد (0 لو غير موجود)"""
+    if not os.path.exists(path):
+        return 0
+    if not os.path.isdir(path):
+        return os.path.getmtime(path)
+    latest = os.path.getmtime(path)
+    with os.scandir(path) as it:
+        for entry in it:
+            latest = max(latest, entry.stat().st_mtime)
+    return latest
+
+
+def snapshot(paths=WATCHED):
+    return tuple(_mtime(p) for p in paths)
+
+
+def _search_words(piece):
+    text = " ".join(str(piece.get(k) or "") for k in ("id", "display_name", "display_name_ar", "description"))
+    text += " " + " ".join(a.get("name", "") + " " + (a.get("display_name") or "")
+                           for a in piece.get("actions", []) + piece.get("triggers", []))
+    return set(arabic.normalize(text.replace("_", " ").replace("-", " ")).split())
+
+
+def build_state():
+    t0 = time.perf_counter()
+    stamp = snapshot()
+    registry, source = load_registry()
+    details = load_tool_details()
+    pieces = {p["id"]: p for p in registry}
+
+    words = {}
+    by_category = {}
+    for pid, p in pieces.items():
+        for w in _search_words(p):
+            words.setdefault(w, set()).add(pid)
+        by_category.setdefault(p.get("category") or "?", []).extend([pid, a["name"]] for a in p.get("actions", []))
+
+    error_index = None
+    if os.path.exists(ERROR_MAP):
+        error_index, _, _ = build_error_index(load_json(ERROR_MAP), registry, is_partial_registry(source))
+
+    return {
+        "stamp": stamp,
+        "source": source or "data/tools",
+        "pieces": pieces,
+        "words": words,
+        "vocab": sorted(words),
+        "by_category": by_category,
+        "kb": build_knowledge(registry, details),
+        "flows": load_flows(),
+        "errors": error_index,
+        "loaded_at": time.time(),
+        "load_ms": round((time.perf_counter() - t0) * 1000, 1),
+    }
+
+# ============================================================
+# 2. العمليات
+# ============================================================
+
+def search(state, q, limit=SEARCH_LIMIT):
+    """كل كلمة في البحث لازم تطابق بداية كلمة في الأداة"""
+    vocab = state["vocab"]
+    result = None
+    for term in arabic.normalize(q.replace("_", " ").replace("-", " ")).split():
+        ids = set()
+        i = bisect.bisect_left(vocab, term)
+        while i < len(vocab) and vocab[i].startswith(term):
+            ids |= state["words"][vocab[i]]
+            i += 1
+        result = ids if result is None else result & ids
+        if not result:
+            return []
+    pieces = state["pieces"]
+    return [{"id": pid, "display_name": pieces[pid].get("display_name"), "category": pieces[pid].get("category")}
+            for pid in sorted(result or [])[:limit]]
+
+
+def validate_step(state, params):
+    step = {"id": "step", "tool_id": params.get("piece"), "action": params.get("action"),
+            "props": dict.fromkeys(p for p in (params.get("props") or "").split(",") if p)}
+    flow = {"trigger": step} if params.get("kind") == "trigger" else {"steps": [step]}
+    problems = check_flow(flow, state["kb"])
+    return {"valid": not problems, "problems": [{"rule": r, "message": m} for r, m in problems]}
+
+
+def _required(params, name):
+    value = params.get(name)
+    if not value:
+        raise RequestError(f"'{name}' مطلوب")
+    return value
+
+
+def dispatch(state, op, params):
+    if op == "piece":
+        piece = state["pieces"].get(_required(params, "id"))
+        if piece is None:
+            raise RequestError(f"أداة غير موجودة: {params['id']}")
+        return piece
+    if op == "search":
+        return search(state, _required(params, "q"), int(params.get("limit", SEARCH_LIMIT)))
+    if op == "category":
+        return state["by_category"].get(_required(params, "category"), [])
+    if op == "validate":
+        _required(params, "piece")
+        return validate_step(state, params)
+    if op == "error":
+        if state["errors"] is None:
+            raise RequestError("error-map.json غير موجود")
+        status = params.get("status")
+        return lookup(state["errors"], int(status) if status not in (None, "", "-") else None,
+                      params.get("piece"), params.get("auth"))
+    if op == "flow":
+        flow = state["flows"].get(_required(params, "id"))
+        if flow is None:
+            raise RequestError(f"flow غير موجود: {params['id']}")
+        return flow
+    if op == "health":
+        return {"ok": True, "source": state["source"], "pieces": len(state["pieces"]),
+                "flows": len(state["flows"]), "loaded_at": state["loaded_at"], "load_ms": state["load_ms"]}
+    raise RequestError(f"عملية غير معروفة: {op}")
+
+# ============================================================
+# 3. مقاييس زمن الطلبات
+# ============================================================
+
+class Metrics:
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self.counts = Counter()
+        self.errors = Counter()
+        self.latency = {}
+        self.reloads = 0
+        self.started = time.time()
+
+    def record(self, op, seconds, ok=True):
+        # op من العميل — غير المعروف يتجمع تحت "other" عشان ما تكبر المقاييس بلا حد
+        if op not in OPS:
+            op = OTHER_OP
+        self.counts[op] += 1
+        if not ok:
+            self.errors[op] += 1
+        self.latency.setdefault(op, deque(maxlen=self.window)).append(seconds)
+
+    def report(self):
+        ops = {}
+        for op, samples in self.latency.items():
+            s = sorted(samples)
+            pick = lambda q: round(s[min(len(s) - 1, int(q * len(s)))] * 1e6, 1)
+            ops[op] = {"count": self.counts[op], "errors": self.errors[op],
+                       "p50_us": pick(0.5), "p95_us": pick(0.95), "p99_us": pick(0.99), "max_us": pick(1.0)}
+        return {"uptime_s": round(time.time() - self.started, 1), "reloads": self.reloads,
+                "requests": sum(self.counts.values()), "ops": ops}
@@ -0,0 +1,346 @@
+"""
+📊 إحصائيات الشيتات بالمصفوفات (NumPy)
+
+بدل خطوات الـ code اللي تمشي صف صف:
+  weekly-report      → calculate_stats        (hot/warm/cold + الإيرادات + الفواتير غير المدفوعة)
+  invoice-collection → calculate_days_overdue (أيام التأخير + مستوى التذكير لكل فاتورة داخل loop)
+
+الأعمدة وأنواعها من data/templates/sheets/sheets-config.json:
+  date          → datetime64[D]  (الفاضي/الخاطئ → NaT)
+  number/currency_sar → float64  (الفاضي/الخاطئ → NaN، الأرقام الهندية و"ر.س"/"," تُشال)
+  enum:*        → codes int32 + labels (مطبّعة بـ arabic.normalize)
+  الباقي        → object (نص كما هو)
+
+مستويات التذكير نفس منطق الـ JS: days <= 3 gentle | <= 7 firm | <= 14 urgent | escalation
+"""
+
+import csv
+import json
+import re
+from operator import itemgetter
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from siyadah import arabic
+from siyadah.data import SHEETS_CONFIG, load_json
+
+REMINDER_LEVELS = ("gentle", "firm", "urgent", "escalation")
+REMINDER_BOUNDS = (3, 7, 14)
+LEAD_TYPES = ("hot", "warm", "cold")
+PAID = frozenset(arabic.normalize(s) for s in ("مدفوعة", "مدفوع", "paid"))
+UNPAID = frozenset(arabic.normalize(s) for s in ("غير مدفوعة", "غير مدفوع", "unpaid", "متأخرة", "overdue"))
+
+NUMBER_JUNK_RE = re.compile(r"[^\d.\-]|\.(?!\d)")    # "1,500 ر.س" → "1500" (\d يشمل الأرقام الهندية)
+DATE_RE = re.compile(r"^\d{4}-\d\d-\d\d")
+NAN = float("nan")
+
+COL_NAME = "الاسم"
+COL_TYPE = "النوع"
+COL_SOURCE = "المصدر"
+COL_STATUS = "الحالة"
+COL_DATE = "التاريخ"
+COL_AMOUNT = "المبلغ"
+COL_DUE = "تاريخ_الاستحقاق"
+COL_REMINDERS = "عدد_التذكيرات"
+COL_INVOICE = "رقم_الفاتورة"
+
+
+def require_numpy():
+    if np is None:
+        raise RuntimeError("numpy غير مثبت — pip install numpy")
+
+# ============================================================
+# 1. المخطط (sheets-config)
+# ============================================================
+
+def sheet_schema(sheet, industry=None, config=None):
+    """[(column, type)] — أعمدة base_sheets + industry_extensions[industry]["<sheet>_extra"]"""
+    config = config or load_json(SHEETS_CONFIG)
+    base = config.get("base_sheets", {}).get(sheet)
+    if base is None:
+        raise KeyError(f"شيت غير معروف في sheets-config: {sheet}")
+    columns = list(base.get("columns", []))
+    if industry:
+        for col in config.get("industry_extensions", {}).get(industry, {}).get(f"{sheet}_extra", []):
+            if col not in columns:
+                columns.append(col)
+    types = config.get("column_types", {})
+    return [(col, types.get(col, "text")) for col in columns]
+
+# ============================================================
+# 2. التحويل لأعمدة مصفوفات
+# ============================================================
+
+def _iso_date(value):
+    value = value.strip().replace("/", "-")
+    if not value.isascii():
+        value = value.translate(arabic.DIGITS_TABLE)
+    return value[:10] if DATE_RE.match(value) else "NaT"
+
+
+def _dates(values):
+    """المسار السريع: ISO مباشرة؛ وإلا تنظيف (أرقام هندية، /) والخاطئ → NaT"""
+    try:
+        return np.array([v or "NaT" for v in values], dtype="datetime64[D]")
+    except ValueError:
+        pass
+    cleaned = [_iso_date(v) for v in values]
+    try:
+        return np.array(cleaned, dtype="datetime64[D]")
+    except ValueError:
+        pass
+    out = np.empty(len(cleaned), dtype="datetime64[D]")
+    for i, v in enumerate(cleaned):
+        try:
+            out[i] = np.datetime64(v, "D")
+        except ValueError:
+            out[i] = np.datetime64("NaT")
+    return out
+
+
+def _number(value):
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        return float(NUMBER_JUNK_RE.sub("", value.replace("٫", ".")))
+    except ValueError:
+        return NAN
+
+
+def _numbers(values):
+    """
+    المسار السريع: numpy يحوّل العمود كامل (float() يقبل الأرقام الهندية)؛
+    لو فيه قيمة وحدة فيها عملة/فواصل/فاضية → التنظيف قيمة قيمة
+    """
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        pass
+    return np.array([_number(v) for v in values], dtype=np.float64)
+
+
+def _codes(values):
+    """(codes, labels) — labels مطبّعة؛ القيم اللي تتطابق بعد التطبيع تاخذ نفس الكود"""
+    raw, inverse = np.unique(np.array(values, dtype=str), return_inverse=True)
+    normalized = [arabic.normalize(v.strip()) for v in raw]
+    labels = sorted(set(normalized))
+    position = {label: i for i, label in enumerate(labels)}
+    remap = np.array([position[v] for v in normalized], dtype=np.int32)
+    return remap[inverse.reshape(-1)], np.array(labels, dtype=object)
+
+
+def typed_column(values, col_type):
+    """(array, labels|None)"""
+    if col_type == "date":
+        return _dates(values), None
+    if col_type in ("number", "currency_sar"):
+        return _numbers(values), None
+    if col_type.startswith("enum:"):
+        return _codes(values)
+    return np.array(values, dtype=object), None
+
+
+def build_sheet(raw_columns, schema, name=None, column_types=None):
+    """
+    raw_columns: {column: [str]} → sheet
+    {"name", "rows", "columns": {col: array}, "types", "labels": {col: labels}, "missing", "extra"}
+    column_types: أنواع الأعمدة الإضافية (خارج المخطط) — column_types العامة في sheets-config
+    """
+    require_numpy()
+    types = {**(column_types or {}), **dict(schema)}
+    n = len(next(iter(raw_columns.values()))) if raw_columns else 0
+    sheet = {"name": name, "rows": n, "columns": {}, "types": {}, "labels": {},
+             "missing": [c for c, _ in schema if c not in raw_columns],
+             "extra": [c for c in raw_columns if c not in dict(schema)]}
+    for col, values in raw_columns.items():
+        col_type = types.get(col, "text")
+        sheet["columns"][col], labels = typed_column(values, col_type)
+        sheet["types"][col] = col_type
+        if labels is not None:
+            sheet["labels"][col] = labels
+    return sheet
+
+
+def read_export(path):
+    """
+    {column: [str]} من تصدير الشيت:
+      .csv            → أول سطر هو الأعمدة
+      .json / .jsonl  → صفوف (مثل مخرجات google-sheets.find_rows: {"rows": [...]})
+    """
+    if path.endswith(".csv"):
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            return csv_columns(f)
+
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            doc = json.load(f)
+            rows = doc.get("rows", []) if isinstance(doc, dict) else doc
+    header = []
+    for r in rows:
+        for k in r:
+            if k not in header:
+                header.append(k)
+    return {h: ["" if r.get(h) is None else str(r.get(h)) for r in rows] for h in header}
+
+
+def csv_columns(lines):
+    """{column: [str]} من أسطر CSV — أول سطر هو الأعمدة"""
+    reader = csv.reader(lines)
+    header = next(reader, [])
+    width = len(header)
+    rows = [r if len(r) >= width else r + [""] * (width - len(r)) for r in reader if r]
+    # عمود عمود بـ itemgetter — zip(*rows) مع 200k صف أبطأ بـ 4-5 مرات
+    return {h: list(map(itemgetter(i), rows)) for i, h in enumerate(header)}
+
+
+def load_sheet(path, sheet, industry=None, config=None):
+    config = config or load_json(SHEETS_CONFIG)
+    return build_sheet(read_export(path), sheet_schema(sheet, industry, config), name=sheet,
+                       column_types=config.get("column_types"))
+
+# ============================================================
+# 3. الأقنعة
+# ============================================================
+
+def label_mask(sheet, column, wanted):
+    """قناع bool: الصفوف اللي قيمتها (بعد التطبيع) ضمن wanted — None لو العمود غير موجود"""
+    codes = sheet["columns"].get(column)
+    if codes is None:
+        return None
+    labels = sheet["labels"].get(column)
+    if labels is None:
+        normalized = np.array([arabic.normalize(str(v).strip()) for v in codes], dtype=object)
+        return np.isin(normalized, list(wanted))
+    hits = np.flatnonzero(np.isin(labels, list(wanted)))
+    return np.isin(codes, hits)
+
+
+def window_mask(sheet, column, start, days=7):
+    """[start, start + days) — None لو العمود غير موجود أو start فاضي"""
+    dates = sheet["columns"].get(column)
+    if dates is None or start is None or dates.dtype.kind != "M":
+        return None
+    start = np.datetime64(start, "D")
+    return (dates >= start) & (dates < start + np.timedelta64(days, "D"))
+
+
+def _and(*masks):
+    result = None
+    for m in masks:
+        if m is not None:
+            result = m if result is None else result & m
+    return result
+
+
+def _counts(sheet, column, mask=None):
+    """{label: count} — لعمود enum"""
+    codes = sheet["columns"].get(column)
+    labels = sheet["labels"].get(column)
+    if codes is None or labels is None:
+        return {}
+    if mask is not None:
+        codes = codes[mask]
+    counts = np.bincount(codes, minlength=len(labels))
+    return {str(labels[i]): int(c) for i, c in enumerate(counts) if c and labels[i]}
+
+# ============================================================
+# 4. التقرير الأسبوعي (calculate_stats)
+# ============================================================
+
+def weekly_stats(leads, invoices=None, week_start=None):
+    """
+    نفس مفاتيح خطوة calculate_stats + تفاصيل إضافية.
+    week_start: يفلتر التاريخ على [week_start, +7 أيام) — للشيتات اللي فيها عمود التاريخ
+    """
+    stats = {"total_leads": 0, **dict.fromkeys(LEAD_TYPES, 0),
+             "total_revenue": 0.0, "unpaid_invoices": 0, "unpaid_amount": 0.0, "by_source": {}}
+    if leads is not None:
+        lead_mask = window_mask(leads, COL_DATE, week_start)
+        by_type = _counts(leads, COL_TYPE, lead_mask)
+        stats["total_leads"] = int(lead_mask.sum()) if lead_mask is not None else leads["rows"]
+        stats.update({t: by_type.get(t, 0) for t in LEAD_TYPES})
+        stats["by_source"] = _counts(leads, COL_SOURCE, lead_mask)
+    if invoices is None or not invoices["rows"]:
+        return stats
+
+    in_week = window_mask(invoices, COL_DATE, week_start)
+    amount = invoices["columns"].get(COL_AMOUNT)
+    amount = np.nan_to_num(amount) if amount is not None else np.zeros(invoices["rows"])
+    paid = _and(label_mask(invoices, COL_STATUS, PAID), in_week)
+    unpaid = _and(label_mask(invoices, COL_STATUS, UNPAID), in_week)
+    if paid is not None:
+        stats["total_revenue"] = round(float(amount[paid].sum()), 2)
+    if unpaid is not None:
+        stats["unpaid_invoices"] = int(unpaid.sum())
+        stats["unpaid_amount"] = round(float(amount[unpaid].sum()), 2)
+    return stats
+
+# ============================================================
+# 5. تحصيل الفواتير (calculate_days_overdue)
+# ============================================================
+
+def reminder_levels(days):
+    """أيام التأخير → كود المستوى (index في REMINDER_LEVELS)"""
+    return np.searchsorted(np.array(REMINDER_BOUNDS), days, side="left")
+
+
+def overdue(invoices, today, unpaid_only=True):
+    """
+    يرجع (summary, rows)
+      rows: {"days": int64[], "level": int[], "selected": bool[]} — صف لكل فاتورة
+      summary: عدد/مبلغ/أقصى تأخير لكل مستوى + not_due (قبل الاستحقاق) + invalid_due
+    مثل الـ JS: اللي ما حل موعدها (days <= 0) تاخذ gentle — not_due يعدّها لحالها.
+    """
+    n = invoices["rows"]
+    due = invoices["columns"].get(COL_DUE)
+    if due is None:
+        raise KeyError(f"عمود {COL_DUE} غير موجود في الشيت")
+    valid = ~np.isnat(due)
+    days = np.zeros(n, dtype=np.int64)
+    days[valid] = (np.datetime64(today, "D") - due[valid]).astype(np.int64)
+    level = reminder_levels(days)
+
+    selected = valid
+    status = label_mask(invoices, COL_STATUS, UNPAID) if unpaid_only else None
+    if status is not None:
+        selected = selected & status
+
+    amount = invoices["columns"].get(COL_AMOUNT)
+    amount = np.nan_to_num(amount) if amount is not None else np.zeros(n)
+    sel_level = level[selected]
+    sel_days = days[selected]
+    counts = np.bincount(sel_level, minlength=len(REMINDER_LEVELS))
+    amounts = np.bincount(sel_level, weights=amount[selected], minlength=len(REMINDER_LEVELS))
+    max_days = np.full(len(REMINDER_LEVELS), np.iinfo(np.int64).min)
+    np.maximum.at(max_days, sel_level, sel_days)
+
+    reminders = invoices["columns"].get(COL_REMINDERS)
+    sent = None
+    if reminders is not None:
+        sent = np.bincount(sel_level, weights=np.nan_to_num(reminders[selected]), minlength=len(REMINDER_LEVELS))
+
+    summary = {
+        "today": str(np.datetime64(today, "D")),
+        "invoices": n,
+        "selected": int(selected.sum()),
+        "invalid_due": int(n - valid.sum()),
+        "not_due": int((sel_days <= 0).sum()),
+        "total_amount": round(float(amounts.sum()), 2),
+        "levels": {
+            name: {
+                "count": int(counts[i]),
+                "amount": round(float(amounts[i]), 2),
+                "max_days": int(max_days[i]) if counts[i] else None,
+                "reminders_sent": int(sent[i]) if sent is not None else None,
+            }
+            for i, name in enumerate(REMINDER_LEVELS)
+        },
+    }
+    return summary, {"days": days, "level": level, "selected": selected}
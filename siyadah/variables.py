@@ -0,0 +1,260 @@
+"""
+🧮 محلّل مصادر المتغيرات (data/variables → source)
+
+  "trigger.body.name | trigger.row.الاسم"  → سلسلة بدائل، أول قيمة غير فاضية تفوز
+
+كل تعبير يُترجم مرة وحدة (lru_cache) لقائمة بدائل:
+  path   — trigger.* يُقرأ من الـ payload لكل صف؛ step.* / loop.* من الـ scope (ثابت للدفعة)
+  marker — onboarding.step3 / computed / auto_detect ... القيمة تجي جاهزة في provided[key]
+
+بعد القراءة: تحويل النوع (type) ثم التحقق (validation)، والناقص ياخذ default ثم fallback.
+الدفعات عمودية: متغير واحد على كل الصفوف — البدائل الثابتة تُحسب مرة وحدة للدفعة.
+"""
+
+import re
+from collections import Counter
+from functools import lru_cache
+
+from siyadah import arabic, phones
+
+ROW_ROOT = "trigger"
+SCOPE_ROOTS = ("step", "loop", "body")
+MAX_ROW_PROBLEMS = 1000
+
+SAUDI_PHONE_RE = re.compile(r"^\+9665\d{8}$")
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+SHEET_ID_RE = re.compile(r"^[A-Za-z0-9_-]{20,}$")
+TRUE_WORDS = frozenset(["true", "1", "yes", "y", "نعم", "صح"])
+FALSE_WORDS = frozenset(["false", "0", "no", "n", "لا", "خطأ"])
+
+# ============================================================
+# 1. ترجمة التعبير
+# ============================================================
+
+def _getter(keys):
+    def get(root):
+        try:
+            for k in keys:
+                root = root[k]
+        except (KeyError, IndexError, TypeError):
+            return None
+        return root
+    return get
+
+
+@lru_cache(maxsize=1024)
+def compile_source(expr):
+    """"a.b | c" → ((kind, root, getter|name), ...) — kind: row | scope | marker"""
+    alts = []
+    for part in expr.split("|"):
+        part = part.strip()
+        if not part:
+            continue
+        segments = part.split(".")
+        if len(segments) > 1 and segments[0] == ROW_ROOT:
+            alts.append(("row", ROW_ROOT, _getter(tuple(segments[1:]))))
+        elif len(segments) > 1 and segments[0] in SCOPE_ROOTS:
+            alts.append(("scope", segments[0], _getter(tuple(segments[1:]))))
+        else:
+            alts.append(("marker", None, part))
+    return tuple(alts)
+
+# ============================================================
+# 2. تحويل النوع والتحقق
+# ============================================================
+
+def coerce_phone(value):
+    """05XXXXXXXX / ٠٥... / 9665... / 009665... / +971... → E.164 (siyadah.phones) — الرقم غير الصالح ValueError"""
+    phone, ok, _, reason = phones.normalize_phone(value)
+    if not ok:
+        raise ValueError(f"رقم جوال غير صالح ({reason}): {value!r}")
+    return phone
+
+
+def coerce_number(value):
+    text = arabic.normalize_digits(str(value)).replace(",", "").strip()
+    number = float(text)
+    return int(number) if number.is_integer() else number
+
+
+def coerce_boolean(value):
+    if isinstance(value, bool):
+        return value
+    word = str(value).strip().lower()
+    if word in TRUE_WORDS:
+        return True
+    if word in FALSE_WORDS:
+        return False
+    raise ValueError(f"ليست قيمة منطقية: {value!r}")
+
+
+def _strip(value):
+    return str(value).strip()
+
+
+def _lower(value):
+    return str(value).strip().lower()
+
+
+COERCERS = {
+    "string": _strip,
+    "phone": coerce_phone,
+    "email": _lower,
+    "enum": _lower,
+    "url": _strip,
+    "number": coerce_number,
+    "integer": coerce_number,
+    "boolean": coerce_boolean,
+}
+
+
+def compile_validation(rule):
+    """"min:2,max:100" | "saudi_phone" | "email" | "enum:a|b" ... → check(value) → bool"""
+    checks = []
+    for part in (rule or "").split(","):
+        name, _, arg = part.strip().partition(":")
+        if name == "min":
+            n = int(arg)
+            checks.append(lambda v, n=n: len(str(v)) >= n)
+        elif name == "max":
+            n = int(arg)
+            checks.append(lambda v, n=n: len(str(v)) <= n)
+        elif name == "enum":
+            allowed = frozenset(arg.split("|"))
+            checks.append(lambda v, allowed=allowed: v in allowed)
+        elif name == "saudi_phone":
+            checks.append(lambda v: SAUDI_PHONE_RE.match(v) is not None)
+        elif name == "email":
+            checks.append(lambda v: EMAIL_RE.match(v) is not None)
+        elif name == "url":
+            checks.append(lambda v: str(v).startswith(("http://", "https://")))
+        elif name == "google_sheet_id":
+            checks.append(lambda v: SHEET_ID_RE.match(str(v)) is not None)
+    if not checks:
+        return None
+    if len(checks) == 1:
+        return checks[0]
+    return lambda v: all(c(v) for c in checks)
+
+# ============================================================
+# 3. ترجمة المتغيرات
+# ============================================================
+
+def compile_variables(catalog, keys=None):
+    """[compiled] لكل متغير له source — keys: تقييد بمجموعة مفاتيح"""
+    compiled = []
+    for key, var in catalog.items():
+        if keys is not None and key not in keys:
+            continue
+        source = var.get("source")
+        if not isinstance(source, str):
+            continue
+        compiled.append({
+            "key": key,
+            "alts": compile_source(source),
+            "coerce": COERCERS.get(var.get("type")),
+            "check": compile_validation(var.get("validation")),
+            "required": bool(var.get("required")),
+            "default": var.get("default", var.get("fallback")),
+        })
+    return compiled
+
+
+def _static_values(cv, provided, scope):
+    """البدائل الثابتة تُحسب مرة وحدة — يرجع [(kind, getter_or_value)] مقطوعة عند أول قيمة ثابتة"""
+    plan = []
+    for kind, root, target in cv["alts"]:
+        if kind == "row":
+            plan.append(("row", target))
+            continue
+        value = provided.get(cv["key"]) if kind == "marker" else target(scope.get(root))
+        if value not in (None, ""):
+            plan.append(("const", value))
+            break
+    return plan
+
+
+def _first(plan, payload):
+    for kind, target in plan:
+        value = target(payload) if kind == "row" else target
+        if value not in (None, ""):
+            return value
+    return None
+
+# ============================================================
+# 4. التقييم (صف واحد / دفعة)
+# ============================================================
+
+def new_report():
+    return {"rows": 0, "missing": Counter(), "invalid": Counter(), "row_problems": {}}
+
+
+def resolve_batch(compiled, payloads, provided=None, scope=None, report=None, max_problems=MAX_ROW_PROBLEMS):
+    """
+    يرجع (columns {key: [values]}, report)
+    report: missing/invalid لكل متغير + row_problems {row_index: [(key, "missing"|"invalid")]}
+    المتغير الناقص ياخذ default/fallback (حتى لو required — والـ report يسجّله).
+    """
+    provided = provided or {}
+    scope = scope or {}
+    report = report or new_report()
+    offset = report["rows"]
+    n = len(payloads)
+    report["rows"] += n
+    row_problems = report["row_problems"]
+    columns = {}
+
+    for cv in compiled:
+        key = cv["key"]
+        plan = _static_values(cv, provided, scope)
+        coerce = cv["coerce"]
+        check = cv["check"]
+        default = cv["default"]
+        required = cv["required"]
+
+        if all(kind == "const" for kind, _ in plan):
+            # ثابت لكل الصفوف — تحويل وتحقق مرة وحدة
+            value, problem = _finish(plan[0][1] if plan else None, coerce, check, default, required)
+            columns[key] = [value] * n
+            if problem:
+                report[problem][key] += n
+                for i in range(min(n, max_problems - len(row_problems))):
+                    row_problems.setdefault(offset + i, []).append((key, problem))
+            continue
+
+        col = []
+        append = col.append
+        for i, payload in enumerate(payloads):
+            value, problem = _finish(_first(plan, payload), coerce, check, default, required)
+            append(value)
+            if problem:
+                report[problem][key] += 1
+                if len(row_problems) < max_problems or (offset + i) in row_problems:
+                    row_problems.setdefault(offset + i, []).append((key, problem))
+        columns[key] = col
+    return columns, report
+
+
+def _finish(value, coerce, check, default, required):
+    """(value, problem) — problem: None | "missing" | "invalid" """
+    if value in (None, ""):
+        return default, "missing" if required else None
+    if coerce is not None:
+        try:
+            value = coerce(value)
+        except (ValueError, TypeError):
+            return default, "invalid"
+    if check is not None and not check(value):
+        return default, "invalid"
+    return value, None
+
+
+def resolve_row(compiled, payload, provided=None, scope=None):
+    """({key: value}, [(key, problem)]) لصف واحد"""
+    columns, report = resolve_batch(compiled, [payload], provided, scope)
+    return {k: v[0] for k, v in columns.items()}, report["row_problems"].get(0, [])
+
+
+def rows_from_columns(columns):
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*(columns[k] for k in keys))]
@@ -0,0 +1,266 @@
+"""
+🔍 التحقق من السجل مقابل API بيانات ActivePieces (GET /api/v1/pieces/{package})
+
+asyncio فقط (بدون aiohttp/httpx):
+  HttpPool  — اتصالات keep-alive معاد استخدامها + Semaphore للحد من التزامن
+  serve     — سيرفر بديل محلي يخدم بيانات مسجّلة (data/tools/*.json بنفس صيغة الـ API)
+
+النتيجة لكل أداة: verified | mismatch | not_found | error
+mismatch = أسماء actions/triggers في السجل غير موجودة في الـ API (أو العكس).
+"""
+
+import asyncio
+import json
+import os
+import ssl
+import urllib.parse
+from datetime import date
+
+from siyadah.flowcheck import fold
+
+DEFAULT_CONCURRENCY = 100
+DEFAULT_TIMEOUT = 15
+PIECE_PATH = "/api/v1/pieces/"
+NO_BODY_STATUS = frozenset([204, 304])     # بدون body حتى لو ما فيه Content-Length
+
+# ============================================================
+# 1. HTTP client (keep-alive pool)
+# ============================================================
+
+class HttpError(Exception):
+    pass
+
+
+class HttpPool:
+    def __init__(self, base_url, limit=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, headers=None):
+        u = urllib.parse.urlsplit(base_url)
+        self.host = u.hostname
+        self.tls = u.scheme == "https"
+        self.port = u.port or (443 if self.tls else 80)
+        self.prefix = u.path.rstrip("/")
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self.idle = []
+        self.sem = asyncio.Semaphore(limit)
+        self.opened = 0
+        self.requests = 0
+
+    async def _connect(self):
+        self.opened += 1
+        return await asyncio.open_connection(self.host, self.port,
+                                             ssl=ssl.create_default_context() if self.tls else None)
+
+    async def _roundtrip(self, conn, method, path, body=None):
+        reader, writer = conn
+        lines = [f"{method} {self.prefix}{path} HTTP/1.1", f"Host: {self.host}",
+                 "Connection: keep-alive", "Accept: application/json"]
+        lines += [f"{k}: {v}" for k, v in self.headers.items()]
+        if body is not None:
+            lines += ["Content-Type: application/json", f"Content-Length: {len(body)}"]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await writer.drain()
+
+        status = 100
+        while 100 <= status < 200:      # 1xx (100 Continue...) ردود مؤقتة — الرد الفعلي بعدها
+            status_line = await reader.readline()
+            if not status_line:
+                raise ConnectionResetError("connection closed")
+            status = int(status_line.split()[1])
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                k, _, v = line.decode("latin-1").partition(":")
+                headers[k.strip().lower()] = v.strip()
+
+        keep = headers.get("connection", "").lower() != "close"
+        if status in NO_BODY_STATUS or method == "HEAD":
+            body = b""
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await reader.readline()
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readexactly(2)
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body = await reader.read()
+            keep = False
+        return status, body, keep
+
+    async def get(self, path):
+        return await self.request("GET", path)
+
+    async def post_json(self, path, payload):
+        return await self.request("POST", path, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    async def request(self, method, path, body=None):
+        """(status, body bytes) — يعيد المحاولة مرة لو الاتصال المعاد استخدامه انقطع"""
+        async with self.sem:
+            for attempt in (0, 1):
+                reused = bool(self.idle) and attempt == 0
+                conn = self.idle.pop() if reused else await self._connect()
+                try:
+                    status, body, keep = await asyncio.wait_for(self._roundtrip(conn, method, path, body), self.timeout)
+                except (ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+                    conn[1].close()
+                    if reused:
+                        continue
+                    raise HttpError(str(e) or type(e).__name__) from e
+                except asyncio.TimeoutError:
+                    conn[1].close()
+                    raise HttpError(f"TIMEOUT after {self.timeout}s")
+                self.requests += 1
+                if keep:
+                    self.idle.append(conn)
+                else:
+                    conn[1].close()
+                return status, body
+
+    async def close(self):
+        while self.idle:
+            _, writer = self.idle.pop()
+            writer.close()
+
+# ============================================================
+# 2. المقارنة
+# ============================================================
+
+def _names(items):
+    if isinstance(items, dict):
+        return set(items)
+    return {a["name"] for a in items or [] if isinstance(a, dict) and a.get("name")}
+
+
+def diff_piece(local, remote):
+    """{"missing_actions": في السجل وغير موجودة في الـ API, "extra_actions": العكس, ...}"""
+    out = {}
+    for kind in ("actions", "triggers"):
+        mine = _names(local.get(kind))
+        theirs = _names(remote.get(kind))
+        theirs_folded = {fold(n) for n in theirs}
+        mine_folded = {fold(n) for n in mine}
+        out[f"missing_{kind}"] = sorted(n for n in mine if fold(n) not in theirs_folded)
+        out[f"extra_{kind}"] = sorted(n for n in theirs if fold(n) not in mine_folded)
+    return out
+
+
+def piece_path(piece):
+    package = piece.get("package") or f"@activepieces/piece-{piece['id']}"
+    return PIECE_PATH + urllib.parse.quote(package, safe="")
+
+
+async def verify_piece(pool, piece):
+    result = {"id": piece["id"]}
+    try:
+        status, body = await pool.get(piece_path(piece))
+    except (OSError, HttpError, asyncio.IncompleteReadError) as e:
+        return dict(result, status="error", error=str(e) or type(e).__name__)
+    if status == 404:
+        return dict(result, status="not_found")
+    if status != 200:
+        return dict(result, status="error", error=f"HTTP {status}: {body[:200].decode('utf-8', 'replace')}")
+    try:
+        remote = json.loads(body)
+    except ValueError:
+        return dict(result, status="error", error="JSON غير صالح")
+    diff = diff_piece(piece, remote)
+    result["remote_version"] = remote.get("version")
+    if any(diff.values()):
+        return dict(result, status="mismatch", diff=diff)
+    return dict(result, status="verified")
+
+
+async def verify_all(pieces, base_url, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, token=None):
+    """يرجع (results, stats{requests, connections})"""
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    pool = HttpPool(base_url, concurrency, timeout, headers)
+    try:
+        results = await asyncio.gather(*(verify_piece(pool, p) for p in pieces))
+    finally:
+        await pool.close()
+    return results, {"requests": pool.requests, "connections": pool.opened}
+
+# ============================================================
+# 3. التحديث الجماعي
+# ============================================================
+
+def apply_results(pieces_dir, results, today=None):
+    """
+    verified → _verified=true + _verified_date=اليوم
+    mismatch/not_found → _verified=false (التاريخ يبقى — آخر تحقق ناجح)
+    error → بدون تغيير. يرجع عدد الملفات اللي تغيّرت.
+    """
+    today = today or date.today().isoformat()
+    changed = 0
+    for r in results:
+        if r["status"] == "error":
+            continue
+        path = os.path.join(pieces_dir, f"{r['id']}.json")
+        with open(path, "r", encoding="utf-8") as f:
+            piece = json.load(f)
+        before = (piece.get("_verified"), piece.get("_verified_date"))
+        if r["status"] == "verified":
+            piece["_verified"] = True
+            piece["_verified_date"] = today
+        else:
+            piece["_verified"] = False
+        if (piece.get("_verified"), piece.get("_verified_date")) != before:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(piece, f, ensure_ascii=False, indent=2)
+            changed += 1
+    return changed
+
+# ============================================================
+# 4. سيرفر بديل (بيانات مسجّلة)
+# ============================================================
+
+def load_records(records_dir):
+    """{package: body bytes} — من ملفات بصيغة الـ API (data/tools/*.json)"""
+    records = {}
+    for name in sorted(os.listdir(records_dir)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(records_dir, name), "r", encoding="utf-8") as f:
+            doc = json.load(f)
+        package = doc.get("package") or doc.get("name") or f"@activepieces/piece-{name[:-5]}"
+        records[package] = json.dumps(doc, ensure_ascii=False).encode("utf-8")
+    return records
+
+
+async def serve(records, host="127.0.0.1", port=8099):
+    """GET /api/v1/pieces/{package} → السجل المسجّل، keep-alive"""
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                parts = request_line.decode("latin-1").split()
+                path = urllib.parse.unquote(parts[1]) if len(parts) > 1 else ""
+                body = records.get(path[len(PIECE_PATH):]) if path.startswith(PIECE_PATH) else None
+                status = "200 OK" if body is not None else "404 Not Found"
+                if body is None:
+                    body = b'{"message":"piece not found"}'
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(body)}\r\nConnection: keep-alive\r\n\r\n".encode() + body)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass    # العميل قطع — نقفل بهدوء (الإلغاء CancelledError يكمل لفوق بعد الإقفال)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    return await asyncio.start_server(handle, host, port, backlog=1024)
@@ -0,0 +1,9 @@
+"""
+اختبارات مكتبة siyadah/ (Python) — npm run test:python
+الجذر على sys.path عشان `from siyadah...` يشتغل من tests/
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,68 @@
+"""Phase 39: تصنيف البرومبتات على دفعات (build_plan / parse_results / run)"""
+
+import asyncio
+
+import pytest
+
+from siyadah.batchai import StubBackend, build_plan, fallback_result, parse_item, parse_results, render_batch, run
+from siyadah.data import PROMPTS_FILE, load_json
+
+
+@pytest.fixture(scope="module")
+def prompts():
+    return load_json(PROMPTS_FILE)["prompts"]
+
+
+@pytest.fixture(scope="module")
+def lead_plan(prompts):
+    return build_plan(prompts["classify_lead"], {"company.industry": "clinic"}, "clinic")
+
+
+def test_plan_splits_static_and_item_lines(lead_plan):
+    assert lead_plan["item_keys"] == ["customer.name", "customer.message", "customer.source"]
+    assert "clinic" in lead_plan["system"] and "{{" not in lead_plan["system"]
+    assert lead_plan["enums"]["lead_type"] == {"hot", "warm", "cold"}
+    assert lead_plan["message_key"] == "customer.message"
+
+
+def test_unsupported_fallbacks_are_rejected(prompts):
+    for pid in ("auto_reply", "extract_appointment_info"):
+        with pytest.raises(ValueError, match="غير مدعوم"):
+            build_plan(prompts[pid])
+    with pytest.raises(ValueError):
+        build_plan(prompts["weekly_summary"])
+
+
+def test_keyword_rules_use_message_field_only(lead_plan):
+    # "أبي" في الاسم أو المصدر ما يأثر — الرسالة وحدها
+    item = {"customer.name": "أبي عاجل", "customer.message": "شكراً", "customer.source": "الحين"}
+    assert fallback_result(lead_plan, item)["lead_type"] == "cold"
+    item["customer.message"] = "كم السعر؟"
+    assert fallback_result(lead_plan, item) == {"lead_type": "warm", "priority": "medium", "service": "",
+                                                "reason": "keyword_rules"}
+
+
+def test_parse_item_inverts_render(lead_plan):
+    item = {"customer.name": "سارة\nأحمد", "customer.message": "أبي أحجز", "customer.source": None}
+    block = render_batch(lead_plan, [(1, item)]).split("### 1\n", 1)[1]
+    assert parse_item(lead_plan, block) == {"customer.name": "سارة أحمد", "customer.message": "أبي أحجز",
+                                            "customer.source": None}
+
+
+def test_parse_results_drops_invalid(lead_plan):
+    text = ('{"results": [{"id": 1, "lead_type": "hot", "priority": "high", "service": "x", "reason": "y"},'
+            '{"id": 2, "lead_type": "boiling", "priority": "high", "service": "x", "reason": "y"},'
+            '{"id": 9, "lead_type": "hot", "priority": "high", "service": "x", "reason": "y"}, 3]}')
+    assert list(parse_results(lead_plan, text, [1, 2])) == [1]
+    assert parse_results(lead_plan, "not json", [1]) == {}
+
+
+def test_run_batches_retries_and_falls_back(lead_plan):
+    items = [{"customer.name": f"عميل {i}", "customer.message": m, "customer.source": "web"}
+             for i, m in enumerate(["أبي أحجز", "كم السعر", "شكراً"] * 10)]
+    backend = StubBackend(lead_plan, latency=0, per_item=0, invalid_every=2)
+    results, stats = asyncio.run(run(lead_plan, items, backend, batch_size=10, concurrency=1))
+    assert [r["lead_type"] for r in results[:3]] == ["hot", "warm", "cold"]
+    assert stats["calls"] < len(items) and stats["retried"] >= 10
+    assert {r["_source"] for r in results} <= {"batch", "retry", "fallback"}
+    assert stats["fallback"] + sum(r["_source"] != "fallback" for r in results) == len(items)
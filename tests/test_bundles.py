@@ -0,0 +1,60 @@
+"""Phase 26: حزم الـ Flows (compile_bundle / fill_bundle)"""
+
+import json
+
+import pytest
+
+from siyadah.bundles import compile_bundle, fill_bundle, missing_required, resolve_template
+from siyadah.data import load_flows, load_messages, load_variables
+from siyadah.placeholders import split
+
+
+@pytest.fixture(scope="module")
+def data():
+    return load_flows(), load_messages(), load_variables()
+
+
+def test_split_segments_and_keys():
+    assert split("مرحبا {{customer.name}} من {{company.company_name}}") == (
+        ["مرحبا ", " من ", ""], ["customer.name", "company.company_name"])
+
+
+def test_resolve_template_by_industry(data):
+    _, messages, _ = data
+    assert resolve_template("templates.welcome.clinic", "clinic", messages) == messages["clinic"]["welcome"]["text"]
+    assert resolve_template("templates.nope.x", "clinic", messages) is None
+
+
+def test_every_flow_compiles_for_every_industry(data):
+    flows, messages, catalog = data
+    for flow in flows.values():
+        for industry in messages:
+            bundle, errors, _ = compile_bundle(flow, industry, messages, catalog)
+            assert errors == []
+            assert bundle["static"]["company.industry"] == industry
+            json.dumps(bundle, ensure_ascii=False)
+
+
+def test_fill_inlines_message_and_keeps_missing(data):
+    flows, messages, catalog = data
+    bundle, _, _ = compile_bundle(flows["customer-journey"], "clinic", messages, catalog)
+    flow = fill_bundle(bundle, {"company.company_name": "عيادة النور"})
+    welcome = next(s for s in flow["steps"] if s["id"] == "send_welcome")["input_mapping"]
+    assert "عيادة النور" in welcome["message"]
+    assert welcome["phone_number"] == "{{trigger.row.الجوال}}"
+    # الحزمة نفسها ما تتغير بعد التعبئة
+    assert fill_bundle(bundle, {})["steps"][2]["input_mapping"]["message"] != welcome["message"]
+
+
+def test_missing_required(data):
+    flows, messages, catalog = data
+    bundle, _, _ = compile_bundle(flows["customer-journey"], "clinic", messages, catalog)
+    assert "company.company_name" in missing_required(bundle, {})
+    assert "company.company_name" not in missing_required(bundle, {"company.company_name": "x"})
+
+
+def test_industry_variant_extends_sheet_columns(data):
+    flows, messages, catalog = data
+    bundle, _, _ = compile_bundle(flows["appointment-booking"], "clinic", messages, catalog)
+    assert "التأمين" in bundle["body"]["sheets_template"]["columns"]
+    assert "industry_variants" not in bundle["body"]
@@ -0,0 +1,52 @@
+"""Phase 34: فهرس القدرات المشتركة (capability_key / alternatives)"""
+
+import pytest
+
+from siyadah.capabilities import alternatives, build_capability_index, capability_key, shared_capabilities
+from siyadah.data import load_tool_details
+
+
+@pytest.mark.parametrize("piece, name, display, kind, key", [
+    ("gmail", "send_email", "Send Email", "action", "send:email"),
+    ("shopify", "get_customer", "Get Customer", "action", "get:customer"),
+    ("shopify", "get_customers", "Get Customers", "action", "list:customer"),
+    ("google-sheets", "get_many_rows", "Get Many Rows", "action", "list:record"),
+    ("google-sheets", "insert_multiple_rows", "Insert Multiple Rows", "action", "create_many:record"),
+    ("stripe", "search_customers", "Search Customers", "action", "find:customer"),
+    ("slack", "send_channel_message", "Send Message To A Channel", "action", "send:message"),
+    ("discord", "sendMessageWithBot", None, "action", "send:message"),
+    ("slack", "create_channel", "Create Channel", "action", "create:channel"),
+    ("slack", "set_user_status", "Set User Status", "action", "set:user_status"),
+    ("calendly", "invitee_created", "Event Scheduled", "trigger", "new:event"),
+    ("google-sheets", "new_rows", "New Rows", "trigger", "new:record"),
+    ("http", "custom_api_call", "Custom API Call", "action", None),
+])
+def test_capability_key(piece, name, display, kind, key):
+    assert capability_key(piece, name, display, kind) == key
+
+
+def test_alternatives_keep_plurality_and_resolve_aliases():
+    index = build_capability_index([
+        {"id": "shopify", "actions": [{"name": "get_customer"}, {"name": "get_customers"}]},
+        {"id": "stripe", "actions": [{"name": "retrieve_customer"}, {"name": "list_customers"}]},
+        {"id": "code", "actions": [{"name": "run_code"}]},
+    ])
+    assert alternatives(index, "shopify", "getCustomer") == [("stripe", "retrieve_customer")]
+    assert alternatives(index, "shopify", "get_customers") == [("stripe", "list_customers")]
+    assert index["by_member"]["code.runcode"] == "action/run"
+    assert alternatives(index, "code", "run_javascript") == []
+    assert alternatives(index, "nope", "x") == []
+
+
+@pytest.fixture(scope="module")
+def shipped():
+    return build_capability_index(load_tool_details().values())
+
+
+def test_shipped_messaging_and_calendar_alternatives(shipped):
+    assert ("slack", "send_channel_message") in alternatives(shipped, "whatsapp", "send_message")
+    assert ("whatsapp", "sendMessage") in alternatives(shipped, "discord", "send_message_webhook")
+    # calendly ما له triggers في data/tools — خطوة calendly.new_event بدون بديل
+    assert alternatives(shipped, "calendly", "new_event") == []
+    assert ("sendgrid", "send_email") in alternatives(shipped, "gmail", "send_email")
+    assert len(shared_capabilities(shipped)) >= 19
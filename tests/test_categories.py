@@ -0,0 +1,93 @@
+"""Phase 33: تصنيف الأدوات من category-rules.json (classify / explain)"""
+
+import random
+
+import pytest
+
+from siyadah.categories import classify, compile_rules, explain, load_classifier
+from siyadah.data import load_tool_details
+
+# guess_category القديم من extract-all-pieces.py — مرجع للتكافؤ
+LEGACY = [
+    ("exact", "A_essential", ["webhook", "schedule", "branch", "code", "delay", "loop", "storage", "http"]),
+    ("google", "B_google", None),
+    ("prefix", "L_microsoft", ["microsoft-"]),
+    ("contains", "D_ai", ["openai", "anthropic", "gemini", "claude", "hugging", "deepseek", "groq", "mistral",
+                          "cohere", "perplexity", "replicate", "stability", "amazon-bedrock"]),
+    ("contains", "C_communication", ["slack", "discord", "telegram", "whatsapp", "twilio", "sms", "sendgrid",
+                                     "mailgun", "smtp", "email", "mailer", "postmark", "pushover", "ntfy",
+                                     "intercom", "crisp", "freshdesk", "zendesk", "tawk"]),
+    ("contains", "E_crm", ["hubspot", "salesforce", "zoho-crm", "pipedrive", "freshsales", "attio", "close-crm",
+                           "copper"]),
+    ("contains", "F_ecommerce", ["shopify", "woocommerce", "stripe", "paypal", "square", "lemonsqueezy", "gumroad",
+                                 "paddle"]),
+    ("contains", "H_marketing", ["mailchimp", "activecampaign", "convertkit", "drip", "campaign", "facebook",
+                                 "instagram", "twitter", "linkedin", "tiktok", "youtube", "pinterest", "reddit",
+                                 "hootsuite", "buffer"]),
+    ("contains", "J_database", ["mysql", "postgres", "supabase", "firebase", "mongodb", "redis", "sql", "database",
+                                "pinecone", "qdrant", "weaviate", "milvus", "snowflake", "bigquery", "clickhouse",
+                                "airtable", "baserow", "nocodb"]),
+    ("contains", "K_dev", ["github", "gitlab", "bitbucket", "jira", "jenkins", "docker", "aws", "azure", "vercel",
+                           "netlify", "sentry", "datadog", "pagerduty", "linear"]),
+    ("contains", "I_content", ["wordpress", "webflow", "contentful", "strapi", "cms", "ghost", "medium"]),
+    ("contains", "M_finance", ["invoice", "accounting", "quickbooks", "xero", "freshbooks", "billing",
+                               "zoho-invoice", "wave"]),
+]
+
+
+def legacy_guess(piece_id):
+    k = piece_id.lower()
+    for kind, category, patterns in LEGACY:
+        if kind == "exact" and k in patterns:
+            return category
+        if kind == "google" and (k.startswith("google-") or k in ("gmail", "googlechat")):
+            return category
+        if kind == "prefix" and any(k.startswith(p) for p in patterns):
+            return category
+        if kind == "contains" and any(p in k for p in patterns):
+            return category
+    return "G_productivity"
+
+
+@pytest.fixture(scope="module")
+def classifier():
+    return load_classifier()
+
+
+def synthetic_ids(n, seed=5):
+    rnd = random.Random(seed)
+    words = [p for _, _, ps in LEGACY if ps for p in ps] + [
+        "google-", "gmail", "googlechat", "notion", "acme", "data", "flow", "hub", "-", "x"]
+    return [rnd.choice(("", "my-", "google-", "microsoft-")) + "".join(rnd.choice(words) for _ in range(rnd.randint(1, 3)))
+            for _ in range(n)]
+
+
+def test_equivalent_to_legacy_guess_category(classifier):
+    ids = list(load_tool_details()) + synthetic_ids(20000)
+    diffs = [(pid, legacy_guess(pid), classify(classifier, pid)[0]) for pid in ids
+             if legacy_guess(pid) != classify(classifier, pid)[0]]
+    assert diffs[:5] == []
+
+
+def test_confidence_levels(classifier):
+    assert classify(classifier, "webhook") == ("A_essential", 1.0)
+    assert classify(classifier, "openai") == ("D_ai", 0.95)
+    assert classify(classifier, "microsoft-teams") == ("L_microsoft", 0.9)
+    assert classify(classifier, "totally-unknown") == (classifier["default"], classifier["default_confidence"])
+    category, confidence = classify(classifier, "slack-to-stripe")
+    assert category == "C_communication" and confidence < 0.9
+
+
+def test_overrides_and_explain():
+    classifier = compile_rules({"overrides": {"Acme": "E_crm"},
+                                "rules": [{"category": "D_ai", "match": "prefix", "patterns": ["ai-"]}]})
+    assert classify(classifier, "acme") == ("E_crm", 1.0)
+    info = explain(classifier, "ai-writer")
+    assert info["category"] == "D_ai" and not info["default"]
+    assert info["matched"][0]["rule"] == "rules[0] prefix"
+    assert explain(classifier, "zzz")["default"] is True
+
+
+def test_bad_match_kind_rejected():
+    with pytest.raises(ValueError):
+        compile_rules({"rules": [{"category": "D_ai", "match": "regex", "patterns": ["x"]}]})
@@ -0,0 +1,100 @@
+"""Phase 41: كشف التكرار لكل tenant (DedupeIndex / classify_batch)"""
+
+import os
+
+import pytest
+
+from siyadah.dedupe import Bloom, DedupeIndex, classify_batch, key_hash, tenant_dir
+
+
+def rows(*phones, email=None):
+    return [{"الجوال": p, "الإيميل": email or ""} for p in phones]
+
+
+def test_classify_batch_statuses(tmp_path):
+    index = DedupeIndex("t1", str(tmp_path))
+    batch = [{"الجوال": "0501234567", "الإيميل": "A@Mail.com "},
+             {"الجوال": "+966 50 123 4567", "الإيميل": ""},
+             {"الجوال": "", "الإيميل": "a@mail.com"},
+             {"الجوال": "12345", "الإيميل": "not-an-email"},
+             {"رقم_الفاتورة": "inv-٠٠١"}]
+    statuses, report = classify_batch(index, batch)
+    assert statuses == ["new", "duplicate_in_batch", "duplicate_in_batch", "no_key", "new"]
+    assert report["matched"] == {"phone": 1, "email": 1, "invoice": 0}
+    assert report["added"] == 3 and index.count == 3
+    index.save()
+
+    again = DedupeIndex("t1", str(tmp_path))
+    statuses, _ = classify_batch(again, [{"الجوال": "٠٥٠١٢٣٤٥٦٧"}, {"رقم_الفاتورة": "INV-001"},
+                                         {"رقم_الفاتورة": "INV-001"}], update=False)
+    assert statuses == ["duplicate", "duplicate", "duplicate"]
+    statuses, _ = classify_batch(again, [{"رقم_الفاتورة": "INV-001"}], invoice_date="2026-10-19")
+    assert statuses == ["new"]
+
+
+@pytest.mark.parametrize("bloom_first", [True, False])
+def test_bloom_not_stale_after_run_without_bloom(tmp_path, bloom_first):
+    first = DedupeIndex("t2", str(tmp_path), bloom=bloom_first, capacity=1000)
+    assert classify_batch(first, rows("0501234567"))[0] == ["new"]
+    first.save()
+
+    plain = DedupeIndex("t2", str(tmp_path), bloom=False)
+    assert classify_batch(plain, rows("0559999999"))[0] == ["new"]
+    plain.save()
+
+    bloomed = DedupeIndex("t2", str(tmp_path), bloom=True, capacity=1000)
+    statuses, _ = classify_batch(bloomed, rows("0559999999", "0501234567", "0561111111"), update=False)
+    assert statuses == ["duplicate", "duplicate", "new"]
+
+
+def test_bloom_skips_full_index_for_new_keys(tmp_path):
+    index = DedupeIndex("t3", str(tmp_path), bloom=True, capacity=1000)
+    classify_batch(index, rows("0501234567"))
+    index.save()
+    reopened = DedupeIndex("t3", str(tmp_path), bloom=True, capacity=1000)
+    classify_batch(reopened, rows("0551111111"), update=False)
+    assert reopened.loads == 0 and reopened.bloom_skips == 1
+
+
+def test_compact_merges_log(tmp_path):
+    index = DedupeIndex("t4", str(tmp_path))
+    classify_batch(index, rows(*(f"05{i:08d}" for i in range(2000))))
+    index.save()
+    assert index.meta["logged"] == 0 and index.count == 2000
+    reopened = DedupeIndex("t4", str(tmp_path))
+    assert key_hash("p:+966500000007") in reopened
+
+
+def test_bloom_numpy_and_python_paths_agree():
+    bloom = Bloom.sized(1000)
+    hashes = [key_hash(f"k{i}") for i in range(500)]
+    bloom.add_many(hashes[:250])
+    assert all(bloom.contains_many(hashes[:250]))
+    assert bloom.contains_many(hashes[250:]) == [h in bloom for h in hashes[250:]]
+
+
+@pytest.mark.parametrize("tenant", [".", "..", "...", "../..", "a/../.."])
+def test_tenant_dir_stays_inside(tmp_path, tenant):
+    root = tmp_path / "dedupe"
+    root.mkdir()
+    if tenant.strip("."):
+        # الفواصل تتحول لـ "_" — يبقى مجلد وحد تحت root
+        assert os.path.dirname(tenant_dir(tenant, str(root))) == str(root)
+        return
+    with pytest.raises(ValueError):
+        tenant_dir(tenant, str(root))
+    with pytest.raises(ValueError):
+        DedupeIndex(tenant, str(root))
+
+
+def test_reset_refuses_dot_tenant(tmp_path):
+    from siyadah.regbench import load_script
+    root = tmp_path / "dedupe"
+    (root / "keep").mkdir(parents=True)
+    script = load_script("dedupe-import.py")
+    argv = ["dedupe-import.py", "--tenant", "..", "--dir", str(root), "--reset"]
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(script.sys, "argv", argv)
+        with pytest.raises(SystemExit):
+            script.main()
+    assert (root / "keep").is_dir()
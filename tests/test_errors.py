@@ -0,0 +1,60 @@
+"""Phase 28: فهرس خريطة الأخطاء (build_error_index / lookup)"""
+
+import pytest
+
+from siyadah.data import ERROR_MAP, is_partial_registry, load_json, load_registry
+from siyadah.errors import build_error_index, classify, lookup
+
+MAP = {
+    "error_categories": {
+        "auth": {"errors": [
+            {"code": "WILD", "http_status": 401, "affected_pieces": ["*"], "frequency": "low"},
+            {"code": "GMAIL", "http_status": 401, "affected_pieces": ["gmail"], "frequency": "high"},
+            {"code": "OAUTH", "http_status": 401, "affected_pieces": ["*"], "affected_auth_types": ["oauth2"]},
+        ]},
+    },
+}
+PIECES = [{"id": "gmail", "auth_type": "OAUTH2"}, {"id": "slack", "auth_type": "oauth2"}]
+
+
+def codes(found):
+    return [c["code"] for c in found]
+
+
+def test_lookup_order_piece_auth_wildcard():
+    index, errors, _ = build_error_index(MAP, PIECES)
+    assert errors == []
+    assert codes(lookup(index, 401, "gmail")) == ["GMAIL", "OAUTH", "WILD"]
+    assert codes(lookup(index, "401", "slack")) == ["OAUTH", "WILD"]
+    assert codes(lookup(index, 401, "unknown")) == ["WILD"]
+    assert lookup(index, 500, "gmail") == []
+    assert classify(index, 401, "gmail")["code"] == "GMAIL"
+
+
+def test_unknown_affected_piece():
+    index, errors, _ = build_error_index(MAP, [{"id": "slack"}])
+    assert any("gmail" in e for e in errors)
+    _, errors, warnings = build_error_index(MAP, [{"id": "slack"}], partial=True)
+    assert errors == [] and any("gmail" in w for w in warnings)
+
+
+def test_duplicate_code_is_error():
+    dup = {"error_categories": {"a": {"errors": [{"code": "X"}, {"code": "X"}]}}}
+    _, errors, _ = build_error_index(dup)
+    assert errors == ["[X] كود مكرر"]
+
+
+@pytest.fixture(scope="module")
+def shipped():
+    pieces, source = load_registry()
+    assert pieces, "لازم سجل (data/registry أو data/tools)"
+    return build_error_index(load_json(ERROR_MAP), pieces, is_partial_registry(source))
+
+
+def test_shipped_map_builds_with_auth_table(shipped):
+    index, errors, _ = shipped
+    assert errors == []
+    assert index["piece_auth"]["gmail"] == "oauth2"
+    found = codes(lookup(index, 401, "gmail"))
+    assert found[0] == "AUTH_TOKEN_EXPIRED"
+    assert "AUTH_OAUTH_REVOKED" in found
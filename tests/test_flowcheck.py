@@ -0,0 +1,116 @@
+"""Phase 31: التحقق من الـ Flows (check_flow / check_batch)"""
+
+import json
+
+import pytest
+
+from siyadah.data import FLOWS_DIR, load_flows, load_registry, load_tool_details
+from siyadah.flowcheck import WARNING_RULES, build_knowledge, check_batch, check_flow, init_worker, resolve
+
+PIECES = [{"id": "whatsapp", "actions": [{"name": "sendMessage"}], "triggers": []},
+          {"id": "code", "actions": [{"name": "run_code"}], "triggers": []}]
+DETAILS = {"webhook": {"triggers": {"catch_webhook": {}}, "actions": {}},
+           "openai": {"actions": {"ask_chatgpt": {"props": [{"name": "prompt", "required": True},
+                                                            {"name": "stream", "required": True, "type": "CHECKBOX"}]}},
+                      "triggers": {}}}
+
+
+@pytest.fixture(scope="module")
+def kb():
+    return build_knowledge(PIECES, DETAILS)
+
+
+def flow(**extra):
+    base = {"trigger": {"tool_id": "webhook", "action": "catch_webhook"},
+            "steps": [{"id": "classify", "order": 1, "tool_id": "openai", "action": "ask_chatgpt",
+                       "input_mapping": {"prompt": "x"}, "output": {"lead_type": "hot|warm|cold"}},
+                      {"id": "send", "order": 2, "tool_id": "whatsapp", "action": "send_message",
+                       "input_mapping": {"text": "{{step.classify.lead_type}}"}}]}
+    base.update(extra)
+    return base
+
+
+def rules(problems):
+    return sorted({r for r, _ in problems})
+
+
+def test_valid_flow_with_folded_names(kb):
+    assert check_flow(flow(), kb) == []
+
+
+def test_aliases_resolve_template_names():
+    assert resolve("code", "run_javascript") == ("code", "runcode")
+    assert resolve("telegram", "send_text_message") == ("telegram-bot", "sendtextmessage")
+    assert resolve("slack", "send_message") == ("slack", "sendchannelmessage")
+    assert resolve("gmail", None) == ("gmail", None)
+
+
+def test_unknown_names_and_refs(kb):
+    f = flow()
+    f["trigger"]["action"] = "new_row"
+    f["steps"][1]["tool_id"] = "gogle-sheets"
+    f["steps"].append({"id": "send", "tool_id": "code", "action": "run_python", "contains_steps": [9]})
+    f["steps"][0]["input_mapping"]["prompt"] = "{{step.missing.x}}"
+    assert rules(check_flow(f, kb)) == ["bad_contains_steps", "bad_step_ref", "duplicate_step_id",
+                                        "unknown_action", "unknown_piece", "unknown_trigger"]
+
+
+def test_missing_prop_is_warning_and_checkbox_ignored(kb):
+    f = flow()
+    f["steps"][0]["input_mapping"] = {}
+    problems = check_flow(f, kb)
+    assert problems == [("missing_prop", "steps[classify]: openai.ask_chatgpt يحتاج 'prompt'")]
+    assert {r for r, _ in problems} <= WARNING_RULES
+
+
+def test_branch_routes_checked_against_output_enum(kb):
+    step = {"id": "alert", "tool_id": "whatsapp", "action": "sendMessage"}
+    ok = flow(branches=[{"after_step": "classify", "condition_field": "lead_type",
+                         "routes": {"hot": {"additional_steps": [step]}, "default": {}}}])
+    assert check_flow(ok, kb) == []
+    bad = flow(branches=[{"after_step": "classify", "condition_field": "lead_type",
+                          "routes": {"urgent": {"additional_steps": []}}}])
+    assert rules(check_flow(bad, kb)) == ["bad_branch_route"]
+    missing = flow(branches=[{"after_step": "nope", "routes": {}}])
+    assert rules(check_flow(missing, kb)) == ["bad_after_step"]
+
+
+def test_malformed_routes_do_not_crash(kb):
+    f = flow(branches=[{"after_step": "classify", "condition_field": "lead_type", "routes": [1, "x", None]},
+                       "oops", {"routes": {"hot": ["not", "a", "route"], "warm": {"steps": [3]}}}])
+    f["steps"][0]["on_error"] = {"chain": ["telegram", None]}
+    assert check_flow(f, kb) == []
+
+
+def test_unhashable_fields_are_reported(kb):
+    f = flow()
+    f["steps"][0]["tool_id"] = ["openai"]
+    f["steps"][1]["contains_steps"] = [[1], 2]
+    f["steps"].append({"id": {"x": 1}, "order": [3], "tool_id": "code", "action": "run_code",
+                       "contains_steps": 5, "input_mapping": ["prompt"]})
+    f["branches"] = [{"after_step": ["classify"], "condition_field": {"a": 1}, "routes": {}}]
+    assert rules(check_flow(f, kb)) == ["bad_after_step", "bad_contains_steps", "bad_field_type"]
+    assert rules(check_flow(flow(steps={"a": 1}, branches=3), kb)) == ["bad_field_type"]
+
+
+def test_check_batch_counts_failures_and_warnings(kb):
+    init_worker(kb)
+    warn = flow()
+    warn["steps"][0]["input_mapping"] = {}
+    report = check_batch([("ok", json.dumps(flow())), ("warn", warn), ("bad", "{"), ("list", [])])
+    assert (report["flows"], report["failed"], report["warned"]) == (4, 2, 1)
+    assert report["rules"]["parse"] == 2
+    assert report["examples"][0] == {"source": "warn",
+                                     "problems": [["missing_prop", "steps[classify]: openai.ask_chatgpt يحتاج 'prompt'"]]}
+
+
+def test_shipped_flows_only_report_known_mismatches():
+    """twilio/telegram-bot في السجل ما لهم غير custom_api_call — بدائل on_error في القوالب تنرفض"""
+    pieces, _ = load_registry()
+    kb = build_knowledge(pieces, load_tool_details())
+    for fid, f in load_flows(FLOWS_DIR).items():
+        errors = [(r, m) for r, m in check_flow(f, kb) if r not in WARNING_RULES]
+        for rule, message in errors:
+            assert rule == "unknown_action", (fid, message)
+            assert ".on_error.chain[" in message, (fid, message)
+            assert "'send_sms' غير موجود في twilio" in message or "'send_text_message' غير موجود في telegram" in message
@@ -0,0 +1,202 @@
+"""Phase 42: محاكاة الحِمل (compile_flow / simulate)"""
+
+import pytest
+
+from siyadah.data import load_flows
+from siyadah.loadsim import (DAY, HOUR, LOAD_FIELDS, PLAN_MIX, PLANS, ZERO, compile_flow, describe,
+                             hourly_profile, make_population, peak, rate_limit, simulate, step_cost)
+
+
+@pytest.fixture(scope="module")
+def flows():
+    return load_flows()
+
+
+def webhook_flow(fid, steps, limit=None):
+    flow = {"_meta": {"id": fid}, "trigger": {"tool_id": "webhook", "action": "catch_webhook"}, "steps": steps}
+    if limit:
+        flow["protection"] = {"rate_limit": limit}
+    return flow
+
+
+def send(order):
+    return {"id": f"send_{order}", "order": order, "tool_id": "whatsapp", "action": "send_message"}
+
+
+def plans_with(messages, ai_calls=1000):
+    return {"solo": {"name": "تجربة", "automations": -1, "messages": messages, "ai_calls": ai_calls}}
+
+# ============================================================
+# 1. تحويل الـ flow
+# ============================================================
+
+def test_step_cost():
+    assert step_cost({"tool_id": "whatsapp", "action": "send_message"}) == (1, 1, 0)
+    assert step_cost({"tool_id": "whatsapp", "action": "get_profile"}) == (0, 1, 0)
+    assert step_cost({"tool_id": "openai", "action": "ask_chatgpt"}) == (0, 1, 1)
+    assert step_cost({"tool_id": "code", "action": "run_javascript"}) == ZERO
+
+
+def test_rate_limit():
+    assert rate_limit({"protection": {"rate_limit": "Max 50 messages per customer/day"}}) == (50, DAY)
+    assert rate_limit({"protection": {"rate_limit": "max 500 leads / hour"}}) == (500, HOUR)
+    assert rate_limit({"protection": {"rate_limit": "بدون حد"}}) is None
+    assert rate_limit({}) is None
+
+
+def test_delays_split_segments(flows):
+    model = compile_flow(flows["customer-journey"])
+    assert [s["delay"] for s in model["segments"]] == [3 * DAY, 4 * DAY, 7 * DAY, None]
+    lines = describe(model)
+    assert len(lines) == 4
+    assert lines[0].endswith("—3d→") and "→" not in lines[-1]
+
+
+def test_short_delay_after_loop_is_spacing(flows):
+    model = compile_flow(flows["invoice-collection"])
+    assert model["has_loop"] and model["schedule"][0] == "every_day"
+    assert len(model["segments"]) == 1
+    loop = [u for u in model["segments"][0]["units"] if u[0] == "loop"]
+    assert len(loop) == 1
+    assert loop[0][1][0] == 1 and loop[0][3] == 3
+
+
+def test_branch_routes_follow_output_enum():
+    flow = webhook_flow("branchy", [{"id": "classify", "order": 1, "tool_id": "openai", "action": "ask",
+                                     "output": {"label": "hot|warm|cold"}}])
+    flow["branches"] = [{"after_step": "classify", "condition_field": "label",
+                         "routes": {"hot": {"additional_steps": [send(2)]}}}]
+    units = compile_flow(flow)["segments"][0]["units"]
+    assert units == [("steps", (0, 1, 1), [([1, 2, 3], [(1, 1, 0), ZERO, ZERO])])]
+
+# ============================================================
+# 2. السكان
+# ============================================================
+
+def test_population_respects_automation_limits(flows):
+    models = [compile_flow(f) for f in flows.values()]
+    tenants = make_population(500, models, seed=3)
+    assert tenants == make_population(500, models, seed=3)
+    assert {t["plan"] for t in tenants} <= set(PLAN_MIX)
+    for t in tenants:
+        limit = PLANS[t["plan"]]["automations"]
+        expected = len(models) if limit < 0 else min(limit, len(models))
+        assert len(t["flows"]) == expected
+        assert t["flows"] == sorted(set(t["flows"]))
+        assert t["scale"] > 0
+
+
+def test_population_mix():
+    models = [compile_flow(webhook_flow("one", [send(1)]))]
+    tenants = make_population(50, models, mix={"basic": 1.0})
+    assert {t["plan"] for t in tenants} == {"basic"}
+
+# ============================================================
+# 3. المحاكاة
+# ============================================================
+
+def test_simulate_is_deterministic_and_consistent(flows):
+    models = [compile_flow(f) for f in flows.values()]
+    tenants = make_population(40, models, seed=1)
+    a = simulate(models, tenants, days=10, seed=5)
+    b = simulate(models, tenants, days=10, seed=5)
+    assert a["load"] == b["load"] and a["flows"] == b["flows"]
+    assert set(a["load"]) == set(LOAD_FIELDS)
+    assert all(len(a["load"][f]) == 10 * 24 for f in LOAD_FIELDS)
+    assert a["executions"] == sum(s.get("executions", 0) for s in a["flows"].values())
+    assert sum(a["load"]["messages"]) == sum(s.get("messages", 0) for s in a["flows"].values())
+    assert a["executions"] > 0 and a["events"] >= a["executions"]
+
+
+def test_quota_blocks_after_limit():
+    models = [compile_flow(webhook_flow("busy", [send(1)]))]
+    models[0]["event_rate"] = 50
+    tenants = [{"plan": "solo", "scale": 1.0, "flows": [0]}]
+    result = simulate(models, tenants, days=10, seed=2, plans=plans_with(20), period_days=5)
+    load = result["load"]
+    assert sum(load["messages"][:5 * 24]) == 20
+    assert sum(load["messages"][5 * 24:]) == 20
+    assert sum(load["blocked"]) == result["executions"] - 40
+    row = result["plans"]["solo"]["messages"]
+    assert row["exhausted"] == 2 and row["exhausted_pct"] == 100.0
+    assert 0 < row["first_day"] < 5
+
+
+def test_rate_limit_throttles_runs():
+    models = [compile_flow(webhook_flow("limited", [send(1)], limit="Max 3 runs/day"))]
+    models[0]["event_rate"] = 40
+    tenants = [{"plan": "solo", "scale": 1.0, "flows": [0]}]
+    result = simulate(models, tenants, days=7, seed=4, plans=plans_with(-1))
+    runs = result["load"]["executions"]
+    assert all(sum(runs[d * 24:(d + 1) * 24]) <= 3 for d in range(7))
+    assert result["flows"]["limited"]["throttled"] > 0
+
+
+def test_weekly_schedule_runs_on_its_day(flows):
+    models = [compile_flow(flows["weekly-report"])]
+    tenants = [{"plan": "solo", "scale": 1.0, "flows": [0]}]
+    result = simulate(models, tenants, days=21, seed=1, plans=plans_with(-1, -1))
+    runs = result["load"]["executions"]
+    assert [h for h, n in enumerate(runs) if n] == [9, 7 * 24 + 9, 14 * 24 + 9]
+
+
+def test_delayed_segments_past_horizon_are_pending(flows):
+    models = [compile_flow(flows["customer-journey"])]
+    tenants = [{"plan": "solo", "scale": 1.0, "flows": [0]}]
+    result = simulate(models, tenants, days=2, seed=1, plans=plans_with(-1))
+    stats = result["flows"]["customer-journey"]
+    assert stats["executions"] > 0
+    assert stats["pending"] == stats["executions"]
+    assert sum(result["load"]["messages"]) == stats["executions"]
+
+def loop_flow(fid, before=(), after=(), limit=None):
+    """[before...] → loop[send، delay 10m] → [after...]"""
+    steps = list(before)
+    n = len(steps)
+    steps += [{"id": "each", "order": n + 1, "tool_id": "loop", "action": "for_each", "contains_steps": [n + 2, n + 3]},
+              send(n + 2),
+              {"id": "gap", "order": n + 3, "tool_id": "delay", "config": {"amount": 10, "unit": "minutes"}}]
+    steps += [dict(s, order=n + 4 + i) for i, s in enumerate(after)]
+    return webhook_flow(fid, steps, limit)
+
+
+def test_steps_after_loop_past_horizon_are_pending():
+    email = {"id": "summary", "tool_id": "gmail", "action": "send_email"}
+    models = [compile_flow(loop_flow("late", after=[email]))]
+    models[0]["loop_items"] = 40
+    tenants = make_population(200, models, mix={"business": 1.0}, seed=2)
+    result = simulate(models, tenants, days=2, seed=3, plans=PLANS)
+    stats = result["flows"]["late"]
+    assert stats["pending"] > 0
+    assert sum(result["load"]["messages"]) == stats["messages"]
+
+
+def test_loop_after_delay_draws_items():
+    wait = {"id": "wait", "order": 2, "tool_id": "delay", "config": {"amount": 1, "unit": "days"}}
+    model = compile_flow(loop_flow("later", before=[send(1), wait]))
+    assert [s["loop"] for s in model["segments"]] == [False, True]
+    tenants = [{"plan": "solo", "scale": 1.0, "flows": [0]}]
+    result = simulate([model], tenants, days=10, seed=1, plans=plans_with(-1))
+    stats = result["flows"]["later"]
+    assert stats["loop_items"] > 0
+    assert stats["messages"] == stats["executions"] + stats["loop_items"]
+
+    limited = compile_flow(loop_flow("later", before=[send(1), wait], limit="Max 2 items/day"))
+    result = simulate([limited], tenants, days=10, seed=1, plans=plans_with(-1))
+    stats = result["flows"]["later"]
+    assert stats["throttled"] > 0
+    assert stats["loop_items"] <= 2 * 10
+
+# ============================================================
+# 4. التقارير
+# ============================================================
+
+def test_hourly_profile_and_peak():
+    series = [0] * 48
+    series[9] = 4
+    series[24 + 9] = 2
+    series[30] = 7
+    profile = hourly_profile(series, 2)
+    assert profile[9] == 3 and profile[6] == 3.5 and sum(profile) == 6.5
+    assert peak(series) == (30, 7, 2)
+    assert peak([]) == (0, 0, 0)
@@ -0,0 +1,61 @@
+"""Phase 27: قوالب الرسائل المُجمّعة (render / render_batch)"""
+
+from siyadah.data import load_messages
+from siyadah.messages import compile_messages, compile_template, render, render_batch
+
+TEMPLATE = {
+    "id": "t",
+    "text": "مرحبا {{customer.name}} — فاتورة {{invoice.number}} من {{company.company_name}}",
+    "variables_used": ["customer.name", "invoice.number", "company.company_name"],
+}
+SHARED = {"company.company_name": "شركة 100%"}
+COLUMNS = {"customer.name": "الاسم", "invoice.number": "رقم_الفاتورة"}
+FALLBACKS = {"customer.name": "عميلنا الكريم"}
+
+
+def compiled(**extra):
+    c, errors, _ = compile_template(dict(TEMPLATE, **extra))
+    assert errors == []
+    return c
+
+
+def test_shipped_templates_compile_clean():
+    _, errors, _ = compile_messages(load_messages())
+    assert errors == []
+
+
+def test_undeclared_variable_is_error():
+    _, errors, _ = compile_template({"text": "{{x.y}}", "variables_used": []}, "w")
+    assert errors and "x.y" in errors[0]
+
+
+def test_batch_matches_single_render():
+    c = compiled()
+    rows = [{"الاسم": "أحمد", "رقم_الفاتورة": "INV-1"}, {"الاسم": "سارة", "رقم_الفاتورة": 7}]
+    out, violations = render_batch(c, rows, SHARED, COLUMNS, FALLBACKS)
+    assert violations == []
+    for row, text in zip(rows, out):
+        values = dict(SHARED, **{"customer.name": row["الاسم"], "invoice.number": row["رقم_الفاتورة"]})
+        assert text == render(c, values, FALLBACKS)
+    assert "شركة 100%" in out[0]
+
+
+def test_missing_none_and_empty_cells_use_fallback():
+    c = compiled()
+    rows = [{"رقم_الفاتورة": "1"}, {"الاسم": None, "رقم_الفاتورة": "2"}, {"الاسم": "", "رقم_الفاتورة": "3"}]
+    out, _ = render_batch(c, rows, SHARED, COLUMNS, FALLBACKS)
+    assert all(t.startswith("مرحبا عميلنا الكريم —") for t in out)
+    assert "None" not in "".join(out)
+    assert render(c, {"customer.name": ""}, FALLBACKS).startswith("مرحبا عميلنا الكريم")
+
+
+def test_overflow_modes():
+    c = compiled(max_length=60)
+    rows = [{"الاسم": "ا" * 50, "رقم_الفاتورة": "1"}, {"الاسم": "ب", "رقم_الفاتورة": "2"}]
+    out, violations = render_batch(c, rows, SHARED, COLUMNS, FALLBACKS)
+    assert [v[0] for v in violations] == [0]
+    assert len(out[0]) == 60 and out[0].endswith("…")
+    skipped, _ = render_batch(c, rows, SHARED, COLUMNS, FALLBACKS, on_overflow="skip")
+    assert skipped[0] is None and skipped[1] == out[1]
+    kept, _ = render_batch(c, rows, SHARED, COLUMNS, FALLBACKS, on_overflow="keep")
+    assert len(kept[0]) > 60
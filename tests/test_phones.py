@@ -0,0 +1,43 @@
+"""Phase 40: تطبيع أرقام الجوال (normalize_phone / normalize_column)"""
+
+import pytest
+
+from siyadah.phones import normalize_column, normalize_phone
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("0501234567", ("+966501234567", True, "SA", "mobile")),
+    ("٠٥٠ ١٢٣ ٤٥٦٧", ("+966501234567", True, "SA", "mobile")),
+    ("501234567", ("+966501234567", True, "SA", "mobile")),
+    ("966501234567", ("+966501234567", True, "SA", "mobile")),
+    ("00966 50 123 4567", ("+966501234567", True, "SA", "mobile")),
+    ("+966 050-123-4567", ("+966501234567", True, "SA", "mobile")),
+    ("‎+966 (55) 123.4567", ("+966551234567", True, "SA", "mobile")),
+    (966501234567.0, ("+966501234567", True, "SA", "mobile")),
+    ("0112345678", ("+966112345678", True, "SA", "landline")),
+    ("00971501234567", ("+971501234567", True, "AE", "mobile")),
+    ("+96555123456", ("+96555123456", True, "KW", "mobile")),
+    ("97455123456", ("+97455123456", True, "QA", "mobile")),
+    ("+12025550123", ("+12025550123", False, None, "not_gcc")),
+    ("+9665012", ("+9665012", False, "SA", "bad_format")),
+    ("12345", ("12345", False, "SA", "bad_format")),
+    ("", ("", False, None, "empty")),
+    (None, ("", False, None, "empty")),
+])
+def test_normalize_phone(value, expected):
+    assert normalize_phone(value) == expected
+
+
+def test_default_country_for_local_numbers():
+    assert normalize_phone("0501234567", "AE") == ("+971501234567", True, "AE", "mobile")
+    assert normalize_phone("55123456", "KW") == ("+96555123456", True, "KW", "mobile")
+
+
+def test_normalize_column_report():
+    values = ["0501234567", "0501234567", "+966501234567", "12345", "", "0112345678"]
+    formatted, valid, report = normalize_column(values)
+    assert formatted == ["+966501234567"] * 3 + ["12345", "", "+966112345678"]
+    assert valid == [True, True, True, False, False, True]
+    assert (report["rows"], report["unique"], report["valid"], report["changed"]) == (6, 5, 4, 3)
+    assert report["kinds"] == {"mobile": 3, "landline": 1}
+    assert report["invalid"] == {"bad_format": 1, "empty": 1}
@@ -0,0 +1,57 @@
+"""Phase 32: قياس أداء السجل (compare / change_label / generate_tree)"""
+
+import json
+import os
+
+from siyadah.regbench import change_label, compare, generate_tree, load_script
+
+BASELINE = {"sizes": {"1000": {
+    "load_all_pieces": {"seconds": 0.1, "peak_kb": 1000.0},
+    "cmd_list": {"seconds": 0.0, "peak_kb": 0.0},
+}}}
+
+
+def test_compare_flags_only_real_regressions():
+    results = {"1000": {
+        "load_all_pieces": {"seconds": 0.2, "peak_kb": 1010.0},   # زمن ×2، ذاكرة ضمن الحد
+        "cmd_list": {"seconds": 0.003, "peak_kb": 500.0},         # زمن تحت حد الضجيج
+        "build_registry": {"seconds": 9.0, "peak_kb": 9.0},       # ما له baseline
+    }}
+    assert compare(results, BASELINE, 0.25) == [
+        ("1000", "load_all_pieces", "seconds", 0.1, 0.2),
+        ("1000", "cmd_list", "peak_kb", 0.0, 500.0),
+    ]
+
+
+def test_change_label_handles_zero_baseline():
+    assert change_label(0.1, 0.2) == "+100%"
+    assert change_label(0.0, 500.0) == "+500.0 (baseline = 0)"
+    assert change_label(0, 3) == "+3 (baseline = 0)"
+
+
+def test_generate_tree(tmp_path):
+    n_flows = generate_tree(str(tmp_path), 20)
+    pieces = os.listdir(tmp_path / "data" / "registry" / "pieces")
+    assert len(pieces) == 20 and n_flows == 6
+    with open(tmp_path / "data" / "flows" / "synthetic-flow-0.json", encoding="utf-8") as f:
+        flow = json.load(f)
+    assert flow["steps"] and flow["branches"][0]["after_step"] == flow["steps"][0]["id"]
+
+
+def run_bench(monkeypatch, *args):
+    script = load_script("bench-registry.py")
+    monkeypatch.setattr(script.sys, "argv", ["bench-registry.py", "--sizes", "20", "--repeat", "1", *args])
+    try:
+        script.main()
+    except SystemExit as e:
+        return e.code
+    return 0
+
+
+def test_missing_baseline_fails_the_gate(tmp_path, monkeypatch):
+    baseline = str(tmp_path / "baseline.json")
+    assert run_bench(monkeypatch, "--baseline", baseline) == 2
+    assert run_bench(monkeypatch, "--baseline", baseline, "--no-gate") == 0
+    assert run_bench(monkeypatch, "--baseline", baseline, "--save-baseline") == 0
+    assert os.path.exists(baseline)
+    assert run_bench(monkeypatch, "--baseline", baseline, "--threshold", "1000") == 0
@@ -0,0 +1,71 @@
+"""Phase 29: تصنيف سجلات التشغيل (extract_failure / triage)"""
+
+import gzip
+import json
+
+import pytest
+
+from siyadah.data import ERROR_MAP, is_partial_registry, load_json, load_registry
+from siyadah.errors import build_error_index, classify_failure
+from siyadah.runlogs import extract_failure, triage
+
+RUNS = [
+    {"status": "SUCCEEDED", "flowId": "f1"},
+    {"status": "FAILED", "projectId": "t1", "flowId": "f1",
+     "failedStep": {"pieceName": "@activepieces/piece-gmail", "statusCode": 401,
+                    "errorMessage": "invalid_grant: Token has been expired or revoked"}},
+    {"status": "FAILED", "tenant_id": "t2", "flow_id": "f2",
+     "steps": {"s1": {"status": "SUCCEEDED"},
+               "s2": {"status": "FAILED", "pieceName": "slack", "errorMessage": "Error 429: Too Many Requests"}}},
+    {"status": "TIMEOUT", "tenant_id": "t2"},
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    pieces, source = load_registry()
+    return build_error_index(load_json(ERROR_MAP), pieces, is_partial_registry(source))[0]
+
+
+def test_extract_failure():
+    assert extract_failure(RUNS[0]) is None
+    assert extract_failure(RUNS[1]) == ("t1", "f1", "gmail", 401,
+                                        "invalid_grant: Token has been expired or revoked")
+    tenant, flow, piece, status, _ = extract_failure(RUNS[2])
+    assert (tenant, flow, piece, status) == ("t2", "f2", "slack", 429)
+    assert extract_failure(RUNS[3])[4] == "flow execution timeout"
+
+
+def test_message_picks_between_status_candidates(index):
+    entry, method = classify_failure(index, 401, "gmail", "invalid_grant")
+    assert (entry["code"], method) == ("AUTH_TOKEN_EXPIRED", "message")
+    entry, method = classify_failure(index, None, "slack", "channel_not_found")
+    assert (entry["code"], method) == ("CHANNEL_NOT_FOUND", "message")
+
+
+def test_triage_gzip_stream(tmp_path, index):
+    path = tmp_path / "runs.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for rec in RUNS * 5:
+            f.write(json.dumps(rec) + "\n")
+        f.write("{not json\n")
+    summary = triage([str(path)], index, workers=1, batch_lines=7)
+    assert (summary["lines"], summary["bad_lines"], summary["failures"]) == (21, 1, 15)
+    assert summary["by_code"]["AUTH_TOKEN_EXPIRED"] == 5
+    assert summary["by_code"]["RATE_LIMIT_EXCEEDED"] == 5
+    assert summary["by_tenant"] == {"t1": 5, "t2": 10}
+    assert len(summary["examples"]["AUTH_TOKEN_EXPIRED"]) <= 3
+
+
+@pytest.mark.parametrize("files", [1, 3])
+def test_triage_pool_matches_single_process(tmp_path, index, files):
+    paths = []
+    for i in range(files):
+        path = tmp_path / f"runs-{i}.jsonl"
+        path.write_text("".join(json.dumps(rec) + "\n" for rec in RUNS * 4), encoding="utf-8")
+        paths.append(str(path))
+    single = triage(paths, index, workers=1, batch_lines=5)
+    pooled = triage(paths, index, workers=2, batch_lines=5)
+    for key in ("lines", "failures", "by_code", "by_tenant", "by_piece"):
+        assert pooled[key] == single[key]
+    assert single["failures"] == 12 * files
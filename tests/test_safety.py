@@ -0,0 +1,48 @@
+"""Phase 30: الكلمات المحظورة (Aho-Corasick + حدود الكلمة العربية)"""
+
+from siyadah import arabic
+from siyadah.automaton import Automaton
+from siyadah.safety import build_scanner, max_chars_rule, scan_batch, scan_text
+
+SCANNER = build_scanner(["دين", "سياسة", "قمار"])
+
+
+def words(found):
+    return [w for _, _, w in found]
+
+
+def test_automaton_finds_overlapping_matches():
+    a = Automaton()
+    for w in ("he", "she", "hers"):
+        a.add(w, w)
+    a.build()
+    assert sorted(w for _, _, w in a.findall("ushers")) == ["he", "hers", "she"]
+
+
+def test_normalize_folds_marks_and_hamza():
+    assert arabic.normalize("إِسْلام") == arabic.normalize("اسلام")
+    assert arabic.normalize_digits("٠٥٠١") == "0501"
+
+
+def test_whole_word_with_proclitics():
+    assert words(scan_text(SCANNER, "والدين")) == ["دين"]
+    assert words(scan_text(SCANNER, "بالسياسة")) == ["سياسة"]
+    assert scan_text(SCANNER, "مدينة الرياض") == []
+    assert words(scan_text(SCANNER, "مدينة الرياض", whole_word=False)) == ["دين"]
+
+
+def test_offsets_point_into_original_text():
+    text = "عن الـسِّـيـاسـة"
+    (start, end, word), = scan_text(SCANNER, text)
+    assert word == "سياسة"
+    assert text[start:end] == "سِّـيـاسـة"
+
+
+def test_scan_batch_kinds():
+    violations = scan_batch(SCANNER, ["مرحبا", None, "ق" * 20, "لا للقمار"], ids=["a", "b", "c", "d"], max_chars=10)
+    assert [(v["id"], v["kind"]) for v in violations] == [("c", "too_long"), ("d", "banned_word")]
+
+
+def test_max_chars_rule():
+    assert max_chars_rule({"_meta": {"safety_rules": ["Max 300 characters per message"]}}) == 300
+    assert max_chars_rule({}) == 500
@@ -0,0 +1,121 @@
+"""Phase 36: خدمة السجل المشتركة (dispatch / Metrics / registry-daemon)"""
+
+import asyncio
+import json
+
+import pytest
+
+from siyadah.regbench import load_script
+from siyadah.service import OTHER_OP, Metrics, RequestError, build_state, dispatch
+
+
+@pytest.fixture(scope="module")
+def state():
+    return build_state()
+
+
+def test_dispatch_ops(state):
+    assert dispatch(state, "piece", {"id": "gmail"})["id"] == "gmail"
+    assert "google-sheets" in [p["id"] for p in dispatch(state, "search", {"q": "sheets"})]
+    assert dispatch(state, "flow", {"id": "lead-capture"})["steps"]
+    assert dispatch(state, "health", {})["pieces"] == len(state["pieces"])
+    result = dispatch(state, "validate", {"piece": "gmail", "action": "send_email"})
+    assert "problems" in result
+    with pytest.raises(RequestError):
+        dispatch(state, "piece", {})
+    with pytest.raises(RequestError):
+        dispatch(state, "nope", {})
+
+
+def test_metrics_collapse_unknown_ops():
+    m = Metrics(window=4)
+    for i in range(100):
+        m.record(f"random-{i}", 0.001, ok=False)
+    m.record(["not", "hashable"], 0.001)
+    m.record("piece", 0.002)
+    report = m.report()
+    assert set(report["ops"]) == {OTHER_OP, "piece"}
+    assert report["ops"][OTHER_OP]["count"] == 101 and report["ops"][OTHER_OP]["errors"] == 100
+    assert len(m.latency[OTHER_OP]) == 4
+
+
+def test_socket_survives_bad_requests(tmp_path):
+    daemon = load_script("registry-daemon.py").Daemon()
+    lines = [b"[1]\n", b"not json\n", b'{"op": "search", "q": 5}\n', b'{"op": ["x"]}\n',
+             b'{"op": "piece", "id": "gmail"}\n']
+
+    async def go():
+        path = str(tmp_path / "d.sock")
+        server = await asyncio.start_unix_server(daemon.serve_socket, path)
+        async with server:
+            reader, writer = await asyncio.open_unix_connection(path)
+            replies = []
+            for line in lines:
+                writer.write(line)
+                replies.append(json.loads(await reader.readline()))
+            writer.close()
+            return replies
+
+    replies = asyncio.run(go())
+    assert [r["ok"] for r in replies] == [False, False, False, False, True]
+    assert replies[-1]["data"]["id"] == "gmail"
+    assert set(daemon.metrics.report()["ops"]) <= {OTHER_OP, "search", "piece"}
+
+
+def test_oversized_lines_get_an_error_reply(tmp_path):
+    module = load_script("registry-daemon.py")
+    daemon = module.Daemon()
+    huge = b'{"op": "search", "q": "' + b"x" * (module.LINE_LIMIT + 10) + b'"}\n'
+
+    async def go():
+        path = str(tmp_path / "d.sock")
+        sock = await asyncio.start_unix_server(daemon.serve_socket, path, limit=module.LINE_LIMIT)
+        http = await asyncio.start_server(daemon.serve_http, "127.0.0.1", 0, limit=module.LINE_LIMIT)
+        port = http.sockets[0].getsockname()[1]
+        async with sock, http:
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(huge)
+            reply = json.loads(await reader.readline())
+            writer.close()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /search?q=" + b"x" * (module.LINE_LIMIT + 10) + b" HTTP/1.1\r\n\r\n")
+            status = await reader.readline()
+            writer.close()
+
+            # الخدمة نفسها لسا شغالة
+            reader, writer = await asyncio.open_unix_connection(path)
+            writer.write(b'{"op": "piece", "id": "gmail"}\n')
+            after = json.loads(await reader.readline())
+            writer.close()
+            return reply, status, after
+
+    reply, status, after = asyncio.run(go())
+    assert reply["ok"] is False and str(module.LINE_LIMIT) in reply["error"]
+    assert status.startswith(b"HTTP/1.1 431")
+    assert after["ok"] is True
+
+
+def test_watch_survives_broken_reload(monkeypatch, capsys):
+    module = load_script("registry-daemon.py")
+    daemon = module.Daemon()
+    old = daemon.state
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise KeyError("actions")
+
+    monkeypatch.setattr(module, "snapshot", lambda: "changed")
+    monkeypatch.setattr(module, "build_state", broken)
+
+    async def go():
+        task = asyncio.ensure_future(daemon.watch(0.01))
+        await asyncio.sleep(0.1)
+        alive = not task.done()
+        task.cancel()
+        return alive
+
+    assert asyncio.run(go())
+    assert len(calls) > 1 and daemon.state is old
+    assert "KeyError" in capsys.readouterr().out
@@ -0,0 +1,71 @@
+"""Phase 38: إحصائيات الشيتات (overdue / weekly_stats)"""
+
+import io
+from datetime import date, timedelta
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from siyadah.sheetstats import (REMINDER_LEVELS, build_sheet, csv_columns, overdue, read_export, reminder_levels,
+                                sheet_schema, typed_column, weekly_stats)
+
+TODAY = date(2026, 10, 19)
+
+
+def invoices(rows):
+    """rows: [(days_overdue|None|str, amount, status)]"""
+    due = [(TODAY - timedelta(days=d)).isoformat() if isinstance(d, int) else (d or "") for d, _, _ in rows]
+    raw = {"رقم_الفاتورة": [f"INV-{i}" for i in range(len(rows))], "تاريخ_الاستحقاق": due,
+           "المبلغ": [a for _, a, _ in rows], "الحالة": [s for _, _, s in rows],
+           "عدد_التذكيرات": ["1"] * len(rows)}
+    return build_sheet(raw, sheet_schema("invoices"), name="invoices",
+                       column_types={"الحالة": "enum:مدفوعة|غير مدفوعة"})
+
+
+def test_reminder_thresholds_match_js():
+    days = np.array([-5, 0, 1, 3, 4, 7, 8, 14, 15, 90])
+    names = [REMINDER_LEVELS[i] for i in reminder_levels(days)]
+    assert names == ["gentle", "gentle", "gentle", "gentle", "firm", "firm", "urgent", "urgent",
+                     "escalation", "escalation"]
+
+
+def test_overdue_summary():
+    sheet = invoices([(3, "1,000 ر.س", "غير مدفوعة"), (4, "٢٥٠", "غير مدفوعة"), (14, "100.50", "غير مدفوعة"),
+                      (15, "10", "غير مدفوعة"), (30, "999", "مدفوعة"), (-2, "5", "غير مدفوعة"),
+                      (None, "7", "غير مدفوعة"), ("قريباً", "7", "غير مدفوعة")])
+    summary, rows = overdue(sheet, TODAY)
+    assert (summary["invoices"], summary["selected"], summary["invalid_due"], summary["not_due"]) == (8, 5, 2, 1)
+    levels = summary["levels"]
+    assert {k: v["count"] for k, v in levels.items()} == {"gentle": 2, "firm": 1, "urgent": 1, "escalation": 1}
+    assert levels["gentle"]["amount"] == 1005.0 and levels["firm"]["amount"] == 250.0
+    assert levels["urgent"]["max_days"] == 14 and levels["escalation"]["max_days"] == 15
+    assert levels["gentle"]["reminders_sent"] == 2
+    assert summary["total_amount"] == 1365.5
+    assert list(rows["days"][:4]) == [3, 4, 14, 15]
+
+
+def test_weekly_stats_window():
+    leads = build_sheet({"التاريخ": ["2026-10-12", "2026-10-18", "2026-10-19", ""],
+                         "النوع": ["hot", "Hot ", "cold", "warm"], "المصدر": ["واتساب", "واتساب", "ويب", ""]},
+                        [("التاريخ", "date"), ("النوع", "enum:hot|warm|cold"), ("المصدر", "enum:*")], name="leads")
+    stats = weekly_stats(leads, None, date(2026, 10, 12))
+    assert (stats["total_leads"], stats["hot"], stats["warm"], stats["cold"]) == (2, 2, 0, 0)
+    assert stats["by_source"] == {"واتساب": 2}
+    assert weekly_stats(leads)["total_leads"] == 4
+
+
+def test_numbers_fast_path_and_cleaning():
+    clean, _ = typed_column(["1500", "٣٠٠", "-2.5"], "number")
+    assert clean.tolist() == [1500.0, 300.0, -2.5]
+    messy, _ = typed_column(["1,500 ر.س", "٢٥٠٫٥", "", "abc", "12"], "currency_sar")
+    assert messy[:2].tolist() == [1500.0, 250.5] and messy[4] == 12.0
+    assert np.isnan(messy[2]) and np.isnan(messy[3])
+
+
+def test_csv_columns_pads_short_rows(tmp_path):
+    path = tmp_path / "invoices.csv"
+    path.write_text('\ufeffرقم_الفاتورة,المبلغ,الحالة\nINV-1,"1,500 ر.س",مدفوعة\n\nINV-2\n', encoding="utf-8")
+    assert read_export(str(path)) == {"رقم_الفاتورة": ["INV-1", "INV-2"], "المبلغ": ["1,500 ر.س", ""],
+                                      "الحالة": ["مدفوعة", ""]}
+    assert csv_columns(io.StringIO("a,b\n")) == {"a": [], "b": []}
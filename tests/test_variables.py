@@ -0,0 +1,76 @@
+"""Phase 37: محلّل مصادر المتغيرات (compile_source / resolve_batch)"""
+
+import pytest
+
+from siyadah.data import load_variables
+from siyadah.variables import (coerce_boolean, coerce_number, coerce_phone, compile_source, compile_validation,
+                               compile_variables, resolve_batch, resolve_row)
+
+CATALOG = {
+    "name": {"source": "trigger.body.name | trigger.row.الاسم", "type": "string", "required": True,
+             "default": "عميلنا"},
+    "phone": {"source": "trigger.body.phone | trigger.row.الجوال", "type": "phone", "validation": "saudi_phone",
+              "required": True},
+    "company": {"source": "onboarding.step1", "type": "string"},
+    "order": {"source": "step.lookup.order_id | trigger.body.order", "type": "integer"},
+    "static": {"source": 5},
+}
+
+
+def test_compile_source_kinds():
+    alts = compile_source("trigger.body.name | step.x.y | computed")
+    assert [(k, r) for k, r, _ in alts] == [("row", "trigger"), ("scope", "step"), ("marker", None)]
+    assert alts[0][2]({"body": {"name": "سارة"}}) == "سارة"
+    assert alts[0][2]({"body": None}) is None
+
+
+def test_coerce_phone_normalizes_or_rejects():
+    assert coerce_phone("٠٥٠ ١٢٣ ٤٥٦٧") == "+966501234567"
+    assert coerce_phone("00971501234567") == "+971501234567"
+    with pytest.raises(ValueError):
+        coerce_phone("12345")
+
+
+def test_coerce_number_and_boolean():
+    assert coerce_number("١٢٠٠") == coerce_number("1,200") == 1200
+    assert coerce_number("2.5") == 2.5
+    assert coerce_boolean("نعم") is True and coerce_boolean("0") is False
+    with pytest.raises(ValueError):
+        coerce_boolean("ربما")
+
+
+def test_validation_rules():
+    check = compile_validation("min:2,max:4")
+    assert check("abc") and not check("a") and not check("abcde")
+    assert compile_validation("enum:a|b")("a") and not compile_validation("enum:a|b")("c")
+    assert compile_validation("") is None
+
+
+def test_resolve_batch_columns_and_report():
+    compiled = compile_variables(CATALOG)
+    assert [cv["key"] for cv in compiled] == ["name", "phone", "company", "order"]
+    payloads = [
+        {"body": {"name": "سارة", "phone": "0501234567", "order": "٤٢"}},
+        {"row": {"الاسم": "خالد", "الجوال": "12345"}},
+        {"body": {}},
+    ]
+    columns, report = resolve_batch(compiled, payloads, provided={"company": "سيادة"})
+    assert columns["name"] == ["سارة", "خالد", "عميلنا"]
+    assert columns["phone"] == ["+966501234567", None, None]
+    assert columns["company"] == ["سيادة"] * 3
+    assert columns["order"] == [42, None, None]
+    assert report["invalid"]["phone"] == 1 and report["missing"]["phone"] == 1
+    assert report["row_problems"] == {1: [("phone", "invalid")], 2: [("name", "missing"), ("phone", "missing")]}
+
+
+def test_scope_constant_wins_for_whole_batch():
+    compiled = compile_variables(CATALOG, keys={"order"})
+    columns, _ = resolve_batch(compiled, [{"body": {"order": "1"}}] * 3, scope={"step": {"lookup": {"order_id": "7"}}})
+    assert columns["order"] == [7, 7, 7]
+    values, problems = resolve_row(compiled, {"body": {"order": "x"}})
+    assert values == {"order": None} and problems == [("order", "invalid")]
+
+
+def test_shipped_catalog_compiles():
+    catalog = load_variables()
+    assert compile_variables(catalog)
@@ -0,0 +1,120 @@
+"""Phase 35: التحقق من السجل مقابل API (HttpPool / verify_all / serve)"""
+
+import asyncio
+import json
+
+from siyadah.verify import HttpPool, apply_results, diff_piece, serve, verify_all
+
+RECORDS = {
+    "@activepieces/piece-gmail": json.dumps({"version": "1.0", "actions": {"send_email": {}},
+                                             "triggers": {"new_email": {}}}).encode(),
+    "@activepieces/piece-slack": json.dumps({"actions": {"sendMessage": {}, "extra": {}}}).encode(),
+}
+
+
+def run(coro):
+    errors = []
+
+    async def main():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: errors.append(ctx))
+        return await coro
+
+    return asyncio.run(main()), errors
+
+
+def test_diff_piece_folds_names():
+    diff = diff_piece({"actions": [{"name": "send_message"}, {"name": "gone"}]},
+                      {"actions": {"sendMessage": {}, "extra": {}}})
+    assert diff == {"missing_actions": ["gone"], "extra_actions": ["extra"],
+                    "missing_triggers": [], "extra_triggers": []}
+
+
+def test_verify_all_against_local_server():
+    pieces = [{"id": "gmail", "actions": [{"name": "send_email"}], "triggers": [{"name": "new_email"}]},
+              {"id": "slack", "actions": [{"name": "send_message"}]},
+              {"id": "missing"}]
+
+    async def go():
+        server = await serve(RECORDS, port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            result = await verify_all(pieces, f"http://127.0.0.1:{port}", concurrency=2)
+            await asyncio.sleep(0.05)   # السيرفر يقرا EOF من اتصالات الـ pool ويقفل
+            return result
+
+    (results, stats), errors = run(go())
+    by_id = {r["id"]: r for r in results}
+    assert by_id["gmail"]["status"] == "verified" and by_id["gmail"]["remote_version"] == "1.0"
+    assert by_id["slack"]["status"] == "mismatch" and by_id["slack"]["diff"]["extra_actions"] == ["extra"]
+    assert by_id["missing"]["status"] == "not_found"
+    assert stats["requests"] == 3 and stats["connections"] <= 2
+    assert errors == []
+
+
+def test_server_survives_reset_and_propagates_cancel():
+    handlers = []
+
+    async def go():
+        server = await serve(RECORDS, port=0)
+        port = server.sockets[0].getsockname()[1]
+        # عميل يقطع في نص الطلب
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b"GET /api/v1/pieces/x HTTP/1.1\r\n")
+        writer.transport.abort()
+        # عميل keep-alive مفتوح وقت قفل السيرفر
+        pool = HttpPool(f"http://127.0.0.1:{port}")
+        status, _ = await pool.get("/api/v1/pieces/%40activepieces%2Fpiece-gmail")
+        await asyncio.sleep(0.05)
+        server.close()
+        handlers.extend(asyncio.all_tasks() - {asyncio.current_task()})
+        for task in handlers:
+            task.cancel()
+        await asyncio.sleep(0.05)
+        await pool.close()
+        return status
+
+    status, errors = run(go())
+    assert status == 200
+    assert handlers and all(task.cancelled() for task in handlers)
+    # الاتصال المقطوع ما يطلع خطأ؛ الباقي بس الإلغاء نفسه (Python 3.11 يسجّله من callback الـ streams)
+    assert all(isinstance(e.get("exception"), asyncio.CancelledError) for e in errors)
+
+
+def test_pool_reads_bodyless_statuses_without_waiting():
+    replies = [b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 204 No Content\r\nX-A: 1\r\n\r\n",
+               b"HTTP/1.1 304 Not Modified\r\n\r\n",
+               b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}"]
+
+    async def handle(reader, writer):
+        for reply in replies:
+            while (await reader.readline()) not in (b"\r\n", b""):
+                pass
+            writer.write(reply)
+            await writer.drain()
+        await reader.read()
+        writer.close()
+
+    async def go():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            pool = HttpPool(f"http://127.0.0.1:{port}", timeout=2)
+            got = [await pool.get("/x") for _ in replies]
+            await pool.close()
+            return got, pool.opened
+
+    (got, opened), _ = run(go())
+    assert got == [(204, b""), (304, b""), (200, b"{}")]
+    assert opened == 1
+
+
+def test_apply_results(tmp_path):
+    for pid in ("a", "b", "c"):
+        (tmp_path / f"{pid}.json").write_text(json.dumps({"id": pid, "_verified": pid == "b",
+                                                          "_verified_date": "2020-01-01"}))
+    results = [{"id": "a", "status": "verified"}, {"id": "b", "status": "mismatch"}, {"id": "c", "status": "error"}]
+    assert apply_results(str(tmp_path), results, today="2026-01-01") == 2
+    a = json.loads((tmp_path / "a.json").read_text())
+    b = json.loads((tmp_path / "b.json").read_text())
+    assert (a["_verified"], a["_verified_date"]) == (True, "2026-01-01")
+    assert (b["_verified"], b["_verified_date"]) == (False, "2020-01-01")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+📜 triage-runs.py — تصنيف سجلات تشغيل ActivePieces حسب خريطة الأخطاء
+
+الاستخدام:
+  python3 triage-runs.py runs/*.jsonl.gz                 # تحليل + ملخص
+  python3 triage-runs.py runs/ --workers 8 --top 5       # مجلد كامل
+  python3 triage-runs.py runs/ --json report.json        # حفظ التقرير
+  python3 triage-runs.py --sample runs/sample.jsonl.gz 1000000   # سجل تجريبي
+
+كل سطر = تشغيل واحد (JSON). الحقول المقروءة:
+  status, projectId|tenant_id, flowId, failedStep|steps[].{pieceName, statusCode, errorMessage}, error
+"""
+
+import glob
+import gzip
+import json
+import os
+import random
+import sys
+import time
+
+from siyadah.data import ERROR_MAP, is_partial_registry, load_json, load_registry
+from siyadah.errors import build_error_index
+from siyadah.runlogs import triage, summary_to_json
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+def collect_paths(args):
+    paths = []
+    for a in args:
+        if os.path.isdir(a):
+            paths += sorted(glob.glob(os.path.join(a, "*.jsonl")) + glob.glob(os.path.join(a, "*.jsonl.gz")))
+        else:
+            paths += sorted(glob.glob(a)) or [a]
+    return paths
+
+
+def make_sample(path, n, seed=7):
+    """سجل تجريبي بصيغة تصدير ActivePieces"""
+    rnd = random.Random(seed)
+    failures = [
+        ("google-sheets", 404, "Requested entity was not found."),
+        ("google-sheets", 401, "invalid_grant: Token has been expired or revoked."),
+        ("whatsapp", 400, "(#100) Invalid parameter: recipient phone number invalid"),
+        ("openai", 429, "Rate limit reached for gpt-4o-mini"),
+        ("openai", 401, "Incorrect API key provided"),
+        ("slack", 404, "channel_not_found"),
+        ("gmail", 429, "Daily user sending quota exceeded"),
+        ("http", None, "connect ETIMEDOUT 10.0.0.5:443"),
+        ("webhook", None, "connect ECONNREFUSED 127.0.0.1:8080"),
+        ("hubspot", 409, "Contact already exists"),
+        ("twilio", 503, "Service Unavailable"),
+    ]
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for i in range(n):
+            rec = {"id": f"run_{i}", "projectId": f"tenant_{rnd.randint(1, 200)}",
+                   "flowId": rnd.choice(["lead-capture", "invoice-collection", "customer-journey"])}
+            if rnd.random() < 0.3:
+                piece, status, msg = rnd.choice(failures)
+                rec["status"] = "FAILED"
+                rec["failedStep"] = {"name": "step_3", "pieceName": f"@activepieces/piece-{piece}",
+                                     "statusCode": status, "errorMessage": msg}
+            else:
+                rec["status"] = "SUCCEEDED"
+            f.write(json.dumps(rec) + "\n")
+    print(f"📝 سجل تجريبي: {path} ({n:,} تشغيل، {os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+
+def print_counter(title, counter, limit):
+    print(f"\n   {title}:")
+    for key, count in counter.most_common(limit):
+        print(f"      {count:10,d}  {key}")
+
+
+def main():
+    workers = option("--workers", None, int)
+    top = option("--top", 3, int)
+    limit = option("--limit", 15, int)
+    json_out = option("--json")
+    sample = option("--sample")
+
+    if sample:
+        make_sample(sample, int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
+        return
+
+    paths = collect_paths(sys.argv[1:])
+    if not paths:
+        print(__doc__)
+        sys.exit(0)
+
+    print("=" * 60)
+    print("📜 تصنيف سجلات التشغيل")
+    print("=" * 60)
+
+    pieces, source = load_registry()
+    index, _, _ = build_error_index(load_json(ERROR_MAP), pieces, is_partial_registry(source))
+
+    size_mb = sum(os.path.getsize(p) for p in paths) / 1024 / 1024
+    t0 = time.perf_counter()
+    summary = triage(paths, index, workers=workers, top=top)
+    elapsed = time.perf_counter() - t0
+
+    print(f"\n✅ اكتمل التحليل")
+    print(f"   📁 ملفات: {len(paths)} ({size_mb:.1f} MB)")
+    print(f"   📜 أسطر: {summary['lines']:,} | ❌ فشل: {summary['failures']:,} | ⚠️ أسطر تالفة: {summary['bad_lines']:,}")
+    print(f"   ⏱️  {elapsed:.1f}s — {summary['lines'] / max(elapsed, 1e-9):,.0f} سطر/ثانية")
+
+    print_counter("🚨 حسب الكود", summary["by_code"], limit)
+    print_counter("🔧 حسب auto_fix", summary["auto_fix"], limit)
+    print_counter("📦 حسب الأداة", summary["by_piece"], limit)
+    print_counter("🏢 حسب العميل", summary["by_tenant"], limit)
+    print_counter("🔎 طريقة التصنيف", summary["by_method"], limit)
+
+    print(f"\n   📌 أمثلة:")
+    for code, examples in sorted(summary["examples"].items()):
+        print(f"      {code}:")
+        for ex in examples:
+            print(f"         [{ex['tenant']}] {ex['piece']} {ex['http_status'] or '-'} — {ex['message'][:100]}")
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump(summary_to_json(summary), f, ensure_ascii=False, indent=2)
+        print(f"\n📁 تم الكتابة: {json_out}")
+
+
+if __name__ == "__main__":
+    main()
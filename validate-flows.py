@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+✅ validate-flows.py — تحقق جماعي من الـ Flows المولّدة مقابل السجل
+
+الاستخدام:
+  python3 validate-flows.py                          # data/flows
+  python3 validate-flows.py generated/               # مجلد *.json
+  python3 validate-flows.py flows.jsonl --workers 4  # JSONL (flow لكل سطر)
+  cat flows.jsonl | python3 validate-flows.py -      # stdin
+  python3 validate-flows.py --json report.json flows.jsonl
+  python3 validate-flows.py --sample flows.jsonl 100000   # ملف تجريبي من data/flows
+
+القواعد: unknown_piece, unknown_action, unknown_trigger, duplicate_step_id,
+         bad_after_step, bad_branch_route, bad_contains_steps, bad_step_ref, parse
+تحذير فقط: missing_prop
+"""
+
+import glob
+import json
+import os
+import random
+import sys
+import time
+
+from siyadah.data import FLOWS_DIR, is_partial_registry, load_flows, load_registry, load_tool_details
+from siyadah.flowcheck import WARNING_RULES, build_knowledge, check_batch, init_worker, merge_report, new_report
+from siyadah.parallel import bounded_map, chunked
+
+BATCH_FLOWS = 2000
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+def iter_inputs(args):
+    """(source, json_text) — بدون parse هنا، الـ parse يصير في الـ workers"""
+    for a in args:
+        if a == "-":
+            for n, line in enumerate(sys.stdin, 1):
+                if line.strip():
+                    yield f"stdin:{n}", line
+        elif os.path.isdir(a):
+            for path in sorted(glob.glob(os.path.join(a, "*.json"))):
+                with open(path, encoding="utf-8") as f:
+                    yield os.path.basename(path), f.read()
+        elif a.endswith(".jsonl"):
+            with open(a, encoding="utf-8") as f:
+                for n, line in enumerate(f, 1):
+                    if line.strip():
+                        yield f"{os.path.basename(a)}:{n}", line
+        else:
+            with open(a, encoding="utf-8") as f:
+                yield os.path.basename(a), f.read()
+
+
+def make_sample(path, n, seed=3):
+    """flows مولّدة من data/flows مع أخطاء مقصودة بنسبة صغيرة"""
+    rnd = random.Random(seed)
+    flows = list(load_flows().values())
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(n):
+            flow = json.loads(json.dumps(rnd.choice(flows)))
+            flow["_meta"]["id"] = f"gen_{i}"
+            r = rnd.random()
+            if r < 0.02:
+                flow["steps"][0]["tool_id"] = "gogle-sheets"
+            elif r < 0.04:
+                flow["steps"][-1]["action"] = "send_mesage"
+            elif r < 0.05 and flow.get("branches"):
+                flow["branches"][0]["after_step"] = "missing_step"
+            f.write(json.dumps(flow, ensure_ascii=False) + "\n")
+    print(f"📝 ملف تجريبي: {path} ({n:,} flow، {os.path.getsize(path) / 1024 / 1024:.1f} MB)")
+
+
+def main():
+    workers = option("--workers", None, int)
+    batch = option("--batch", BATCH_FLOWS, int)
+    json_out = option("--json")
+    sample = option("--sample")
+
+    if sample:
+        make_sample(sample, int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
+        return
+
+    print("=" * 60)
+    print("✅ التحقق من الـ Flows")
+    print("=" * 60)
+
+    pieces, source = load_registry()
+    details = load_tool_details()
+    if is_partial_registry(source):
+        print(f"   ⚠️ ما فيه سجل (data/registry) — التحقق مقابل data/tools فقط ({len(details)} أداة)")
+    kb = build_knowledge(pieces, details)
+    print(f"   📦 أدوات: {len(kb['pieces'])} | ⚡ actions: {len(kb['actions'])} | "
+          f"🔔 triggers: {len(kb['triggers'])} | 📋 props مطلوبة: {len(kb['required'])}")
+
+    report = new_report()
+    t0 = time.perf_counter()
+    batches = chunked(iter_inputs(sys.argv[1:] or [FLOWS_DIR]), batch)
+    for part in bounded_map(check_batch, batches, workers, initializer=init_worker, initargs=(kb,)):
+        merge_report(report, part)
+    elapsed = time.perf_counter() - t0
+
+    print(f"\n   📄 flows: {report['flows']:,} | ❌ فيها أخطاء: {report['failed']:,} | ⚠️ تحذيرات فقط: {report['warned']:,}")
+    print(f"   ⏱️  {elapsed:.2f}s — {report['flows'] / max(elapsed, 1e-9):,.0f} flow/ثانية")
+
+    if report["rules"]:
+        print(f"\n   📊 حسب القاعدة (عدد الـ flows):")
+        for rule, count in report["rules"].most_common():
+            print(f"      {count:10,d}  {rule}")
+        print(f"\n   📌 أمثلة:")
+        for ex in report["examples"]:
+            print(f"      [{ex['source']}]")
+            for rule, msg in ex["problems"]:
+                print(f"         {'⚠️' if rule in WARNING_RULES else '❌'} {msg}")
+
+    if json_out:
+        with open(json_out, "w", encoding="utf-8") as f:
+            json.dump({"flows": report["flows"], "failed": report["failed"], "warned": report["warned"], "seconds": round(elapsed, 3),
+                       "rules": dict(report["rules"]), "examples": report["examples"]},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n📁 تم الكتابة: {json_out}")
+
+    if report["failed"]:
+        sys.exit(1)
+    print(f"\n✅ كل الـ flows سليمة" + (f" ({report['warned']:,} فيها تحذيرات)" if report["warned"] else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+🔍 verify-registry.py — تحقق جماعي من السجل مقابل API بيانات ActivePieces
+
+الاستخدام:
+  python3 verify-registry.py                               # AP_BASE_URL (أو localhost:8080) + تحديث _verified
+  python3 verify-registry.py --check-only                  # تقرير بدون تعديل الملفات
+  python3 verify-registry.py --base-url http://ap.local:8080 --concurrency 200
+  python3 verify-registry.py --serve                       # سيرفر بديل: data/tools على 127.0.0.1:8099
+  python3 verify-registry.py --serve --records DIR --port 9000
+
+المصادقة: AP_API_KEY (Bearer) — اختياري لـ /api/v1/pieces
+التقرير: data/build/verify-report.json
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from siyadah.data import BUILD_DIR, PIECES_DIR, TOOLS_DIR, load_json, write_json
+from siyadah.verify import DEFAULT_CONCURRENCY, apply_results, load_records, serve, verify_all
+
+REPORT_FILE = os.path.join(BUILD_DIR, "verify-report.json")
+STATUS_ICONS = {"verified": "✅", "mismatch": "⚠️ ", "not_found": "❓", "error": "❌"}
+
+
+def option(name, default=None, cast=str):
+    if name in sys.argv:
+        i = sys.argv.index(name)
+        value = sys.argv[i + 1]
+        del sys.argv[i:i + 2]
+        return cast(value)
+    return default
+
+
+async def run_server(records_dir, port):
+    records = load_records(records_dir)
+    server = await serve(records, port=port)
+    print(f"🛰️  سيرفر بديل: http://127.0.0.1:{port} ({len(records)} أداة من {records_dir})")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    base_url = option("--base-url", os.environ.get("AP_BASE_URL", "http://localhost:8080"))
+    concurrency = option("--concurrency", DEFAULT_CONCURRENCY, int)
+    timeout = option("--timeout", 15, float)
+    pieces_dir = option("--pieces-dir", PIECES_DIR)
+    records_dir = option("--records", TOOLS_DIR)
+    port = option("--port", 8099, int)
+    check_only = "--check-only" in sys.argv
+
+    if "--serve" in sys.argv:
+        try:
+            asyncio.run(run_server(records_dir, port))
+        except KeyboardInterrupt:
+            pass
+        return
+
+    print("=" * 60)
+    print("🔍 التحقق من السجل مقابل ActivePieces")
+    print("=" * 60)
+
+    if not os.path.isdir(pieces_dir):
+        print(f"\n❌ لا توجد ملفات في {pieces_dir}/")
+        sys.exit(1)
+    pieces = [load_json(os.path.join(pieces_dir, f)) for f in sorted(os.listdir(pieces_dir)) if f.endswith(".json")]
+    print(f"   📦 أدوات: {len(pieces)} | 🌐 {base_url} | ⚡ تزامن: {concurrency}")
+
+    t0 = time.perf_counter()
+    results, stats = asyncio.run(verify_all(pieces, base_url, concurrency, timeout, os.environ.get("AP_API_KEY")))
+    elapsed = time.perf_counter() - t0
+
+    counts = {}
+    for r in results:
+        counts[r["status"]] = counts.get(r["status"], 0) + 1
+    print(f"\n   ⏱️  {elapsed:.2f}s — {len(results) / max(elapsed, 1e-9):,.0f} أداة/ثانية "
+          f"({stats['requests']} طلب على {stats['connections']} اتصال)")
+    for status in STATUS_ICONS:
+        print(f"   {STATUS_ICONS[status]} {status}: {counts.get(status, 0)}")
+
+    problems = [r for r in results if r["status"] != "verified"]
+    if problems:
+        print(f"\n   📌 تفاصيل ({len(problems)}):")
+        for r in problems[:30]:
+            print(f"   {STATUS_ICONS[r['status']]} [{r['id']}] {r['status']} {r.get('error', '')}")
+            for key, names in (r.get("diff") or {}).items():
+                if names:
+                    print(f"        {key}: {', '.join(names[:8])}{' ...' if len(names) > 8 else ''}")
+        if len(problems) > 30:
+            print(f"   ... و {len(problems) - 30} أخرى")
+
+    write_json(REPORT_FILE, {"base_url": base_url, "seconds": round(elapsed, 3), "counts": counts,
+                             "results": results})
+    print(f"\n📁 التقرير: {REPORT_FILE}")
+
+    if check_only:
+        return
+
+    changed = apply_results(pieces_dir, results)
+    print(f"✏️  تم تحديث _verified في {changed} ملف")
+
+
+if __name__ == "__main__":
+    main()